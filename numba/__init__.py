@@ -36,7 +36,11 @@ from numba.core.decorators import (cfunc, generated_jit, jit, njit, stencil,
 
 # Re-export vectorize decorators and the thread layer querying function
 from numba.np.ufunc import (vectorize, guvectorize, threading_layer,
-                            get_num_threads, set_num_threads)
+                            get_num_threads, set_num_threads,
+                            get_thread_affinity, set_thread_affinity)
+
+# Re-export the compilation profiler
+from numba.core.compile_profiler import compile_profile
 
 # Re-export Numpy helpers
 from numba.np.numpy_support import carray, farray, from_dtype
@@ -60,6 +64,7 @@ test = runtests.main
 
 __all__ = """
     cfunc
+    compile_profile
     from_dtype
     guvectorize
     jit
@@ -78,6 +83,8 @@ __all__ = """
     literal_unroll
     get_num_threads
     set_num_threads
+    get_thread_affinity
+    set_thread_affinity
     """.split() + types.__all__ + errors.__all__
 
 
@@ -151,11 +151,13 @@ build_c_helpers_dict(void)
     declmethod(list_free);
     declmethod(list_length);
     declmethod(list_allocated);
+    declmethod(list_base_ptr);
     declmethod(list_is_mutable);
     declmethod(list_set_is_mutable);
     declmethod(list_setitem);
     declmethod(list_getitem);
     declmethod(list_append);
+    declmethod(list_resize);
     declmethod(list_delitem);
     declmethod(list_delete_slice);
     declmethod(list_iter_sizeof);
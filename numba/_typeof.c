@@ -36,10 +36,12 @@ static PyObject *omittedarg_type;
 static PyObject *typecache;
 static PyObject *ndarray_typecache;
 static PyObject *structured_dtypes;
+static PyObject *fingerprinted_classes;
 
 static PyObject *str_typeof_pyval = NULL;
 static PyObject *str_value = NULL;
 static PyObject *str_numba_type = NULL;
+static PyObject *str_fields = NULL;
 
 
 /*
@@ -179,6 +181,8 @@ enum opcode {
     OP_BYTEARRAY = 'a',
     OP_BYTES = 'b',
     OP_NONE = 'n',
+    OP_START_NAMED_TUPLE = 'N',
+    OP_CLASS = 'O',
     OP_LIST = '[',
     OP_SET = '{',
 
@@ -238,6 +242,36 @@ compute_dtype_fingerprint(string_writer_t *w, PyArray_Descr *descr)
     return fingerprint_unrecognized((PyObject *) descr);
 }
 
+static int
+compute_class_fingerprint(string_writer_t *w, PyTypeObject *tp)
+{
+    /* Serialize the class pointer.  As for structured dtypes, the class
+     * is kept alive to avoid pointer reuse and fingerprint collisions.
+     */
+    PyObject *cls = (PyObject *) tp;
+    if (PyDict_GetItem(fingerprinted_classes, cls) == NULL) {
+        if (PyDict_SetItem(fingerprinted_classes, cls, Py_None))
+            return -1;
+    }
+    return string_writer_put_intp(w, (npy_intp) cls);
+}
+
+/* Whether the numba type of all instances of *tp* is the "_numba_type_"
+ * class attribute, e.g. for jitclass instances.  Instances mustn't be able
+ * to override it with an instance attribute or a custom attribute lookup,
+ * and it mustn't be computed by a descriptor.
+ */
+static int
+class_has_numba_type(PyTypeObject *tp)
+{
+    PyObject *attr;
+    if (tp->tp_dictoffset != 0 || tp->tp_getattro != PyObject_GenericGetAttr)
+        return 0;
+    /* Borrowed reference */
+    attr = _PyType_Lookup(tp, str_numba_type);
+    return attr != NULL && Py_TYPE(attr)->tp_descr_get == NULL;
+}
+
 static int
 compute_fingerprint(string_writer_t *w, PyObject *val)
 {
@@ -265,6 +299,18 @@ compute_fingerprint(string_writer_t *w, PyObject *val)
         TRY(string_writer_put_char, w, OP_END_TUPLE);
         return 0;
     }
+    /* Named tuples: their type also depends on the class */
+    if (PyTuple_Check(val) &&
+            PyObject_HasAttr((PyObject *) Py_TYPE(val), str_fields)) {
+        Py_ssize_t i, n;
+        n = PyTuple_GET_SIZE(val);
+        TRY(string_writer_put_char, w, OP_START_NAMED_TUPLE);
+        TRY(compute_class_fingerprint, w, Py_TYPE(val));
+        for (i = 0; i < n; i++)
+            TRY(compute_fingerprint, w, PyTuple_GET_ITEM(val, i));
+        TRY(string_writer_put_char, w, OP_END_TUPLE);
+        return 0;
+    }
     if (PyBytes_Check(val))
         return string_writer_put_char(w, OP_BYTES);
     if (PyByteArray_Check(val))
@@ -376,6 +422,10 @@ compute_fingerprint(string_writer_t *w, PyObject *val)
         TRY(string_writer_put_char, w, OP_NP_DTYPE);
         return compute_dtype_fingerprint(w, (PyArray_Descr *) val);
     }
+    if (class_has_numba_type(Py_TYPE(val))) {
+        TRY(string_writer_put_char, w, OP_CLASS);
+        return compute_class_fingerprint(w, Py_TYPE(val));
+    }
 
 _unrecognized:
     /* Type not recognized */
@@ -873,8 +923,9 @@ typeof_init(PyObject *self, PyObject *args)
     typecache = PyDict_New();
     ndarray_typecache = PyDict_New();
     structured_dtypes = PyDict_New();
+    fingerprinted_classes = PyDict_New();
     if (typecache == NULL || ndarray_typecache == NULL ||
-        structured_dtypes == NULL) {
+        structured_dtypes == NULL || fingerprinted_classes == NULL) {
         PyErr_SetString(PyExc_RuntimeError, "failed to create type cache");
         return NULL;
     }
@@ -893,7 +944,8 @@ typeof_init(PyObject *self, PyObject *args)
     str_typeof_pyval = PyString_InternFromString("typeof_pyval");
     str_value = PyString_InternFromString("value");
     str_numba_type = PyString_InternFromString("_numba_type_");
-    if (!str_value || !str_typeof_pyval || !str_numba_type)
+    str_fields = PyString_InternFromString("_fields");
+    if (!str_value || !str_typeof_pyval || !str_numba_type || !str_fields)
         return NULL;
 
     Py_RETURN_NONE;
@@ -46,6 +46,7 @@
  * needed to make the list work within Numba.
  *
  * - Accessing the allocation numba_list_allocated
+ * - Accessing the items      numba_list_base_ptr
  * - Copying an item          copy_item
  * - Calling incref on item   list_incref_item
  * - Calling decref on item   list_decref_item
@@ -234,6 +235,17 @@ numba_list_allocated(NB_List *lp) {
     return lp->allocated;
 }
 
+/* Return a pointer to the items of a list, which are stored contiguously.
+ *
+ * lp: a list
+ *
+ * The pointer is invalidated by any operation that resizes the list.
+ */
+char *
+numba_list_base_ptr(NB_List *lp) {
+    return lp->items;
+}
+
 /* Return the mutability status of the list
  *
  * lp: a list
@@ -209,6 +209,12 @@ class BaseContext(object):
     # NRT
     enable_nrt = False
 
+    # NRT arena scoped to the calls of the function
+    enable_arena = False
+
+    # Attribution of the NRT allocations to their source lines
+    enable_nrt_profile = False
+
     # Auto parallelization
     auto_parallel = False
 
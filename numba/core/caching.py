@@ -4,24 +4,39 @@ Caching mechanism for compiled functions.
 
 
 from abc import ABCMeta, abstractmethod, abstractproperty
+import collections
 import contextlib
 import errno
 import hashlib
 import inspect
+import io
 import itertools
+import mmap
 import os
 import pickle
+import pickletools
+import re
+import struct
 import sys
 import tempfile
+import threading
+import time
+import types as pytypes
 import warnings
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows
+    fcntl = None
+
 from numba.misc.appdirs import AppDirs
 from numba.core.utils import add_metaclass, file_replace
 
 import numba
 from numba.core.errors import NumbaWarning
 from numba.core.base import BaseContext
-from numba.core.codegen import CodeLibrary
+from numba.core.codegen import CodeLibrary, SerializedObjectCode
 from numba.core.compiler import CompileResult
 from numba.core import config, compiler
 
@@ -46,6 +61,27 @@ def _cache_log(msg, *args):
         print(msg)
 
 
+# Granularity (in seconds) of the last use time recorded for eviction
+_USE_TIME_GRANULARITY = 3600
+
+
+def _mark_used(path, st=None):
+    """
+    Record the use of the cache file at *path* in its access time, for
+    the purpose of LRU eviction.  The modification time is preserved.
+    To spare filesystem writes, the access time is only updated if it is
+    older than _USE_TIME_GRANULARITY.
+    """
+    try:
+        if st is None:
+            st = os.stat(path)
+        now = time.time_ns()
+        if now - st.st_atime_ns > _USE_TIME_GRANULARITY * 10 ** 9:
+            os.utime(path, ns=(now, st.st_mtime_ns))
+    except OSError:
+        pass
+
+
 @add_metaclass(ABCMeta)
 class _Cache(object):
 
@@ -63,6 +99,23 @@ class _Cache(object):
         in the cache.
         """
 
+    @abstractmethod
+    def fetch_overload(self, sig, target_context):
+        """
+        Read the saved data for the given signature, without recreating the
+        overload.  None must be returned if not found in the cache, or if
+        it can't be read without touching the shared compiler state, so
+        that the compiler lock needn't be held; load_overload() must then
+        be used with the lock held.
+        """
+
+    @abstractmethod
+    def rebuild_overload(self, data, target_context):
+        """
+        Recreate the overload from the *data* returned by fetch_overload()
+        using the target context.  None must be returned if *data* is None.
+        """
+
     @abstractmethod
     def save_overload(self, sig, data):
         """
@@ -96,6 +149,12 @@ class NullCache(_Cache):
     def load_overload(self, sig, target_context):
         pass
 
+    def fetch_overload(self, sig, target_context):
+        pass
+
+    def rebuild_overload(self, data, target_context):
+        pass
+
     def save_overload(self, sig, cres):
         pass
 
@@ -425,6 +484,105 @@ class CompileResultCacheImpl(_CacheImpl):
         return True
 
 
+def _describe_closure_value(value):
+    """
+    Return a description of the closure variable *value* which is stable
+    across processes, or raise ValueError if there isn't one.
+    """
+    from numba.core import types
+    import numpy as np
+
+    if value is None or isinstance(value, (bool, int, float, complex, str,
+                                           bytes)):
+        return value
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__,
+                tuple(_describe_closure_value(v) for v in value))
+    if isinstance(value, (types.Type, np.dtype)):
+        desc = str(value)
+        # Types of objects (e.g. functions) can be named after their address
+        if '0x' not in desc:
+            # The name of some types (e.g. NamedTuple) only gives the
+            # __name__ of the classes they refer to
+            classes = tuple(_describe_closure_value(cls)
+                            for cls in _type_key_classes(value))
+            return (type(value).__module__, type(value).__qualname__, desc,
+                    classes)
+    elif isinstance(value, (pytypes.FunctionType, pytypes.BuiltinFunctionType,
+                            type)):
+        # Objects found by their qualified name
+        modname = getattr(value, '__module__', None)
+        qualname = getattr(value, '__qualname__', '')
+        module = sys.modules.get(modname)
+        obj = module
+        for attr in qualname.split('.'):
+            obj = getattr(obj, attr, None)
+        if module is not None and obj is value:
+            return ('global', modname, qualname)
+    elif isinstance(value, np.ufunc):
+        if getattr(np, value.__name__, None) is value:
+            return ('ufunc', value.__name__)
+    raise ValueError("no stable description for %r" % (value,))
+
+
+def _type_key_classes(typ):
+    """
+    Return the list of the Python classes found in the key of the Numba
+    type *typ*, recursively.
+    """
+    from numba.core import types
+
+    classes = []
+    seen = set()
+
+    def walk(key):
+        if isinstance(key, type):
+            classes.append(key)
+        elif isinstance(key, types.Type):
+            if id(key) not in seen:
+                seen.add(id(key))
+                walk(key.key)
+        elif isinstance(key, (tuple, list, frozenset)):
+            for v in key:
+                walk(v)
+
+    if isinstance(typ, types.Type):
+        walk(typ)
+    return classes
+
+
+class OverloadCacheImpl(CompileResultCacheImpl):
+    """
+    Implements the logic to cache the CompileResult objects of @overload
+    implementations.  These are often closures over values computed from
+    the argument types, which are described in the index key.  Results
+    which cannot be cached are skipped silently.
+    """
+
+    def __init__(self, py_func):
+        super(OverloadCacheImpl, self).__init__(py_func)
+        try:
+            cvars = tuple(_describe_closure_value(cell.cell_contents)
+                          for cell in py_func.__closure__ or ())
+        except ValueError:
+            self._closure_key = None
+        else:
+            self._closure_key = hashlib.sha256(
+                repr(cvars).encode('utf-8')).hexdigest()
+
+    @property
+    def closure_key(self):
+        """
+        The key describing the closure variables, or None if the function
+        cannot be cached.
+        """
+        return self._closure_key
+
+    def check_cachable(self, cres):
+        return (self._closure_key is not None and not cres.lifted and
+                not cres.library.has_dynamic_globals)
+
+
 class CodeLibraryCacheImpl(_CacheImpl):
     """
     Implements the logic to cache CodeLibrary objects.
@@ -473,7 +631,8 @@ class IndexDataCacheFile(object):
 
     def save(self, key, data):
         """
-        Save a new cache entry with *key* and *data*.
+        Save a new cache entry with *key* and *data*.  Return the number of
+        bytes of data written.
         """
         overloads = self._load_index()
         try:
@@ -488,7 +647,7 @@ class IndexDataCacheFile(object):
                     break
             overloads[key] = data_name
             self._save_index(overloads)
-        self._save_data(data_name, data)
+        return self._save_data(data_name, data)
 
     def load(self, key):
         """
@@ -543,6 +702,7 @@ class IndexDataCacheFile(object):
         path = self._data_path(name)
         with open(path, "rb") as f:
             data = f.read()
+            _mark_used(path, os.fstat(f.fileno()))
         tup = pickle.loads(data)
         _cache_log("[cache] data loaded from %r", path)
         return tup
@@ -553,6 +713,7 @@ class IndexDataCacheFile(object):
         with self._open_for_write(path) as f:
             f.write(data)
         _cache_log("[cache] data saved to %r", path)
+        return len(data)
 
     def _data_name(self, number):
         return self._data_name_pattern.format(number=number)
@@ -583,6 +744,407 @@ class IndexDataCacheFile(object):
             raise
 
 
+class _StorePickler(pickle.Pickler):
+    """
+    A pickler storing the object code of serialized CodeLibrary objects
+    out-of-line, so that it can later be loaded from a memory map without
+    being copied through the pickle stream.
+    """
+
+    def __init__(self, file, blobs):
+        super(_StorePickler, self).__init__(file, protocol=-1)
+        self._blobs = blobs
+        self._blob_size = 0
+
+    def persistent_id(self, obj):
+        if type(obj) is SerializedObjectCode:
+            name, _, (object_code, shared_bitcode) = obj
+            offset = self._blob_size
+            self._blobs.append(object_code)
+            self._blob_size += len(object_code)
+            return (name, offset, len(object_code), shared_bitcode)
+        return None
+
+
+class _StoreUnpickler(pickle.Unpickler):
+    """
+    The counterpart of _StorePickler: object code is returned as a
+    memoryview over *blob*.
+    """
+
+    def __init__(self, file, blob):
+        super(_StoreUnpickler, self).__init__(file)
+        self._blob = blob
+
+    def persistent_load(self, pid):
+        name, offset, size, shared_bitcode = pid
+        object_code = self._blob[offset:offset + size]
+        return (name, 'object', (object_code, shared_bitcode))
+
+
+_StoreRecord = collections.namedtuple(
+    '_StoreRecord', ('name', 'record', 'stamp', 'key', 'meta', 'blob'))
+
+
+class _ConsolidatedStore(object):
+    """
+    The process-wide view of a consolidated cache store file.
+
+    The file starts with a header holding the Numba version, followed by
+    a sequence of records.  Each record holds the filename base of the
+    cached function, the pickled source stamp and index key of the entry,
+    the pickled payload and the out-of-line object code.  A record with
+    an empty key is a tombstone discarding all previous records of the
+    function.  Records are only ever appended, the latest one wins, except
+    for the time of last use in their header, which is updated in place
+    for the purpose of cache eviction.
+
+    The file is memory-mapped and new records are indexed incrementally,
+    so that all functions cached in a directory share a single scan.
+    """
+
+    _file_header = struct.Struct('<8sI')
+    _file_magic = b'NUMBANS2'
+    # The last field is the time of last use of the record
+    _record_header = struct.Struct('<4sIIIQQd')
+    _record_time = struct.Struct('<d')
+    _record_magic = b'NBSR'
+
+    def __init__(self, path):
+        self._path = path
+        self._version = numba.__version__.encode('utf-8')
+        self._lock = threading.RLock()
+        self._reset()
+
+    @property
+    def path(self):
+        return self._path
+
+    def _reset(self):
+        self._file_id = None
+        self._view = memoryview(b'')
+        self._valid = False
+        self._header_size = 0
+        self._scanned = 0
+        self._records = {}
+
+    def _refresh(self):
+        """
+        Bring the in-memory index up-to-date with the file on disk.
+        """
+        try:
+            st = os.stat(self._path)
+        except FileNotFoundError:
+            self._reset()
+            return
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._scanned:
+            # The store was replaced or truncated by someone else
+            self._reset()
+            self._file_id = file_id
+        if st.st_size == self._scanned:
+            return
+        with open(self._path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            # The mapping remains valid after the file is closed.  Views
+            # given out for earlier mappings keep them alive as needed.
+            self._view = memoryview(mmap.mmap(f.fileno(), size,
+                                              access=mmap.ACCESS_READ))
+        if not self._scanned:
+            self._valid = self._check_header()
+            if not self._valid:
+                return
+        self._scan()
+
+    def _check_header(self):
+        view = self._view
+        hdr = self._file_header
+        if len(view) < hdr.size:
+            return False
+        magic, version_size = hdr.unpack_from(view, 0)
+        end = hdr.size + version_size
+        if magic != self._file_magic or end > len(view):
+            return False
+        if bytes(view[hdr.size:end]) != self._version:
+            # This is another version.  Avoid unpickling any of the records
+            # as that may fail.
+            return False
+        self._header_size = self._scanned = end
+        return True
+
+    def _scan(self):
+        view = self._view
+        hdr = self._record_header
+        offset = self._scanned
+        while offset + hdr.size <= len(view):
+            (magic, name_size, stamp_size, key_size,
+             meta_size, blob_size, _) = hdr.unpack_from(view, offset)
+            name = slice(offset + hdr.size, offset + hdr.size + name_size)
+            stamp = slice(name.stop, name.stop + stamp_size)
+            key = slice(stamp.stop, stamp.stop + key_size)
+            meta = slice(key.stop, key.stop + meta_size)
+            blob = slice(meta.stop, meta.stop + blob_size)
+            if magic != self._record_magic or blob.stop > len(view):
+                # Truncated or corrupted record, written by a process
+                # that was interrupted.  It will be removed by the next
+                # writer.
+                break
+            name = bytes(view[name]).decode('utf-8')
+            if key_size:
+                rec = _StoreRecord(name, slice(offset, blob.stop),
+                                   stamp, key, meta, blob)
+                self._records.setdefault(name, []).append(rec)
+            else:
+                self._records.pop(name, None)
+            offset = blob.stop
+        self._scanned = offset
+
+    def get_records(self, name):
+        """
+        Return a (view, records) tuple for the function with the given
+        filename base *name*.  Record slices are relative to *view*.
+        """
+        with self._lock:
+            self._refresh()
+            return self._view, list(self._records.get(name, ()))
+
+    def _time_offset(self, rec):
+        return (rec.record.start + self._record_header.size
+                - self._record_time.size)
+
+    def last_used(self, view, rec):
+        """
+        Return the time of last use of the record *rec* of *view*.
+        """
+        return self._record_time.unpack_from(view, self._time_offset(rec))[0]
+
+    def mark_used(self, view, rec):
+        """
+        Record the use of the record *rec* of *view*, for the purpose of
+        cache eviction.  Like _mark_used(), the time is only updated if it
+        is older than _USE_TIME_GRANULARITY.
+        """
+        now = time.time()
+        if now - self.last_used(view, rec) <= _USE_TIME_GRANULARITY:
+            return
+        try:
+            with self._lock, self._open_locked() as f:
+                self._refresh()
+                # Records are indexed anew when the store is replaced
+                if not any(r is rec for r in self._records.get(rec.name, ())):
+                    return
+                f.seek(self._time_offset(rec))
+                f.write(self._record_time.pack(now))
+        except OSError:
+            pass
+
+    def append(self, name, stamp, key, payload):
+        """
+        Append a record for the function with the given filename base
+        *name*.  A *key* of None appends a tombstone.  Return the size of
+        the record.
+        """
+        name = name.encode('utf-8')
+        if key is None:
+            stamp = key = meta = blob = b''
+        else:
+            stamp = pickle.dumps(stamp, protocol=-1)
+            key = pickle.dumps(key, protocol=-1)
+            buf = io.BytesIO()
+            blobs = []
+            _StorePickler(buf, blobs).dump(payload)
+            meta = buf.getvalue()
+            blob = b''.join(blobs)
+        header = self._record_header.pack(self._record_magic, len(name),
+                                          len(stamp), len(key), len(meta),
+                                          len(blob), time.time())
+        record = b''.join([header, name, stamp, key, meta, blob])
+        with self._lock, self._open_locked() as f:
+            self._refresh()
+            if self._valid:
+                # Drop any partial record left by an interrupted writer
+                f.truncate(self._scanned)
+                f.seek(0, os.SEEK_END)
+                # Write the record in one go to minimize the window where
+                # concurrent readers may see a partial record
+                f.write(record)
+            elif os.fstat(f.fileno()).st_size == 0:
+                f.write(self._make_header() + record)
+            else:
+                # A store from another Numba version.  Replace it rather
+                # than truncating it, as other processes may have it mapped.
+                self._replace([self._make_header(), record])
+        return len(record)
+
+    def compact(self, evict=()):
+        """
+        Rewrite the store keeping only the live records, i.e. those not
+        superseded by a later record for the same key or source stamp, nor
+        discarded by a tombstone, and not identified in *evict*.  A store
+        from another Numba version, or left without any live record, is
+        removed.
+
+        Return a list of (ident, last used, size) tuples describing the
+        live records, where *ident* identifies the record in *evict*.
+        """
+        with self._lock, self._open_locked() as f:
+            self._refresh()
+            if not self._valid:
+                if os.fstat(f.fileno()).st_size:
+                    os.unlink(self._path)
+                return []
+            view = self._view
+            live = []
+            for name, records in self._records.items():
+                # The latest record carries the current source stamp
+                current_stamp = view[records[-1].stamp]
+                seen = set()
+                for rec in reversed(records):
+                    key = bytes(view[rec.key])
+                    if key in seen or view[rec.stamp] != current_stamp:
+                        continue
+                    seen.add(key)
+                    if (name, key) not in evict:
+                        live.append(((name, key), rec))
+            if not live:
+                os.unlink(self._path)
+                return []
+            live.sort(key=lambda item: item[1].record.start)
+            size = self._header_size + sum(rec.record.stop - rec.record.start
+                                           for _, rec in live)
+            if size < self._scanned or self._scanned < len(view):
+                self._replace([view[:self._header_size]]
+                              + [view[rec.record] for _, rec in live])
+            return [(ident, self.last_used(view, rec),
+                     rec.record.stop - rec.record.start)
+                    for ident, rec in live]
+
+    def _make_header(self):
+        return b''.join([self._file_header.pack(self._file_magic,
+                                                len(self._version)),
+                         self._version])
+
+    def _replace(self, chunks):
+        tmpname = '%s.tmp.%d' % (self._path, os.getpid())
+        try:
+            with open(tmpname, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            file_replace(tmpname, self._path)
+        except Exception:
+            try:
+                os.unlink(tmpname)
+            except OSError:
+                pass
+            raise
+
+    @contextlib.contextmanager
+    def _open_locked(self):
+        """
+        Open the store for appending, holding an exclusive lock against
+        other processes where the platform supports it.
+        """
+        while True:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
+            f = os.fdopen(fd, "r+b")
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                # Retry if the store was replaced while we waited for the lock
+                st = os.fstat(fd)
+                try:
+                    current = os.stat(self._path)
+                except FileNotFoundError:
+                    current = None
+                if (current is not None and (st.st_dev, st.st_ino)
+                        == (current.st_dev, current.st_ino)):
+                    yield f
+                    return
+            finally:
+                f.close()
+
+
+# Process-wide registry of consolidated stores, keyed by path.
+_consolidated_stores = {}
+_consolidated_stores_lock = threading.Lock()
+
+
+def _get_consolidated_store(path):
+    with _consolidated_stores_lock:
+        try:
+            return _consolidated_stores[path]
+        except KeyError:
+            store = _consolidated_stores[path] = _ConsolidatedStore(path)
+            return store
+
+
+class ConsolidatedCacheFile(object):
+    """
+    Implements the logic for a consolidated store shared by all functions
+    cached in a given directory (see ``_ConsolidatedStore``).
+
+    Unlike ``IndexDataCacheFile``, loading an entry doesn't need to open
+    and unpickle a separate index, and object code is sliced from the
+    memory-mapped store instead of being unpickled (it is copied once,
+    when it is handed to LLVM).
+    """
+    _store_name_pattern = 'numba-store.py%d%d%s.nbs'
+
+    def __init__(self, cache_path, filename_base, source_stamp):
+        self._cache_path = cache_path
+        abiflags = getattr(sys, 'abiflags', '')
+        self._store_name = self._store_name_pattern % (sys.version_info[0],
+                                                       sys.version_info[1],
+                                                       abiflags)
+        self._store_path = os.path.join(self._cache_path, self._store_name)
+        self._filename_base = filename_base
+        self._source_stamp = source_stamp
+        self._store = _get_consolidated_store(self._store_path)
+
+    def flush(self):
+        self._store.append(self._filename_base, None, None, None)
+
+    def save(self, key, data):
+        """
+        Save a new cache entry with *key* and *data*.  Return the number of
+        bytes written.
+        """
+        size = self._store.append(self._filename_base, self._source_stamp,
+                                  key, data)
+        _cache_log("[cache] data saved to %r", self._store_path)
+        return size
+
+    def load(self, key):
+        """
+        Load a cache entry with *key*.
+        """
+        view, records = self._store.get_records(self._filename_base)
+        if not records:
+            return
+        _cache_log("[cache] index loaded from %r", self._store_path)
+        # Latest records take precedence
+        for rec in reversed(records):
+            if pickle.loads(view[rec.key]) != key:
+                continue
+            if pickle.loads(view[rec.stamp]) != self._source_stamp:
+                # Cache is not fresh.
+                return
+            meta = io.BytesIO(view[rec.meta])
+            data = _StoreUnpickler(meta, view[rec.blob]).load()
+            self._store.mark_used(view, rec)
+            _cache_log("[cache] data loaded from %r", self._store_path)
+            return data
+
+
+# The cache file implementations selectable with NUMBA_CACHE_BACKEND
+_cache_file_classes = {
+    'default': IndexDataCacheFile,
+    'consolidated': ConsolidatedCacheFile,
+}
+
+
 class Cache(_Cache):
     """
     A per-function compilation cache.  The cache saves data in separate
@@ -608,6 +1170,10 @@ class Cache(_Cache):
     # The following class variables must be overridden by subclass.
     _impl_class = None
 
+    # The class implementing the on-disk layout of the cache.  If None,
+    # it is selected by NUMBA_CACHE_BACKEND.
+    _cache_file_class = None
+
     def __init__(self, py_func):
         self._name = repr(py_func)
         self._impl = self._impl_class(py_func)
@@ -615,9 +1181,15 @@ class Cache(_Cache):
         # This may be a bit strict but avoids us maintaining a magic number
         source_stamp = self._impl.locator.get_source_stamp()
         filename_base = self._impl.filename_base
-        self._cache_file = IndexDataCacheFile(cache_path=self._cache_path,
-                                              filename_base=filename_base,
-                                              source_stamp=source_stamp)
+        cache_file_class = self._cache_file_class
+        if cache_file_class is None:
+            cache_file_class = _cache_file_classes[config.CACHE_BACKEND]
+        self._cache_file = cache_file_class(cache_path=self._cache_path,
+                                            filename_base=filename_base,
+                                            source_stamp=source_stamp)
+        # The codegen of the target context, known once an overload was
+        # loaded or saved with the compiler lock held
+        self._codegen = None
         self.enable()
 
     def __repr__(self):
@@ -639,22 +1211,37 @@ class Cache(_Cache):
     def load_overload(self, sig, target_context):
         """
         Load and recreate the cached object for the given signature,
-        using the *target_context*.
+        using the *target_context*.  The compiler lock must be held.
+        """
+        self._codegen = _get_codegen(target_context)
+        data = self.fetch_overload(sig, target_context)
+        return self.rebuild_overload(data, target_context)
+
+    def fetch_overload(self, sig, target_context):
+        """
+        Read the cached data for the given signature.  The target context
+        isn't used: the index key is computed from the codegen remembered
+        by the previous load or save, and None is returned before that.
         """
-        # Refresh the context to ensure it is initialized
-        target_context.refresh()
         with self._guard_against_spurious_io_errors():
-            return self._load_overload(sig, target_context)
+            return self._fetch_overload(sig)
         # None returned if the `with` block swallows an exception
 
-    def _load_overload(self, sig, target_context):
-        if not self._enabled:
+    def _fetch_overload(self, sig):
+        if not self._enabled or self._codegen is None:
             return
-        key = self._index_key(sig, _get_codegen(target_context))
-        data = self._cache_file.load(key)
-        if data is not None:
-            data = self._impl.rebuild(target_context, data)
-        return data
+        key = self._index_key(sig, self._codegen)
+        return self._cache_file.load(key)
+
+    def rebuild_overload(self, data, target_context):
+        """
+        Recreate the cached object from *data* using the *target_context*.
+        """
+        if data is None:
+            return
+        # Refresh the context to ensure it is initialized
+        target_context.refresh()
+        return self._impl.rebuild(target_context, data)
 
     def save_overload(self, sig, data):
         """
@@ -669,9 +1256,12 @@ class Cache(_Cache):
         if not self._impl.check_cachable(data):
             return
         self._impl.locator.ensure_cache_path()
-        key = self._index_key(sig, _get_codegen(data))
+        self._codegen = _get_codegen(data)
+        key = self._index_key(sig, self._codegen)
         data = self._impl.reduce(data)
-        self._cache_file.save(key, data)
+        size = self._cache_file.save(key, data)
+        if config.CACHE_MAX_SIZE or config.CACHE_MAX_ENTRIES:
+            _enforce_cache_budgets(self._cache_path, size)
 
     @contextlib.contextmanager
     def _guard_against_spurious_io_errors(self):
@@ -702,6 +1292,30 @@ class FunctionCache(Cache):
     _impl_class = CompileResultCacheImpl
 
 
+class OverloadCache(FunctionCache):
+    """
+    Implements Cache that saves and loads the CompileResult objects of
+    @overload implementations (see NUMBA_CACHE_OVERLOADS).
+    """
+    _impl_class = OverloadCacheImpl
+
+    def __init__(self, py_func):
+        super(OverloadCache, self).__init__(py_func)
+        if self._impl.closure_key is None:
+            self.disable()
+
+    def _index_key(self, sig, codegen):
+        return (sig, codegen.magic_tuple(), self._impl.closure_key)
+
+
+class ConsolidatedFunctionCache(FunctionCache):
+    """
+    Implements a FunctionCache always using the consolidated store,
+    regardless of NUMBA_CACHE_BACKEND.
+    """
+    _cache_file_class = ConsolidatedCacheFile
+
+
 # Remember used cache filename prefixes.
 _lib_cache_prefixes = set([''])
 
@@ -729,3 +1343,246 @@ def make_library_cache(prefix):
     return LibraryCache
 
 
+
+
+CacheGCStats = collections.namedtuple(
+    'CacheGCStats', ('removed_files', 'removed_bytes', 'entries', 'bytes'))
+
+
+# An evictable entry of the on-disk cache: a data file, or a record of the
+# consolidated store at *path* identified by *record*.  *index* is the path
+# of the index referencing a data file.
+_CacheGCEntry = collections.namedtuple(
+    '_CacheGCEntry', ('path', 'last_used', 'size', 'index', 'record'))
+
+
+# The estimated (entries, bytes) of the cache directories this process
+# saved to, as of their last collection plus the entries saved since
+_cache_usage = {}
+_cache_usage_lock = threading.Lock()
+
+
+def _enforce_cache_budgets(cache_path, size):
+    """
+    Enforce the budgets of the configuration on the directory *cache_path*
+    after an entry of *size* bytes was saved into it.  The directory is
+    collected on the first save of the process, which measures its usage;
+    afterwards, the entries saved by the process are added up, and it is
+    only collected again once this estimate crosses a budget.  Entries
+    saved by other processes are thus only seen by the next collection.
+    """
+    max_entries = config.CACHE_MAX_ENTRIES
+    max_bytes = config.CACHE_MAX_SIZE
+    with _cache_usage_lock:
+        usage = _cache_usage.get(cache_path)
+        if usage is not None:
+            entries, nbytes = usage[0] + 1, usage[1] + size
+            if ((not max_entries or entries <= max_entries) and
+                    (not max_bytes or nbytes <= max_bytes)):
+                _cache_usage[cache_path] = entries, nbytes
+                return
+        stats = CacheManager().collect([cache_path])
+        _cache_usage[cache_path] = stats.entries, stats.bytes
+
+
+class CacheManager(object):
+    """
+    Garbage collection of on-disk cache directories.
+
+    Collecting first removes what can never be loaded again: index and
+    data files written by other Numba versions, data files not referenced
+    by their index, superseded records of consolidated stores and temporary
+    files left over by interrupted writers.  Then the entries not used for
+    *max_age* days are removed, and the least recently used entries of each
+    cache directory are evicted until at most *max_entries* entries
+    totalling at most *max_bytes* bytes remain in it.  A zero budget means
+    unlimited; by default, budgets are taken from the configuration.
+    """
+
+    _data_file_pattern = re.compile(r'^(.*)\.\d+\.nbc$')
+    _tmp_file_pattern = re.compile(r'\.nb[ics]\.tmp\.\d+$')
+    # Temporary files younger than this (in seconds) may still be written to
+    _tmp_grace_period = 3600
+
+    def __init__(self, max_bytes=None, max_entries=None, max_age=None):
+        self._max_bytes = (config.CACHE_MAX_SIZE if max_bytes is None
+                           else max_bytes)
+        self._max_entries = (config.CACHE_MAX_ENTRIES if max_entries is None
+                             else max_entries)
+        self._max_age = config.CACHE_MAX_AGE if max_age is None else max_age
+        self._removed_files = []
+        self._removed_bytes = 0
+
+    def collect(self, paths):
+        """
+        Collect the cache directories under the given *paths*.
+        Return a CacheGCStats instance.
+        """
+        entries = []
+        indexes = {}
+        for root in paths:
+            for dirpath, _, filenames in os.walk(root):
+                entries += self._evict(
+                    self._sweep_directory(dirpath, filenames, indexes))
+        # Remove the indexes left without any data file, unless they were
+        # just written and their data file may be about to be
+        live_indexes = set(entry.index for entry in entries)
+        deadline = time.time() - self._tmp_grace_period
+        for index_path, st in indexes.items():
+            if index_path not in live_indexes and st.st_mtime < deadline:
+                self._remove(index_path, st.st_size)
+        return CacheGCStats(
+            removed_files=self._removed_files,
+            removed_bytes=self._removed_bytes,
+            entries=len(entries),
+            bytes=sum(entry.size for entry in entries),
+            )
+
+    def _sweep_directory(self, dirpath, filenames, indexes):
+        now = time.time()
+        stats = {}
+        for fn in filenames:
+            try:
+                stats[fn] = os.stat(os.path.join(dirpath, fn))
+            except OSError:
+                continue
+        # Map index filename bases to the data file names they reference
+        refs = {}
+        for fn, st in stats.items():
+            path = os.path.join(dirpath, fn)
+            if self._tmp_file_pattern.search(fn):
+                if now - st.st_mtime > self._tmp_grace_period:
+                    self._remove(path, st.st_size)
+            elif fn.endswith('.nbi'):
+                names = self._read_index(path)
+                if names is None:
+                    self._remove(path, st.st_size)
+                else:
+                    refs[fn[:-len('.nbi')]] = names
+                    indexes[path] = st
+        entries = []
+        for fn, st in stats.items():
+            path = os.path.join(dirpath, fn)
+            m = self._data_file_pattern.match(fn)
+            if m is not None:
+                base = m.group(1)
+                if fn not in refs.get(base, ()):
+                    # Orphaned, or referenced by an obsolete index
+                    self._remove(path, st.st_size)
+                else:
+                    index = os.path.join(dirpath, base + '.nbi')
+                    entries.append(_CacheGCEntry(path, self._last_used(st),
+                                                 st.st_size, index, None))
+            elif fn.endswith('.nbs'):
+                try:
+                    records = _get_consolidated_store(path).compact()
+                except OSError:
+                    continue
+                if not records:
+                    self._removed(path, st.st_size)
+                for ident, last_used, size in records:
+                    entries.append(_CacheGCEntry(path, last_used, size,
+                                                 None, ident))
+        return entries
+
+    def _read_index(self, path):
+        """
+        Return the set of data file names referenced by the index file at
+        *path*, or None if the index is obsolete or unreadable.
+        """
+        try:
+            with open(path, "rb") as f:
+                version = pickle.load(f)
+                if version != numba.__version__:
+                    return None
+                # Scan the pickle stream rather than unpickling it, which
+                # could import arbitrary modules.
+                return set(arg for _, arg, _ in pickletools.genops(f)
+                           if isinstance(arg, str) and arg.endswith('.nbc'))
+        except OSError:
+            # Can't be read for now (e.g. concurrently replaced), keep the
+            # data files
+            return set(os.listdir(os.path.dirname(path)))
+        except Exception:
+            return None
+
+    def _evict(self, entries):
+        """
+        Evict the entries of a directory beyond the budgets, and return the
+        remaining ones.
+        """
+        # Least recently used first
+        entries.sort(key=lambda entry: entry.last_used)
+        evicted = []
+        if self._max_age:
+            deadline = time.time() - self._max_age * 86400
+            while entries and entries[0].last_used < deadline:
+                evicted.append(entries.pop(0))
+        total_bytes = sum(entry.size for entry in entries)
+        while entries and (
+                (self._max_bytes and total_bytes > self._max_bytes)
+                or (self._max_entries and len(entries) > self._max_entries)):
+            entry = entries.pop(0)
+            evicted.append(entry)
+            total_bytes -= entry.size
+        # Records are evicted by compacting their store once
+        records = collections.defaultdict(set)
+        for entry in evicted:
+            if entry.record is None:
+                self._remove(entry.path, entry.size)
+            else:
+                records[entry.path].add(entry.record)
+                self._removed_bytes += entry.size
+        for path, idents in records.items():
+            try:
+                if not _get_consolidated_store(path).compact(evict=idents):
+                    self._removed(path, 0)
+            except OSError:
+                pass
+        return entries
+
+    def _last_used(self, st):
+        return max(st.st_atime, st.st_mtime)
+
+    def _remove(self, path, size):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return
+        except OSError:
+            # e.g. the file is in use on Windows
+            return
+        self._removed(path, size)
+
+    def _removed(self, path, size):
+        _cache_log("[cache] removed %r", path)
+        self._removed_files.append(path)
+        self._removed_bytes += size
+
+
+def _default_cache_roots():
+    """
+    Return the cache directories that can be swept without knowing where
+    the cached functions are (in-tree __pycache__ directories can't).
+    """
+    roots = []
+    if config.CACHE_DIR:
+        roots.append(config.CACHE_DIR)
+    appdirs = AppDirs(appname="numba", appauthor=False)
+    roots.append(appdirs.user_cache_dir)
+    return roots
+
+
+def gc(paths=None, max_bytes=None, max_entries=None, max_age=None):
+    """
+    Garbage collect the on-disk cache under the given *paths*, defaulting
+    to the user-provided (NUMBA_CACHE_DIR) and user-wide cache directories.
+    See CacheManager for the meaning of the budget arguments.
+
+    Return a CacheGCStats instance.
+    """
+    if paths is None:
+        paths = _default_cache_roots()
+    manager = CacheManager(max_bytes=max_bytes, max_entries=max_entries,
+                           max_age=max_age)
+    return manager.collect([p for p in paths if os.path.isdir(p)])
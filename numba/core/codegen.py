@@ -78,6 +78,16 @@ class _CFG(object):
         return self.dot
 
 
+class SerializedObjectCode(tuple):
+    """
+    The (name, 'object', (object code, bitcode)) state returned by
+    CodeLibrary.serialize_using_object_code(), tagged so that it can be
+    told apart from other tuples when pickling (see caching._StorePickler).
+    """
+
+    __slots__ = ()
+
+
 class CodeLibrary(object):
     """
     An interface for bundling LLVM code together and compiling it.
@@ -419,7 +429,11 @@ class CodeLibrary(object):
         if self._object_caching_enabled and self._compiled_object:
             buf = self._compiled_object
             self._compiled_object = None
-            return buf
+            # The object code may be a memoryview over a memory-mapped
+            # cache store (see caching.ConsolidatedCacheFile).  llvmlite
+            # copies the buffer into an LLVM byte string and needs bytes
+            # for that, so this is where it gets copied out of the mapping.
+            return bytes(buf)
 
     def serialize_using_bitcode(self):
         """
@@ -437,7 +451,7 @@ class CodeLibrary(object):
         self._ensure_finalized()
         data = (self._get_compiled_object(),
                 self._get_module_for_linking().as_bitcode())
-        return (self._name, 'object', data)
+        return SerializedObjectCode((self._name, 'object', data))
 
     @classmethod
     def _unserialize(cls, codegen, state):
@@ -0,0 +1,155 @@
+"""
+Profiling of the compiler: the wall time and the peak resident set size of
+the compilation of each function, each signature and each compiler pass are
+recorded while a profile is active, including the nested compilations
+(e.g. of @overload and @register_jitable implementations).
+
+Profiles can be saved in the Chrome trace format, which is understood by
+chrome://tracing, Perfetto and speedscope to display flame graphs.
+"""
+
+import atexit
+import collections
+import contextlib
+import json
+import os
+import sys
+import threading
+import timeit
+
+from numba.core import config
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+# The profiles currently recording
+_active_profiles = []
+_lock = threading.Lock()
+# The origin of the timestamps
+_epoch = timeit.default_timer()
+
+
+def _get_peak_rss():
+    """
+    Return the peak resident set size of the process in bytes, or None if
+    it isn't available.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class CompileProfile(object):
+    """
+    The compilation events recorded by compile_profile(), as dicts in the
+    Chrome trace event format.  Events are nested by their timestamps.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def _add_event(self, event):
+        self.events.append(event)
+
+    def summary(self, category='function'):
+        """
+        Return a list of (name, total time in seconds, count) tuples for the
+        events of the given *category* ('function' or 'pass'), by decreasing
+        total time.  The time of a function includes the time of the nested
+        compilations it triggered.
+        """
+        times = collections.defaultdict(float)
+        counts = collections.Counter()
+        for event in self.events:
+            if event['cat'] == category:
+                times[event['name']] += event['dur'] / 1e6
+                counts[event['name']] += 1
+        return sorted(((name, times[name], counts[name]) for name in times),
+                      key=lambda item: item[1], reverse=True)
+
+    def to_chrome_trace(self):
+        """
+        Return the profile as a JSON-serializable dict in the Chrome trace
+        format.
+        """
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        """
+        Write the profile to *path* in the Chrome trace format.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+@contextlib.contextmanager
+def compile_profile(path=None):
+    """
+    Profile the compilations happening in the block.  The yielded
+    CompileProfile collects the events, and is written to *path* in the
+    Chrome trace format on exit if given.
+
+    Usage::
+
+        with numba.compile_profile("warmup.json") as profile:
+            warmup()
+        print(profile.summary()[:10])
+    """
+    profile = CompileProfile()
+    with _lock:
+        _active_profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        with _lock:
+            _active_profiles.remove(profile)
+        if path is not None:
+            profile.write(path)
+
+
+@contextlib.contextmanager
+def record(name, category, **args):
+    """
+    Record an event of the given *name* and *category* spanning the block
+    in the active profiles.  *args* are additional details of the event.
+    """
+    if not _active_profiles:
+        yield
+        return
+    start = timeit.default_timer()
+    start_rss = _get_peak_rss()
+    try:
+        yield
+    finally:
+        end = timeit.default_timer()
+        end_rss = _get_peak_rss()
+        if end_rss is not None:
+            args['peak_rss'] = end_rss
+            args['peak_rss_increase'] = end_rss - start_rss
+        event = {'name': name, 'cat': category, 'ph': 'X',
+                 'ts': (start - _epoch) * 1e6, 'dur': (end - start) * 1e6,
+                 'pid': os.getpid(), 'tid': threading.get_ident(),
+                 'args': args}
+        with _lock:
+            for profile in _active_profiles:
+                profile._add_event(event)
+
+
+def _profile_process(path):
+    """
+    Profile all compilations of the process and write the profile to *path*
+    at exit (see NUMBA_COMPILE_PROFILE).
+    """
+    cm = compile_profile(path)
+    cm.__enter__()
+    atexit.register(cm.__exit__, None, None, None)
+
+
+if config.COMPILE_PROFILE:
+    _profile_process(config.COMPILE_PROFILE)
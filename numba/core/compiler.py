@@ -4,7 +4,7 @@ import warnings
 from numba.core.tracing import event
 
 from numba.core import (utils, errors, typing, interpreter, bytecode, postproc,
-                        config, callconv, cpu)
+                        config, callconv, cpu, compile_profiler)
 from numba.parfors.parfor import ParforDiagnostics
 from numba.core.inline_closurecall import InlineClosureCallPass
 from numba.core.errors import CompilerError
@@ -66,6 +66,10 @@ class Flags(utils.ConfigOptions):
         'fastmath': cpu.FastMathOptions(False),
         'noalias': False,
         'inline': cpu.InlineOptions('never'),
+        # Allocate the small NRT objects in an arena scoped to the call
+        'arena': False,
+        # Attribute the NRT allocations to their source lines
+        'nrt_profile': False,
     }
 
 
@@ -93,6 +97,12 @@ CR_FIELDS = ["typing_context",
              ]
 
 
+# The metadata kept by a CompileResult saved to the cache, the rest can be
+# arbitrary and potentially large
+CR_PERSISTENT_METADATA = ["parallel_stats_regions",
+                          ]
+
+
 class CompileResult(namedtuple("_CompileResult", CR_FIELDS)):
     """
     A structure holding results from the compilation of a function.
@@ -107,18 +117,21 @@ class CompileResult(namedtuple("_CompileResult", CR_FIELDS)):
         libdata = self.library.serialize_using_object_code()
         # Make it (un)picklable efficiently
         typeann = str(self.type_annotation)
-        fndesc = self.fndesc
-        # Those don't need to be pickled and may fail
+        # Those don't need to be pickled and may fail, but are kept
+        # for the live CompileResult (e.g. see dispatcher.export_bundle())
+        fndesc = copy.copy(self.fndesc)
         fndesc.typemap = fndesc.calltypes = None
+        metadata = dict((k, v) for k, v in (self.metadata or {}).items()
+                        if k in CR_PERSISTENT_METADATA)
 
-        return (libdata, self.fndesc, self.environment, self.signature,
+        return (libdata, fndesc, self.environment, self.signature,
                 self.objectmode, self.interpmode, self.lifted, typeann,
-                self.reload_init)
+                self.reload_init, metadata or None)
 
     @classmethod
     def _rebuild(cls, target_context, libdata, fndesc, env,
                  signature, objectmode, interpmode, lifted, typeann,
-                 reload_init):
+                 reload_init, metadata):
         if reload_init:
             # Re-run all
             for fn in reload_init:
@@ -139,7 +152,7 @@ class CompileResult(namedtuple("_CompileResult", CR_FIELDS)):
                  lifted=lifted,
                  typing_error=None,
                  call_helper=None,
-                 metadata=None,  # Do not store, arbitrary & potentially large!
+                 metadata=metadata,  # Only CR_PERSISTENT_METADATA
                  reload_init=reload_init,
                  )
         return cr
@@ -270,6 +283,10 @@ def _make_subtarget(targetctx, flags):
         subtargetoptions['auto_parallel'] = flags.auto_parallel
     if flags.fastmath:
         subtargetoptions['fastmath'] = flags.fastmath
+    if flags.arena:
+        subtargetoptions['enable_arena'] = True
+    # Not inherited by the functions compiled by the lowering
+    subtargetoptions['enable_nrt_profile'] = flags.nrt_profile
     error_model = callconv.create_error_model(flags.error_model, targetctx)
     subtargetoptions['error_model'] = error_model
 
@@ -357,6 +374,16 @@ class CompilerBase(object):
         """
         Populate and run compiler pipeline
         """
+        func_id = self.state.func_id
+        args = self.state.args
+        name = "%s.%s(%s)" % (func_id.modname, func_id.func_qualname,
+                              ', '.join(map(str, args or ())))
+        with compile_profiler.record(name, 'function',
+                                     function=func_id.func_qualname,
+                                     module=func_id.modname):
+            return self._run_pipelines()
+
+    def _run_pipelines(self):
         pms = self.define_pipelines()
         for pm in pms:
             pipeline_name = pm.pipeline_name
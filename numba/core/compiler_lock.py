@@ -2,7 +2,23 @@ import threading
 import functools
 
 
-# Lock for the preventing multiple compiler execution
+# Lock for the preventing multiple compiler execution.
+#
+# It serializes the whole compiler pipeline, type inference and lowering
+# included, even for unrelated functions: both mutate state shared between
+# all functions (the registries and template caches of the typing and
+# target contexts, the LLVM context and the JIT engine), which is not
+# thread-safe, so a thread compiling a new specialization waits for any
+# other compilation to finish.  Splitting it per dispatcher isn't possible
+# as is: type inference takes a call to a dispatcher being compiled (in any
+# thread) for a recursive call, and all libraries share the LLVM context.
+# Dispatcher.compile_parallel() compiles in worker processes instead, and
+# background compilation keeps callers from waiting.
+#
+# The lock needn't be held for work that doesn't touch that state: the
+# explicit compile() of an existing overload, and reading the disk cache of
+# a dispatcher once its codegen is known; only the rebuilding of a cached
+# overload is serialized.
 class _CompilerLock(object):
     def __init__(self):
         self._lock = threading.RLock()
@@ -3,7 +3,7 @@ from abc import abstractmethod, ABCMeta
 from collections import namedtuple, OrderedDict
 import inspect
 from numba.core.compiler_lock import global_compiler_lock
-from numba.core import errors, config, transforms
+from numba.core import errors, config, transforms, compile_profiler
 from numba.core.utils import add_metaclass
 from numba.core.tracing import event
 from numba.core.postproc import PostProcessor
@@ -285,12 +285,16 @@ class PassManager(object):
         # wire in the analysis info so it's accessible
         pss.analysis = self._analysis
 
-        with SimpleTimer() as init_time:
-            mutated |= check(pss.run_initialization, internal_state)
-        with SimpleTimer() as pass_time:
-            mutated |= check(pss.run_pass, internal_state)
-        with SimpleTimer() as finalize_time:
-            mutated |= check(pss.run_finalizer, internal_state)
+        fid = internal_state.func_id
+        with compile_profiler.record(pss.name(), 'pass',
+                                     function=fid.func_qualname,
+                                     pipeline=self.pipeline_name):
+            with SimpleTimer() as init_time:
+                mutated |= check(pss.run_initialization, internal_state)
+            with SimpleTimer() as pass_time:
+                mutated |= check(pss.run_pass, internal_state)
+            with SimpleTimer() as finalize_time:
+                mutated |= check(pss.run_finalizer, internal_state)
 
         # Check that if the pass is an instance of a FunctionPass that it hasn't
         # emitted ir.Dels.
@@ -42,6 +42,40 @@ def _parse_cc(text):
         return int(grp[0]), int(grp[1])
 
 
+def _parse_cache_backend(text):
+    """
+    Parse and validate the name of a compilation cache backend.
+    """
+    backend = text.strip().lower()
+    if backend not in ('default', 'consolidated'):
+        raise ValueError("NUMBA_CACHE_BACKEND must be one of 'default' "
+                         "or 'consolidated'")
+    return backend
+
+
+def _parse_nrt_allocator(text):
+    """
+    Parse and validate the name of a NRT allocator.
+    """
+    allocator = text.strip().lower()
+    if allocator not in ('system', 'pool'):
+        raise ValueError("NUMBA_NRT_ALLOCATOR must be one of 'system' "
+                         "or 'pool'")
+    return allocator
+
+
+def _parse_size(text):
+    """
+    Parse a size in bytes, with an optional K, M or G suffix.
+    """
+    m = re.match(r'^\s*(\d+)\s*([kmg]?)b?\s*$', str(text), re.IGNORECASE)
+    if not m:
+        raise ValueError("size must be a number of bytes with an optional "
+                         "K, M or G suffix")
+    number, unit = m.groups()
+    return int(number) * 1024 ** ' kmg'.index(unit.lower() or ' ')
+
+
 def _os_supports_avx():
     """
     Whether the current OS supports AVX, regardless of the CPU.
@@ -185,6 +219,31 @@ class _EnvReloader(object):
         PARFOR_MAX_TUPLE_SIZE = _readenv("NUMBA_PARFOR_MAX_TUPLE_SIZE",
                                          int, 100)
 
+        # Parfors with fewer iterations than this are run serially
+        PARFOR_SERIAL_THRESHOLD = _readenv("NUMBA_PARFOR_SERIAL_THRESHOLD",
+                                           int, 0)
+
+        # Parallel ufuncs called with fewer elements than this are run
+        # serially
+        PARALLEL_UFUNC_SERIAL_THRESHOLD = _readenv(
+            "NUMBA_PARALLEL_UFUNC_SERIAL_THRESHOLD", int, 0)
+
+        # Minimum number of elements of a parallel ufunc call per thread
+        PARALLEL_UFUNC_CHUNKSIZE = _readenv("NUMBA_PARALLEL_UFUNC_CHUNKSIZE",
+                                            int, 0)
+
+        # Tile size of the loops of multi-dimensional parfors, 0 to not tile
+        PARFOR_TILE_SIZE = _readenv("NUMBA_PARFOR_TILE_SIZE", int, 0)
+
+        # Allocator of the NRT: the CPython raw allocator ("system"), or a
+        # thread-caching pool of size classes on top of it ("pool")
+        NRT_ALLOCATOR = _readenv("NUMBA_NRT_ALLOCATOR", _parse_nrt_allocator,
+                                 "system")
+
+        # Attribute the NRT allocations of the functions compiled afterwards
+        # to their source lines, for numba.core.runtime.nrt.profile()
+        NRT_PROFILE = _readenv("NUMBA_NRT_PROFILE", int, 0)
+
         # Enable logging of cache operation
         DEBUG_CACHE = _readenv("NUMBA_DEBUG_CACHE", int, DEBUG)
 
@@ -192,6 +251,31 @@ class _EnvReloader(object):
         # Contains path to the directory
         CACHE_DIR = _readenv("NUMBA_CACHE_DIR", str, "")
 
+        # On-disk layout of the cache: one index file and data files per
+        # function ("default"), or a single store per directory
+        # ("consolidated")
+        CACHE_BACKEND = _readenv("NUMBA_CACHE_BACKEND", _parse_cache_backend,
+                                 "default")
+
+        # Cache the compiled @overload and @register_jitable
+        # implementations provided by Numba on disk
+        CACHE_OVERLOADS = _readenv("NUMBA_CACHE_OVERLOADS", int, 0)
+
+        # Budgets of the on-disk cache, enforced by caching.gc() and when
+        # saving new entries (0 means unlimited): total size in bytes,
+        # number of entries, and age in days since last use
+        CACHE_MAX_SIZE = _readenv("NUMBA_CACHE_MAX_SIZE", _parse_size, 0)
+        CACHE_MAX_ENTRIES = _readenv("NUMBA_CACHE_MAX_ENTRIES", int, 0)
+        CACHE_MAX_AGE = _readenv("NUMBA_CACHE_MAX_AGE", float, 0)
+
+        # Number of worker processes compiling the explicit signatures of a
+        # @jit function concurrently (0 or 1 compiles them serially)
+        COMPILE_WORKERS = _readenv("NUMBA_COMPILE_WORKERS", int, 0)
+
+        # Path of the file where to write the profile of all compilations
+        # in the Chrome trace format (empty means no profiling)
+        COMPILE_PROFILE = _readenv("NUMBA_COMPILE_PROFILE", str, "")
+
         # Enable tracing support
         TRACE = _readenv("NUMBA_TRACE", int, 0)
 
@@ -302,6 +386,17 @@ class _EnvReloader(object):
         # choose parallel backend to use
         THREADING_LAYER = _readenv("NUMBA_THREADING_LAYER", str, 'default')
 
+        # Record the timings of parallel regions, see
+        # numba.np.ufunc.parallel_stats
+        PARALLEL_STATS = _readenv("NUMBA_PARALLEL_STATS", int, 0)
+
+        # CPUs to bind the threads of the threading layer to
+        THREAD_AFFINITY = _readenv("NUMBA_THREAD_AFFINITY", str, '')
+
+        # The number of times workqueue threads poll for work before sleeping
+        WORKQUEUE_SPIN_COUNT = _readenv("NUMBA_WORKQUEUE_SPIN_COUNT", int,
+                                        10000)
+
         # CUDA Configs
 
         # Force CUDA compute capability to a specific version
@@ -246,6 +246,7 @@ class CPUTargetOptions(TargetOptions):
         "error_model": str,
         "parallel": ParallelOptions,
         "inline": InlineOptions,
+        "arena": bool,
     }
 
 
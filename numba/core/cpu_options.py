@@ -55,6 +55,11 @@ class ParallelOptions(object):
             self.stencil = value
             self.fusion = value
             self.prange = value
+            self.collapse = value
+            self.schedule = 'static'
+            self.chunksize = 0
+            self.serial_threshold = None
+            self.tile = None
         elif isinstance(value, dict):
             self.enabled = True
             self.comprehension = value.pop('comprehension', True)
@@ -64,6 +69,37 @@ class ParallelOptions(object):
             self.stencil = value.pop('stencil', True)
             self.fusion = value.pop('fusion', True)
             self.prange = value.pop('prange', True)
+            self.collapse = value.pop('collapse', True)
+            self.schedule = value.pop('schedule', 'static')
+            self.chunksize = value.pop('chunksize', 0)
+            self.serial_threshold = value.pop('serial_threshold', None)
+            self.tile = value.pop('tile', None)
+            if self.schedule not in ('static', 'dynamic', 'guided'):
+                msg = ("Expected parallel schedule to be one of 'static', "
+                       "'dynamic' or 'guided', got %r" % (self.schedule,))
+                raise ValueError(msg)
+            if not isinstance(self.chunksize, int) or self.chunksize < 0:
+                msg = ("Expected parallel chunksize to be a non-negative "
+                       "integer, got %r" % (self.chunksize,))
+                raise ValueError(msg)
+            if self.serial_threshold is not None and (
+                    not isinstance(self.serial_threshold, int)
+                    or not 0 <= self.serial_threshold < 2 ** 31):
+                msg = ("Expected parallel serial_threshold to be a "
+                       "non-negative integer less than 2**31, got %r"
+                       % (self.serial_threshold,))
+                raise ValueError(msg)
+            if self.tile is not None:
+                tile = self.tile
+                if isinstance(tile, int):
+                    tile = (tile,)
+                if not (isinstance(tile, tuple) and
+                        all(isinstance(x, int) and 0 <= x < 2 ** 31
+                            for x in tile)):
+                    msg = ("Expected parallel tile to be a non-negative "
+                           "integer or a tuple of them, got %r"
+                           % (self.tile,))
+                    raise ValueError(msg)
             if value:
                 msg = "Unrecognized parallel options: %s" % value.keys()
                 raise NameError(msg)
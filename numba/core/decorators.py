@@ -24,7 +24,7 @@ _msg_deprecated_signature_arg = ("Deprecated keyword argument `{0}`. "
                                  "positional argument.")
 
 def jit(signature_or_function=None, locals={}, target='cpu', cache=False,
-        pipeline_class=None, boundscheck=False, **options):
+        pipeline_class=None, boundscheck=False, background=False, **options):
     """
     This decorator is used to compile a Python function into native code.
 
@@ -48,6 +48,12 @@ def jit(signature_or_function=None, locals={}, target='cpu', cache=False,
     pipeline_class: type numba.compiler.CompilerBase
             The compiler pipeline type for customizing the compilation stages.
 
+    background: bool
+        Set to True to compile the specializations required by calls in a
+        background thread.  Until a specialization is available, the calls
+        requiring it run the pure Python function.  Explicit signatures are
+        still compiled eagerly.
+
     options:
         For a cpu target, valid options are:
             nopython: bool
@@ -94,6 +100,12 @@ def jit(signature_or_function=None, locals={}, target='cpu', cache=False,
                 debugging. You can also set the NUMBA_BOUNDSCHECK environment
                 variable to 0 or 1 to globally override this flag.
 
+            arena: bool
+                Set to True to allocate the small arrays created during a
+                call of the function in an arena, which is reused at once
+                when the call returns if they are all released. The default
+                is to allocate them separately.
+
     Returns
     --------
     A callable usable as a compiled function.  Actual compiling will be
@@ -168,14 +180,16 @@ def jit(signature_or_function=None, locals={}, target='cpu', cache=False,
     if pipeline_class is not None:
         dispatcher_args['pipeline_class'] = pipeline_class
     wrapper = _jit(sigs, locals=locals, target=target, cache=cache,
-                   targetoptions=options, **dispatcher_args)
+                   targetoptions=options, background=background,
+                   **dispatcher_args)
     if pyfunc is not None:
         return wrapper(pyfunc)
     else:
         return wrapper
 
 
-def _jit(sigs, locals, target, cache, targetoptions, **dispatcher_args):
+def _jit(sigs, locals, target, cache, targetoptions, background=False,
+         **dispatcher_args):
     dispatcher = registry.dispatcher_registry[target]
 
     def wrapper(func):
@@ -189,13 +203,19 @@ def _jit(sigs, locals, target, cache, targetoptions, **dispatcher_args):
                           **dispatcher_args)
         if cache:
             disp.enable_caching()
+        if background:
+            disp.enable_background_compile()
         if sigs is not None:
             # Register the Dispatcher to the type inference mechanism,
             # even though the decorator hasn't returned yet.
             from numba.core import typeinfer
             with typeinfer.register_dispatcher(disp):
-                for sig in sigs:
-                    disp.compile(sig)
+                if (target == 'cpu' and config.COMPILE_WORKERS > 1
+                        and len(sigs) > 1):
+                    disp.compile_parallel(sigs)
+                else:
+                    for sig in sigs:
+                        disp.compile(sig)
                 disp.disable_compile()
         return disp
 
@@ -1,16 +1,27 @@
 # -*- coding: utf-8 -*-
 
 
+import ast
 import collections
 import functools
+import hashlib
+import importlib
+import multiprocessing
 import os
+import pickle
 import struct
 import sys
+import threading
+import tokenize
 import types as pytypes
 import uuid
+import warnings
 import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from copy import deepcopy
 
+import numba
 from numba import _dispatcher
 from numba.core import utils, types, errors, typing, serialize, config, compiler, sigutils
 from numba.core.compiler_lock import global_compiler_lock
@@ -19,7 +30,7 @@ from numba.core.typing.templates import fold_arguments
 from numba.core.typing.typeof import Purpose, typeof
 from numba.core.bytecode import get_code_object
 from numba.core.utils import reraise
-from numba.core.caching import NullCache, FunctionCache
+from numba.core.caching import NullCache, FunctionCache, OverloadCache
 
 
 class OmittedArg(object):
@@ -215,6 +226,7 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             has_stararg = False
         else:
             has_stararg = lastarg.kind == lastarg.VAR_POSITIONAL
+        self._has_stararg = has_stararg
         _dispatcher.Dispatcher.__init__(self, self._tm.get_pointer(),
                                         arg_count, self._fold_args,
                                         argnames, defargs,
@@ -224,6 +236,10 @@ class _DispatcherBase(_dispatcher.Dispatcher):
 
         self.doc = py_func.__doc__
         self._compiling_counter = _CompilingCounter()
+        # Background compilation (see enable_background_compile())
+        self._background_compile = False
+        self._background_threads = {}
+        self._background_lock = threading.Lock()
         weakref.finalize(self, self._make_finalizer())
 
     def _reset_overloads(self):
@@ -323,6 +339,80 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         """
         return self._compiling_counter
 
+    def enable_background_compile(self):
+        """
+        Compile the specializations required by calls in a background
+        thread.  Until a specialization is available, calls requiring it
+        run the pure Python function.
+        """
+        self._background_compile = True
+
+    def wait_background_compile(self, timeout=None):
+        """
+        Wait for the pending background compilations to finish.
+        Return whether all of them finished before *timeout* (in seconds).
+        """
+        with self._background_lock:
+            threads = list(self._background_threads.values())
+        for thread in threads:
+            thread.join(timeout)
+            if thread.is_alive():
+                return False
+        return True
+
+    def _compile_in_background(self, argtypes):
+        """
+        Start compiling the specialization for *argtypes* in a background
+        thread, if not already done, and return the callable to use until
+        it is available.  None is returned if the specialization should be
+        compiled in the foreground instead, i.e. if its background
+        compilation failed: this reports the errors to the caller, and
+        further calls with these types keep compiling in the foreground.
+        """
+        with self._background_lock:
+            thread = self._background_threads.get(argtypes)
+            if thread is None:
+                thread = threading.Thread(
+                    target=self._background_compile_target, args=(argtypes,),
+                    name="numba-compile-%s" % (self.py_func.__name__,),
+                    daemon=True)
+                self._background_threads[argtypes] = thread
+                thread.start()
+            elif not thread.is_alive():
+                # The thread is done and compilation failed, as successful
+                # threads are forgotten before they end.  The thread is
+                # kept so that it isn't started again.
+                return None
+        if self._fold_args:
+            return self._call_py_func_folded
+        return self.py_func
+
+    def _call_py_func_folded(self, *args):
+        """
+        Call the pure Python function with arguments folded by the
+        dispatcher (see find_named_args() in _dispatcher.c): omitted
+        arguments are OmittedArg instances holding their default value and
+        the star-arg, if any, is packed as a tuple in last position.
+        """
+        args = [a.value if isinstance(a, OmittedArg) else a for a in args]
+        if self._has_stararg:
+            args[-1:] = args[-1]
+        return self.py_func(*args)
+
+    def _background_compile_target(self, argtypes):
+        try:
+            self.compile(argtypes)
+        except Exception:
+            # The error will be raised by compiling in the foreground
+            # on the next call with these types.
+            pass
+        finally:
+            # Successful compilations needn't be remembered anymore, as
+            # further calls will find the new overload.
+            with self._background_lock:
+                if argtypes in self.overloads:
+                    self._background_threads.pop(argtypes, None)
+
     def _compile_for_args(self, *args, **kws):
         """
         For internal use.  Compile a specialized version of the function
@@ -349,6 +439,10 @@ class _DispatcherBase(_dispatcher.Dispatcher):
                 argtypes.append(types.Omitted(a.value))
             else:
                 argtypes.append(self.typeof_pyval(a))
+        if self._background_compile:
+            fallback = self._compile_in_background(tuple(argtypes))
+            if fallback is not None:
+                return fallback
         try:
             return self.compile(tuple(argtypes))
         except errors.ForceLiteralArg as e:
@@ -554,6 +648,31 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         return dict((sig, self.inspect_disasm_cfg(sig))
                     for sig in self.signatures)
 
+    def inspect_vectorization(self, signature=None):
+        """
+        For inspecting which loops of the function LLVM vectorized, and why
+        the others were not vectorized.
+
+        The function is recompiled with debug info for the given signature
+        and the optimization remarks of the LLVM loop and SLP vectorizers
+        are attributed to the loops of the source.
+
+        signature : tuple of Numba types, optional
+            Return the report for only the given signature. If None, a
+            dictionary of reports by signature is returned.
+
+        Returns
+        -------
+        report : numba.misc.vectorization.VectorizationReport or dict
+        """
+        from numba.misc import vectorization
+
+        if signature is not None:
+            return vectorization.inspect_vectorization(self, signature)
+
+        return dict((sig, self.inspect_vectorization(sig))
+                    for sig in self.signatures)
+
     def get_annotation_info(self, signature=None):
         """
         Gets the annotation information for the function specified by
@@ -630,6 +749,146 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         return tp
 
 
+# The pool of worker processes used by Dispatcher.compile_parallel()
+_compile_executor = None
+_compile_executor_workers = 0
+
+
+def _get_compile_executor():
+    global _compile_executor, _compile_executor_workers
+    workers = config.COMPILE_WORKERS
+    if _compile_executor is None or _compile_executor_workers != workers:
+        _shutdown_compile_executor()
+        # Use "spawn" as the compiler state must not be inherited through fork
+        ctx = multiprocessing.get_context('spawn')
+        _compile_executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx,
+            initializer=_init_compile_worker)
+        _compile_executor_workers = workers
+    return _compile_executor
+
+
+def _shutdown_compile_executor():
+    global _compile_executor
+    if _compile_executor is not None:
+        _compile_executor.shutdown(wait=False)
+        _compile_executor = None
+
+
+def _init_compile_worker():
+    # Workers don't spawn workers themselves
+    os.environ['NUMBA_COMPILE_WORKERS'] = '0'
+    config.reload_config()
+
+
+def _compile_in_worker(dispatcher_class, func_state, locals, targetoptions,
+                       impl_kind, pipeline_class, cache, sig):
+    """
+    Compile *sig* in a worker process, for a function rebuilt from the
+    state sent by Dispatcher._submit_to_compile_workers().
+
+    Return a (codegen magic tuple, reduced CompileResult) pair, or None if
+    the result can't be sent back, in which case the parent process
+    compiles the signature itself.  Unlike for the cache, the reduced
+    CompileResult carries all the metadata that can be pickled.
+    """
+    code, globs, qualname, defaults, cells = func_state
+    # Unlike serialize._rebuild_function(), don't import the function's
+    # module as it may well be the one being imported by the parent.
+    code = serialize._rebuild_code(*code)
+    if cells:
+        cells = tuple(serialize._dummy_closure(v).__closure__[0]
+                      for v in cells)
+    else:
+        cells = ()
+    py_func = pytypes.FunctionType(code, globs, code.co_name, defaults, cells)
+    py_func.__qualname__ = qualname
+    disp = dispatcher_class(py_func, locals=locals,
+                            targetoptions=targetoptions, impl_kind=impl_kind,
+                            pipeline_class=pipeline_class)
+    if cache:
+        disp.enable_caching()
+    try:
+        disp.compile(sig)
+    except Exception:
+        return None
+    [cres] = disp.overloads.values()
+    if cres.lifted or cres.library.has_dynamic_globals:
+        return None
+    payload = cres._reduce()[:-1] + (_picklable_metadata(cres.metadata),)
+    return cres.target_context.codegen().magic_tuple(), payload
+
+
+def _picklable_metadata(metadata):
+    """
+    Return the items of the compilation *metadata* that can be sent back
+    from a worker process.
+    """
+    out = {}
+    for k, v in (metadata or {}).items():
+        # The parfor diagnostics refer to the function's IR
+        if k == 'parfor_diagnostics':
+            continue
+        try:
+            pickle.dumps(v, protocol=-1)
+        except Exception:
+            continue
+        out[k] = v
+    return out
+
+
+# The tests of an ``if __name__ == '__main__':`` statement
+_MAIN_GUARD_TESTS = frozenset(
+    ast.dump(ast.parse(src, mode='eval').body)
+    for src in ("__name__ == '__main__'", "'__main__' == __name__"))
+
+
+def _called_from_unguarded_main():
+    """
+    Whether the current call comes from the top-level code of the __main__
+    module outside of an ``if __name__ == '__main__':`` block.  The worker
+    processes, which are spawned, would run that code again when importing
+    the __main__ module.
+    """
+    main = sys.modules.get('__main__')
+    filename = getattr(main, '__file__', None)
+    if filename is None:
+        # e.g. an interactive session, which isn't imported by the workers
+        return False
+    frame = sys._getframe(1)
+    while frame is not None:
+        if (frame.f_globals is main.__dict__ and
+                frame.f_code.co_name == '<module>'):
+            break
+        frame = frame.f_back
+    else:
+        return False
+    try:
+        with tokenize.open(filename) as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError, ValueError):
+        return False
+
+    def first_lineno(node):
+        decorators = getattr(node, 'decorator_list', ())
+        return min([node.lineno] + [d.lineno for d in decorators])
+
+    lineno = frame.f_lineno
+    body = tree.body
+    for i, node in enumerate(body):
+        if not (isinstance(node, ast.If) and
+                ast.dump(node.test) in _MAIN_GUARD_TESTS):
+            continue
+        # Not using end_lineno, which isn't available in Python < 3.8
+        if i + 1 < len(body):
+            end = first_lineno(body[i + 1]) - 1
+        else:
+            end = lineno
+        if node.lineno <= lineno <= end:
+            return False
+    return True
+
+
 class Dispatcher(_DispatcherBase):
     """
     Implementation of user-facing dispatcher objects (i.e. created using
@@ -704,6 +963,18 @@ class Dispatcher(_DispatcherBase):
     def enable_caching(self):
         self._cache = FunctionCache(self.py_func)
 
+    def enable_overload_caching(self):
+        """
+        Cache the compiled specializations of an @overload implementation.
+        Unlike enable_caching(), this is a no-op if the function cannot
+        be cached.
+        """
+        try:
+            self._cache = OverloadCache(self.py_func)
+        except RuntimeError:
+            # No cache locator available for the source file
+            pass
+
     def __get__(self, obj, objtype=None):
         '''Allow a JIT function to be bound as a method to an object'''
         if obj is None:  # Unbound method
@@ -767,26 +1038,42 @@ class Dispatcher(_DispatcherBase):
         self._memo[u] = self
         self._recent.append(self)
 
-    @global_compiler_lock
     def compile(self, sig):
         if not self._can_compile:
             raise RuntimeError("compilation disabled")
+        # An existing overload is returned without taking the compiler lock,
+        # so that callers are not blocked by other threads compiling
+        # unrelated functions.  Only tuples of types are looked up here, as
+        # parsing other signatures creates types.
+        if isinstance(sig, tuple):
+            existing = self.overloads.get(sig)
+            if existing is not None:
+                return existing.entry_point
+        # Read the disk cache before taking the compiler lock, as this
+        # doesn't touch the shared compiler state.  This is only possible
+        # once the cache of this dispatcher was used with the lock held.
+        cached = self._cache.fetch_overload(sig, self.targetctx)
+        return self._compile_locked(sig, cached)
+
+    @global_compiler_lock
+    def _compile_locked(self, sig, cached):
         # Use counter to track recursion compilation depth
         with self._compiling_counter:
             args, return_type = sigutils.normalize_signature(sig)
             # Don't recompile if signature already exists
+            # (e.g. if another thread compiled it before we got the lock)
             existing = self.overloads.get(tuple(args))
             if existing is not None:
                 return existing.entry_point
-            # Try to load from disk cache
-            cres = self._cache.load_overload(sig, self.targetctx)
+            # Load from the data read from the disk cache, or read it now if
+            # it couldn't be read without the lock
+            if cached is not None:
+                cres = self._cache.rebuild_overload(cached, self.targetctx)
+            else:
+                cres = self._cache.load_overload(sig, self.targetctx)
             if cres is not None:
                 self._cache_hits[sig] += 1
-                # XXX fold this in add_overload()? (also see compiler.py)
-                if not cres.objectmode and not cres.interpmode:
-                    self.targetctx.insert_user_function(cres.entry_point,
-                                                        cres.fndesc, [cres.library])
-                self.add_overload(cres)
+                self._add_rebuilt_overload(cres)
                 return cres.entry_point
 
             self._cache_misses[sig] += 1
@@ -800,6 +1087,106 @@ class Dispatcher(_DispatcherBase):
             self._cache.save_overload(sig, cres)
             return cres.entry_point
 
+    def _add_rebuilt_overload(self, cres):
+        """
+        Add an overload rebuilt from its serialized form (e.g. loaded from
+        the disk cache).
+        """
+        # XXX fold this in add_overload()? (also see compiler.py)
+        if not cres.objectmode and not cres.interpmode:
+            self.targetctx.insert_user_function(cres.entry_point,
+                                                cres.fndesc, [cres.library])
+        self.add_overload(cres)
+
+    def compile_parallel(self, sigs):
+        """
+        Compile the given signatures, typing and lowering them concurrently
+        in up to NUMBA_COMPILE_WORKERS worker processes.  The results are
+        loaded in this process in the same way as cached ones, so that
+        linking into the JIT engine remains serialized.
+
+        Signatures that cannot be compiled in a worker (e.g. if the function
+        can't be pickled, or uses lifted loops or dynamic globals) are
+        compiled in this process, which also reports any compilation error.
+        So are those of functions using ``parallel=True``, whose parfor
+        diagnostics can't be sent back from a worker.
+        """
+        pending = []
+        for sig in sigs:
+            with global_compiler_lock:
+                args, return_type = sigutils.normalize_signature(sig)
+                if tuple(args) in self.overloads:
+                    continue
+                # Try to load from disk cache first
+                cres = self._cache.load_overload(sig, self.targetctx)
+                if cres is not None:
+                    self._cache_hits[sig] += 1
+                    self._add_rebuilt_overload(cres)
+                    continue
+            pending.append(sig)
+
+        use_workers = (config.COMPILE_WORKERS > 1 and len(pending) > 1 and
+                       not self.targetoptions.get('parallel'))
+        if use_workers and _called_from_unguarded_main():
+            msg = ("NUMBA_COMPILE_WORKERS is ignored when compiling %s from "
+                   "the top-level code of the __main__ module, which the "
+                   "worker processes would run again: move that code into "
+                   "an \"if __name__ == '__main__':\" block."
+                   % (self.py_func.__qualname__,))
+            warnings.warn(msg, errors.NumbaWarning)
+            use_workers = False
+        if use_workers:
+            futures = self._submit_to_compile_workers(pending)
+            for sig, future in futures:
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    msg = ("The compilation worker processes failed (%s), "
+                           "compiling %s in this process."
+                           % (e, self.py_func.__qualname__))
+                    warnings.warn(msg, errors.NumbaWarning)
+                    _shutdown_compile_executor()
+                    break
+                except Exception:
+                    continue
+                if result is None:
+                    continue
+                magic_tuple, payload = result
+                with global_compiler_lock:
+                    codegen = self.targetctx.codegen()
+                    if magic_tuple != codegen.magic_tuple():
+                        continue
+                    self.targetctx.refresh()
+                    cres = compiler.CompileResult._rebuild(self.targetctx,
+                                                           *payload)
+                    self._cache_misses[sig] += 1
+                    self._add_rebuilt_overload(cres)
+
+        for sig in sigs:
+            self.compile(sig)
+
+    def _submit_to_compile_workers(self, sigs):
+        """
+        Submit the compilation of *sigs* to the worker processes.
+        Return a list of (signature, future) pairs.
+        """
+        py_func = self.py_func
+        globs = self._compiler.get_globals_for_reduction()
+        code, globs, _, cells = serialize._reduce_function(py_func, globs)
+        func_state = (code, globs, py_func.__qualname__, py_func.__defaults__,
+                      cells)
+        cache = not isinstance(self._cache, NullCache)
+        args = (type(self), func_state, self.locals, self.targetoptions,
+                self._impl_kind, self._compiler.pipeline_class, cache)
+        try:
+            # Check everything can be sent to the workers upfront
+            pickle.dumps(args, protocol=-1)
+            executor = _get_compile_executor()
+        except Exception:
+            return []
+        return [(sig, executor.submit(_compile_in_worker, *(args + (sig,))))
+                for sig in sigs]
+
     def get_compile_result(self, sig):
         """Compile (if needed) and return the compilation result with the
         given signature.
@@ -853,6 +1240,37 @@ class Dispatcher(_DispatcherBase):
         else:
             [dump(sig) for sig in self.signatures]
 
+    def parallel_stats(self, signature=None):
+        """
+        Return the runtime statistics of the parallel regions of the given
+        signature, as a list of :class:`numba.np.ufunc.parallel_stats.RegionStats`
+        in the order of the parfors.  If no signature is given, a dict of
+        those lists by signature is returned.  The function must have been
+        compiled with :envvar:`NUMBA_PARALLEL_STATS` set.
+        """
+        from numba.np.ufunc import parallel_stats
+
+        def get(sig):
+            metadata = self.overloads[sig].metadata
+            if metadata is None:
+                # Only the metadata of instrumented functions is cached
+                msg = ("No parallel statistics available for %s, which was "
+                       "loaded from the cache without them.  Call "
+                       "recompile() with NUMBA_PARALLEL_STATS set to "
+                       "instrument it." % (sig,))
+                raise ValueError(msg)
+            regions = metadata.get('parallel_stats_regions')
+            if regions is None:
+                msg = ("No parallel statistics available, was the function "
+                       "compiled with 'parallel=True' and "
+                       "NUMBA_PARALLEL_STATS set?")
+                raise ValueError(msg)
+            return parallel_stats.get_stats(list(regions))
+        if signature is not None:
+            return get(signature)
+        else:
+            return dict((sig, get(sig)) for sig in self.signatures)
+
     def get_metadata(self, signature=None):
         """
         Obtain the compilation metadata for a given signature.
@@ -907,8 +1325,17 @@ class LiftedCode(_DispatcherBase):
         """
         pass
 
-    @global_compiler_lock
     def compile(self, sig):
+        # An existing overload is returned without taking the compiler lock
+        # (see Dispatcher.compile())
+        if isinstance(sig, tuple):
+            existing = self.overloads.get(sig)
+            if existing is not None:
+                return existing.entry_point
+        return self._compile_locked(sig)
+
+    @global_compiler_lock
+    def _compile_locked(self, sig):
         # Use counter to track recursion compilation depth
         with self._compiling_counter:
             # XXX this is mostly duplicated from Dispatcher.
@@ -1026,6 +1453,228 @@ class ObjModeLiftedWith(LiftedWith):
                 raise errors.TypingError(msg.format(i))
 
 
+# Bundles of compiled overloads
+
+_BUNDLE_MAGIC = b'NUMBA-BUNDLE-1\n'
+
+
+def _hash_code(h, code):
+    """
+    Update the hash object *h* with the bytecode of the code object *code*,
+    its constants and the names it uses, including those of the code
+    objects nested in its constants (e.g. comprehensions).
+    """
+    h.update(code.co_code)
+    for names in (code.co_names, code.co_varnames, code.co_freevars,
+                  code.co_cellvars):
+        h.update(repr(names).encode())
+    for const in code.co_consts:
+        if isinstance(const, pytypes.CodeType):
+            _hash_code(h, const)
+        elif isinstance(const, frozenset):
+            # The iteration order of sets of strings varies across processes
+            h.update(repr(sorted(map(repr, const))).encode())
+        else:
+            h.update(repr((type(const).__name__, const)).encode())
+
+
+def _code_names(code):
+    """
+    Return the set of the names used by the code object *code* and the
+    code objects nested in its constants.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, pytypes.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _hash_global_value(h, value, names, seen):
+    """
+    Update the hash object *h* with the global *value*, as frozen into the
+    compiled code using it.  Dispatchers are hashed with their code and
+    globals, recursively; *seen* holds those already hashed.  *names*
+    are the names used by the code, which may be attributes of *value*
+    if it is a module.
+    """
+    import numpy as np
+    from numba.core.caching import _describe_closure_value
+
+    if isinstance(value, Dispatcher):
+        py_func = value.py_func
+        desc = ('dispatcher', getattr(py_func, '__module__', None),
+                getattr(py_func, '__qualname__', None))
+        h.update(repr(desc).encode())
+        if value not in seen:
+            seen.add(value)
+            _hash_code(h, py_func.__code__)
+            _hash_globals(h, py_func, seen)
+    elif isinstance(value, pytypes.ModuleType):
+        h.update(repr(('module', value.__name__)).encode())
+        # The attributes used as ``module.attr``
+        for name in sorted(names):
+            attr = getattr(value, name, None)
+            if (attr is not None and
+                    not isinstance(attr, pytypes.ModuleType)):
+                h.update(name.encode())
+                _hash_global_value(h, attr, (), seen)
+    elif isinstance(value, np.ndarray):
+        h.update(repr(('array', value.dtype.str, value.shape)).encode())
+        if value.dtype != object:
+            h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        h.update(repr(('scalar', value.dtype.str, value.item())).encode())
+    else:
+        try:
+            desc = _describe_closure_value(value)
+        except ValueError:
+            desc = ('object', type(value).__module__,
+                    type(value).__qualname__)
+        h.update(repr(desc).encode())
+
+
+def _hash_globals(h, py_func, seen):
+    """
+    Update the hash object *h* with the globals used by *py_func*.
+    """
+    names = _code_names(py_func.__code__)
+    func_globals = py_func.__globals__
+    for name in sorted(names):
+        if name in func_globals:
+            h.update(name.encode())
+            _hash_global_value(h, func_globals[name], names, seen)
+
+
+def _dispatcher_key(disp):
+    """
+    Return the (module name, qualified name, code hash) key identifying
+    *disp* across processes, or None if its function cannot be found by
+    name.  The hash covers the code of the function, the values of the
+    globals it uses, which are frozen into the compiled code, and the
+    code and globals of the dispatchers it calls, directly or not.
+    """
+    py_func = disp.py_func
+    modname = getattr(py_func, '__module__', None)
+    qualname = getattr(py_func, '__qualname__', '')
+    if not modname or '<locals>' in qualname or '<lambda>' in qualname:
+        return None
+    h = hashlib.sha256()
+    _hash_code(h, py_func.__code__)
+    _hash_globals(h, py_func, {disp})
+    return modname, qualname, h.hexdigest()
+
+
+def _find_dispatcher(modname, qualname):
+    """
+    Return the dispatcher at *modname*.*qualname*, importing the module
+    if needed, or None if not found.
+    """
+    try:
+        obj = importlib.import_module(modname)
+    except ImportError:
+        return None
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr, None)
+    return obj if isinstance(obj, Dispatcher) else None
+
+
+def export_bundle(dispatchers, path):
+    """
+    Write the compiled overloads of the given *dispatchers*, and of the
+    dispatchers they call, to the bundle file at *path*.  The bundle can
+    be loaded with import_bundle() in another process to add these
+    overloads without compiling them.
+
+    Dispatchers of functions which cannot be found by their qualified
+    name (e.g. closures), and overloads which cannot be cached (e.g. using
+    lifted loops or dynamic globals), are skipped.  The number of
+    overloads written is returned.
+    """
+    # Find the dispatchers called by the given ones, as recorded in the
+    # typemaps of their overloads (only available for overloads compiled
+    # in this process)
+    todo = list(dispatchers)
+    seen = set()
+    ordered = []
+    while todo:
+        disp = todo.pop()
+        if disp in seen:
+            continue
+        seen.add(disp)
+        ordered.append(disp)
+        for cres in disp.overloads.values():
+            typemap = cres.fndesc.typemap if cres.fndesc else None
+            for ty in (typemap or {}).values():
+                if isinstance(ty, types.Dispatcher):
+                    todo.append(ty.dispatcher)
+
+    entries = []
+    with global_compiler_lock:
+        for disp in ordered:
+            key = _dispatcher_key(disp)
+            if key is None:
+                continue
+            magic_tuple = disp.targetctx.codegen().magic_tuple()
+            for cres in disp.overloads.values():
+                if (cres.interpmode or cres.lifted or
+                        cres.library.has_dynamic_globals):
+                    continue
+                payload = pickle.dumps(cres._reduce(), protocol=-1)
+                entries.append((key, magic_tuple, payload))
+
+    tmpname = '%s.tmp.%d' % (path, os.getpid())
+    with open(tmpname, 'wb') as f:
+        f.write(_BUNDLE_MAGIC)
+        pickle.dump((numba.__version__, entries), f, protocol=-1)
+    utils.file_replace(tmpname, path)
+    return len(entries)
+
+
+def import_bundle(path):
+    """
+    Add the overloads from the bundle file at *path*, written by
+    export_bundle(), to the dispatchers they were compiled for.  No typing
+    or code generation happens.  Dispatchers are found by the qualified
+    name of their function, importing its module if needed; overloads of
+    functions whose code (bytecode, constants or names), global values or
+    callees changed since the bundle was written are skipped, and so are
+    those compiled for another CPU or OS (see Codegen.magic_tuple()).
+    Other types still compile as usual.
+
+    The number of overloads added is returned.  A bundle written by
+    another Numba version is ignored with a warning.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(_BUNDLE_MAGIC)) != _BUNDLE_MAGIC:
+            raise ValueError("%r is not a Numba bundle" % (path,))
+        version, entries = pickle.load(f)
+    if version != numba.__version__:
+        warnings.warn("ignoring bundle %r written by Numba %s"
+                      % (path, version), errors.NumbaWarning)
+        return 0
+
+    count = 0
+    with global_compiler_lock:
+        for (modname, qualname, codehash), magic_tuple, payload in entries:
+            disp = _find_dispatcher(modname, qualname)
+            if disp is None:
+                continue
+            key = _dispatcher_key(disp)
+            if key is None or key[2] != codehash:
+                continue
+            if magic_tuple != disp.targetctx.codegen().magic_tuple():
+                continue
+            disp.targetctx.refresh()
+            cres = compiler.CompileResult._rebuild(disp.targetctx,
+                                                   *pickle.loads(payload))
+            if tuple(cres.signature.args) in disp.overloads:
+                continue
+            disp._add_rebuilt_overload(cres)
+            count += 1
+    return count
+
+
 # Initialize typeof machinery
 _dispatcher.typeof_init(
     OmittedArg,
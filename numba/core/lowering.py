@@ -4,6 +4,7 @@ import operator
 from functools import partial
 
 from llvmlite.llvmpy.core import Constant, Type, Builder
+from llvmlite import ir as llvm_ir
 
 from numba import _dynfunc
 from numba.core import (typing, utils, types, ir, debuginfo, funcdesc,
@@ -104,7 +105,11 @@ class BaseLower(object):
         self.init()
 
     def init(self):
-        pass
+        # The sites of the NRT allocations are process-specific, they are
+        # emitted as dynamic globals
+        self.nrt_profile = (self.context.enable_nrt_profile and
+                            self.context.enable_nrt and
+                            self.context.allow_dynamic_globals)
 
     def init_pyapi(self):
         """
@@ -230,6 +235,21 @@ class BaseLower(object):
         self.builder.position_at_end(entry_block_tail)
         self.builder.branch(self.blkmap[self.firstblk])
 
+        if self.context.enable_arena and self.context.enable_nrt:
+            self.lower_arena_scope()
+
+    def lower_arena_scope(self):
+        """
+        Open a NRT arena scope at the entry of the function and close it
+        before every return, including the returns of exceptions.
+        """
+        self.builder.position_at_start(self.entry_block)
+        self.context.nrt.arena_push(self.builder)
+        for bb in self.function.blocks:
+            if isinstance(bb.terminator, llvm_ir.Ret):
+                self.builder.position_before(bb.terminator)
+                self.context.nrt.arena_pop(self.builder)
+
     def lower_function_body(self):
         """
         Lower the current function's body, and return the entry block.
@@ -359,6 +379,10 @@ class Lower(BaseLower):
         # Set debug location for all subsequent LL instructions
         self.debuginfo.mark_location(self.builder, self.loc)
         self.debug_print(str(inst))
+        if (self.nrt_profile and isinstance(inst, ir.Assign) and
+                isinstance(inst.value, ir.Expr)):
+            self.context.nrt.set_profile_site(self.builder, self.loc,
+                                              self.fndesc.qualname)
         if isinstance(inst, ir.Assign):
             ty = self.typeof(inst.target.name)
             val = self.lower_assign(ty, inst)
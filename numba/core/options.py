@@ -77,6 +77,12 @@ class TargetOptions(object):
         if 'inline' in kws:
             flags.set('inline', kws.pop('inline'))
 
+        if kws.pop('arena', False):
+            flags.set('arena')
+
+        if config.NRT_PROFILE:
+            flags.set('nrt_profile')
+
         flags.set("enable_pyobject_looplift")
 
         if kws:
@@ -2,6 +2,8 @@
 #define NUMBA_EXPORT_DATA(_vartype) static _vartype
 
 #include "_nrt_python.c"
+#include "nrt_pool.h"
+#include "nrt_profile.h"
 
 static PyObject *
 memsys_shutdown(PyObject *self, PyObject *args) {
@@ -17,6 +19,133 @@ memsys_use_cpython_allocator(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+static PyObject *
+memsys_use_pool_allocator(PyObject *self, PyObject *args) {
+    NRT_pool_init(PyMem_RawMalloc,
+                  PyMem_RawRealloc,
+                  PyMem_RawFree);
+    NRT_MemSys_set_allocator(NRT_pool_malloc,
+                             NRT_pool_realloc,
+                             NRT_pool_free);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_pool_trim(PyObject *self, PyObject *args) {
+    return PyLong_FromSize_t(NRT_pool_trim());
+}
+
+/*
+ * Return a list of (thread_id, alloc, free, cache_hit, cache_miss, cached)
+ * tuples for the live threads, and such a tuple for the exited threads.
+ */
+static PyObject *
+memsys_pool_get_stats(PyObject *self, PyObject *args) {
+    NRT_pool_stats *stats = NULL, retired;
+    PyObject *threads = NULL, *item;
+    size_t count = 0, n, i;
+
+    /* Threads may start while the statistics are copied */
+    for (;;) {
+        n = NRT_pool_get_stats(stats, count, &retired);
+        if (n <= count)
+            break;
+        PyMem_Free(stats);
+        count = n + 4;
+        stats = PyMem_New(NRT_pool_stats, count);
+        if (stats == NULL)
+            return PyErr_NoMemory();
+    }
+    threads = PyList_New(n);
+    if (threads == NULL)
+        goto error;
+    for (i = 0; i < n; i++) {
+        item = Py_BuildValue("(Nnnnnn)",
+                             PyLong_FromSize_t(stats[i].thread_id),
+                             stats[i].alloc, stats[i].free,
+                             stats[i].cache_hit, stats[i].cache_miss,
+                             stats[i].cached);
+        if (item == NULL)
+            goto error;
+        PyList_SET_ITEM(threads, i, item);
+    }
+    PyMem_Free(stats);
+    return Py_BuildValue("(N(nnnnnn))", threads, (Py_ssize_t) 0,
+                         retired.alloc, retired.free, retired.cache_hit,
+                         retired.cache_miss, retired.cached);
+error:
+    Py_XDECREF(threads);
+    PyMem_Free(stats);
+    return NULL;
+}
+
+static PyObject *
+memsys_arena_push(PyObject *self, PyObject *args) {
+    return PyLong_FromSize_t(NRT_arena_push());
+}
+
+static PyObject *
+memsys_arena_pop(PyObject *self, PyObject *args) {
+    if (NRT_arena_pop()) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "no NRT arena scope is open in this thread");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_profile_start(PyObject *self, PyObject *args) {
+    NRT_profile_start();
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_profile_stop(PyObject *self, PyObject *args) {
+    NRT_profile_stop();
+    Py_RETURN_NONE;
+}
+
+/*
+ * Return a list of (count, bytes, max_bytes, freed, lifetime) tuples,
+ * indexed by site.
+ */
+static PyObject *
+memsys_profile_get_stats(PyObject *self, PyObject *args) {
+    NRT_profile_site_stats *stats = NULL;
+    PyObject *sites = NULL, *item;
+    size_t count = 0, n, i;
+
+    /* Sites may be added while the statistics are copied */
+    for (;;) {
+        n = NRT_profile_get_stats(stats, count);
+        if (n <= count)
+            break;
+        PyMem_Free(stats);
+        count = n + 16;
+        stats = PyMem_New(NRT_profile_site_stats, count);
+        if (stats == NULL)
+            return PyErr_NoMemory();
+    }
+    sites = PyList_New(n);
+    if (sites == NULL)
+        goto error;
+    for (i = 0; i < n; i++) {
+        item = Py_BuildValue("(nnnnd)", stats[i].count, stats[i].bytes,
+                             stats[i].max_bytes, stats[i].freed,
+                             stats[i].lifetime);
+        if (item == NULL)
+            goto error;
+        PyList_SET_ITEM(sites, i, item);
+    }
+    PyMem_Free(stats);
+    return sites;
+error:
+    Py_XDECREF(sites);
+    PyMem_Free(stats);
+    return NULL;
+}
+
 static PyObject *
 memsys_set_atomic_inc_dec(PyObject *self, PyObject *args) {
     PyObject *addr_inc_obj, *addr_dec_obj;
@@ -118,6 +247,14 @@ static PyMethodDef ext_methods[] = {
 #define declmethod(func) { #func , ( PyCFunction )func , METH_VARARGS , NULL }
 #define declmethod_noargs(func) { #func , ( PyCFunction )func , METH_NOARGS, NULL }
     declmethod_noargs(memsys_use_cpython_allocator),
+    declmethod_noargs(memsys_use_pool_allocator),
+    declmethod_noargs(memsys_pool_trim),
+    declmethod_noargs(memsys_pool_get_stats),
+    declmethod_noargs(memsys_arena_push),
+    declmethod_noargs(memsys_arena_pop),
+    declmethod_noargs(memsys_profile_start),
+    declmethod_noargs(memsys_profile_stop),
+    declmethod_noargs(memsys_profile_get_stats),
     declmethod_noargs(memsys_shutdown),
     declmethod(memsys_set_atomic_inc_dec),
     declmethod(memsys_set_atomic_cas),
@@ -172,6 +309,9 @@ declmethod(MemInfo_data);
 declmethod(MemInfo_varsize_free);
 declmethod(MemInfo_varsize_realloc);
 declmethod(MemInfo_release);
+declmethod(arena_push);
+declmethod(arena_pop);
+declmethod(profile_set_site);
 declmethod(Allocate);
 declmethod(Free);
 declmethod(get_api);
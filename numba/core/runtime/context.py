@@ -87,6 +87,46 @@ class NRTContext(object):
             assert align.type == u32, "align must be a uint32"
         return builder.call(fn, [size, align])
 
+    def arena_push(self, builder):
+        """
+        Open an arena scope in the current thread: until the matching
+        arena_pop(), the small allocations of meminfo_alloc*() are made in
+        an arena, see NRT_arena_push() in "nrt.h".
+        """
+        self._require_nrt()
+
+        mod = builder.module
+        fnty = ir.FunctionType(cgutils.intp_t, [])
+        fn = mod.get_or_insert_function(fnty, name="NRT_arena_push")
+        return builder.call(fn, [])
+
+    def arena_pop(self, builder):
+        """
+        Close the arena scope opened by arena_push().
+        """
+        self._require_nrt()
+
+        mod = builder.module
+        fnty = ir.FunctionType(ir.IntType(32), [])
+        fn = mod.get_or_insert_function(fnty, name="NRT_arena_pop")
+        return builder.call(fn, [])
+
+    def set_profile_site(self, builder, loc, func_name):
+        """
+        Attribute the next allocations of the current thread to the source
+        location `loc` in the function `func_name`, for
+        numba.core.runtime.nrt.profile().
+        """
+        self._require_nrt()
+        from numba.core.runtime.nrt import get_profile_site
+
+        site = get_profile_site(loc.filename, loc.line, func_name)
+        mod = builder.module
+        fnty = ir.FunctionType(ir.VoidType(), [cgutils.intp_t])
+        fn = mod.get_or_insert_function(fnty, name="NRT_profile_set_site")
+        addr = self._context.add_dynamic_addr(builder, site, info=str(loc))
+        builder.call(fn, [builder.ptrtoint(addr, cgutils.intp_t)])
+
     def meminfo_new_varsize(self, builder, size):
         """
         Allocate a MemInfo pointing to a variable-sized data area.  The area
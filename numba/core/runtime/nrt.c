@@ -7,6 +7,12 @@
 #define MIN(a, b) ((a) < (b)) ? (a) : (b)
 #endif
 
+#ifdef _MSC_VER
+#define NRT_THREAD_LOCAL __declspec(thread)
+#else
+#define NRT_THREAD_LOCAL __thread
+#endif
+
 
 typedef int (*atomic_meminfo_cas_func)(void **ptr, void *cmp,
                                        void *repl, void **oldptr);
@@ -56,6 +62,11 @@ struct MemSys {
         NRT_realloc_func realloc;
         NRT_free_func free;
     } allocator;
+    /* Allocation profiling hooks */
+    struct {
+        NRT_profile_alloc_hook alloc;
+        NRT_profile_free_hook free;
+    } profile_hooks;
 };
 
 /* The Memory System object */
@@ -96,6 +107,13 @@ void NRT_MemSys_set_allocator(NRT_malloc_func malloc_func,
     TheMSys.allocator.free = free_func;
 }
 
+void NRT_MemSys_set_profile_hooks(NRT_profile_alloc_hook alloc_hook,
+                                  NRT_profile_free_hook free_hook)
+{
+    TheMSys.profile_hooks.alloc = alloc_hook;
+    TheMSys.profile_hooks.free = free_hook;
+}
+
 void NRT_MemSys_set_atomic_inc_dec(NRT_atomic_inc_dec_func inc,
                                    NRT_atomic_inc_dec_func dec)
 {
@@ -205,15 +223,142 @@ void nrt_internal_dtor_safe(void *ptr, size_t size, void *info) {
     memset(ptr, 0xDE, MIN(size, 256));
 }
 
+/*
+ * Arena allocation.
+ *
+ * While an arena scope is open in a thread (see NRT_arena_push()), the small
+ * allocations of NRT_MemInfo_alloc*() are bump-allocated in a chunk owned by
+ * the thread.  A chunk counts its live blocks plus one reference held by the
+ * thread while it is the current chunk, so releasing a block only decrements
+ * a counter, and the chunk is freed when its count drops to zero.  When the
+ * outermost scope is closed and all the blocks of the current chunk are
+ * dead, the chunk is reset at once and reused by the next scope.  Blocks
+ * that escape the scope keep their chunk alive, wherever they are released.
+ */
+
+#define NRT_ARENA_CHUNK_SIZE (64 * 1024)
+/* Larger allocations are not made in the arena */
+#define NRT_ARENA_MAX_BLOCK (NRT_ARENA_CHUNK_SIZE / 8)
+#define NRT_ARENA_ALIGN(n) (((n) + 15) & ~((size_t) 15))
+
+typedef struct nrt_arena_chunk {
+    size_t live;
+    size_t used;
+    /* The chunk is freed by the allocator that allocated it */
+    NRT_free_func free;
+} nrt_arena_chunk;
+
+/* Precedes the MemInfo of a block allocated in the arena */
+typedef struct {
+    nrt_arena_chunk *chunk;
+    /* The destructor of the MemInfo */
+    NRT_dtor_function dtor;
+    void *dtor_info;
+} nrt_arena_block;
+
+#define NRT_ARENA_CHUNK_HEADER NRT_ARENA_ALIGN(sizeof(nrt_arena_chunk))
+#define NRT_ARENA_BLOCK_HEADER NRT_ARENA_ALIGN(sizeof(nrt_arena_block))
+
+/* The number of arena scopes open in the thread */
+static NRT_THREAD_LOCAL size_t nrt_arena_depth = 0;
+/* The chunk in which the thread allocates */
+static NRT_THREAD_LOCAL nrt_arena_chunk *nrt_arena_current = NULL;
+
+static
+void nrt_arena_chunk_release(nrt_arena_chunk *chunk) {
+    if (TheMSys.atomic_dec(&chunk->live) == 0)
+        chunk->free(chunk);
+}
+
+static
+nrt_arena_block *nrt_arena_allocate(size_t size) {
+    nrt_arena_chunk *chunk = nrt_arena_current;
+    nrt_arena_block *block;
+    size = NRT_ARENA_BLOCK_HEADER + NRT_ARENA_ALIGN(size);
+    if (chunk == NULL || chunk->used + size > NRT_ARENA_CHUNK_SIZE) {
+        chunk = TheMSys.allocator.malloc(NRT_ARENA_CHUNK_SIZE);
+        if (chunk == NULL)
+            return NULL;
+        chunk->live = 1;
+        chunk->used = NRT_ARENA_CHUNK_HEADER;
+        chunk->free = TheMSys.allocator.free;
+        if (nrt_arena_current)
+            nrt_arena_chunk_release(nrt_arena_current);
+        nrt_arena_current = chunk;
+    }
+    block = (nrt_arena_block *) ((char *) chunk + chunk->used);
+    block->chunk = chunk;
+    chunk->used += size;
+    TheMSys.atomic_inc(&chunk->live);
+    TheMSys.atomic_inc(&TheMSys.stats_alloc);
+    return block;
+}
+
 static
-void *nrt_allocate_meminfo_and_data(size_t size, NRT_MemInfo **mi_out) {
+void nrt_arena_dtor(void *ptr, size_t size, void *info) {
+    nrt_arena_block *block = info;
+    if (block->dtor)
+        block->dtor(ptr, size, block->dtor_info);
+}
+
+static
+void nrt_arena_free(nrt_arena_block *block) {
+    nrt_arena_chunk_release(block->chunk);
+    TheMSys.atomic_inc(&TheMSys.stats_free);
+}
+
+size_t NRT_arena_push(void) {
+    return ++nrt_arena_depth;
+}
+
+int NRT_arena_pop(void) {
+    nrt_arena_chunk *chunk = nrt_arena_current;
+    if (nrt_arena_depth == 0)
+        return -1;
+    if (--nrt_arena_depth == 0 && chunk != NULL && chunk->live == 1) {
+        /* All the blocks of the chunk are dead */
+        chunk->used = NRT_ARENA_CHUNK_HEADER;
+    }
+    return 0;
+}
+
+static
+void *nrt_allocate_meminfo_and_data(size_t size, NRT_MemInfo **mi_out,
+                                    nrt_arena_block **block_out) {
     NRT_MemInfo *mi;
-    char *base = NRT_Allocate(sizeof(NRT_MemInfo) + size);
+    char *base;
+    nrt_arena_block *block = NULL;
+    if (nrt_arena_depth && size <= NRT_ARENA_MAX_BLOCK)
+        block = nrt_arena_allocate(sizeof(NRT_MemInfo) + size);
+    if (block != NULL)
+        base = (char *) block + NRT_ARENA_BLOCK_HEADER;
+    else
+        base = NRT_Allocate(sizeof(NRT_MemInfo) + size);
     mi = (NRT_MemInfo *) base;
     *mi_out = mi;
+    *block_out = block;
     return base + sizeof(NRT_MemInfo);
 }
 
+/*
+ * Initialize a MemInfo allocated by nrt_allocate_meminfo_and_data().
+ */
+static
+void nrt_meminfo_init_allocated(NRT_MemInfo *mi, void *data, size_t size,
+                                NRT_dtor_function dtor, void *dtor_info,
+                                nrt_arena_block *block)
+{
+    if (block != NULL) {
+        block->dtor = dtor;
+        block->dtor_info = dtor_info;
+        dtor = nrt_arena_dtor;
+        dtor_info = block;
+    }
+    NRT_MemInfo_init(mi, data, size, dtor, dtor_info);
+    if (TheMSys.profile_hooks.alloc)
+        TheMSys.profile_hooks.alloc(mi, size);
+}
+
 
 static
 void nrt_internal_custom_dtor_safe(void *ptr, size_t size, void *info) {
@@ -230,9 +375,10 @@ void nrt_internal_custom_dtor_safe(void *ptr, size_t size, void *info) {
 
 NRT_MemInfo *NRT_MemInfo_alloc(size_t size) {
     NRT_MemInfo *mi;
-    void *data = nrt_allocate_meminfo_and_data(size, &mi);
+    nrt_arena_block *block;
+    void *data = nrt_allocate_meminfo_and_data(size, &mi, &block);
     NRT_Debug(nrt_debug_print("NRT_MemInfo_alloc %p\n", data));
-    NRT_MemInfo_init(mi, data, size, NULL, NULL);
+    nrt_meminfo_init_allocated(mi, data, size, NULL, NULL, block);
     return mi;
 }
 
@@ -242,22 +388,25 @@ NRT_MemInfo *NRT_MemInfo_alloc_safe(size_t size) {
 
 NRT_MemInfo* NRT_MemInfo_alloc_dtor_safe(size_t size, NRT_dtor_function dtor) {
     NRT_MemInfo *mi;
-    void *data = nrt_allocate_meminfo_and_data(size, &mi);
+    nrt_arena_block *block;
+    void *data = nrt_allocate_meminfo_and_data(size, &mi, &block);
     /* Only fill up a couple cachelines with debug markers, to minimize
        overhead. */
     memset(data, 0xCB, MIN(size, 256));
     NRT_Debug(nrt_debug_print("NRT_MemInfo_alloc_dtor_safe %p %zu\n", data, size));
-    NRT_MemInfo_init(mi, data, size, nrt_internal_custom_dtor_safe, dtor);
+    nrt_meminfo_init_allocated(mi, data, size, nrt_internal_custom_dtor_safe,
+                               dtor, block);
     return mi;
 }
 
 
 static
 void *nrt_allocate_meminfo_and_data_align(size_t size, unsigned align,
-                                          NRT_MemInfo **mi)
+                                          NRT_MemInfo **mi,
+                                          nrt_arena_block **block)
 {
     size_t offset, intptr, remainder;
-    char *base = nrt_allocate_meminfo_and_data(size + 2 * align, mi);
+    char *base = nrt_allocate_meminfo_and_data(size + 2 * align, mi, block);
     intptr = (size_t) base;
     /* See if we are aligned */
     remainder = intptr % align;
@@ -271,26 +420,34 @@ void *nrt_allocate_meminfo_and_data_align(size_t size, unsigned align,
 
 NRT_MemInfo *NRT_MemInfo_alloc_aligned(size_t size, unsigned align) {
     NRT_MemInfo *mi;
-    void *data = nrt_allocate_meminfo_and_data_align(size, align, &mi);
+    nrt_arena_block *block;
+    void *data = nrt_allocate_meminfo_and_data_align(size, align, &mi, &block);
     NRT_Debug(nrt_debug_print("NRT_MemInfo_alloc_aligned %p\n", data));
-    NRT_MemInfo_init(mi, data, size, NULL, NULL);
+    nrt_meminfo_init_allocated(mi, data, size, NULL, NULL, block);
     return mi;
 }
 
 NRT_MemInfo *NRT_MemInfo_alloc_safe_aligned(size_t size, unsigned align) {
     NRT_MemInfo *mi;
-    void *data = nrt_allocate_meminfo_and_data_align(size, align, &mi);
+    nrt_arena_block *block;
+    void *data = nrt_allocate_meminfo_and_data_align(size, align, &mi, &block);
     /* Only fill up a couple cachelines with debug markers, to minimize
        overhead. */
     memset(data, 0xCB, MIN(size, 256));
     NRT_Debug(nrt_debug_print("NRT_MemInfo_alloc_safe_aligned %p %zu\n",
                               data, size));
-    NRT_MemInfo_init(mi, data, size, nrt_internal_dtor_safe, (void*)size);
+    nrt_meminfo_init_allocated(mi, data, size, nrt_internal_dtor_safe,
+                               (void*)size, block);
     return mi;
 }
 
 void NRT_MemInfo_destroy(NRT_MemInfo *mi) {
-    NRT_Free(mi);
+    if (TheMSys.profile_hooks.free)
+        TheMSys.profile_hooks.free(mi);
+    if (mi->dtor == nrt_arena_dtor)
+        nrt_arena_free(mi->dtor_info);
+    else
+        NRT_Free(mi);
     TheMSys.atomic_inc(&TheMSys.stats_mi_free);
 }
 
@@ -357,6 +514,8 @@ NRT_MemInfo *NRT_MemInfo_new_varsize(size_t size)
         return NULL;
 
     mi = NRT_MemInfo_new(data, size, nrt_varsize_dtor, NULL);
+    if (TheMSys.profile_hooks.alloc)
+        TheMSys.profile_hooks.alloc(mi, size);
     NRT_Debug(nrt_debug_print("NRT_MemInfo_varsize_alloc size=%zu "
                               "-> meminfo=%p, data=%p\n", size, mi, data));
     return mi;
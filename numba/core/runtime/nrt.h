@@ -32,6 +32,9 @@ typedef void *(*NRT_malloc_func)(size_t size);
 typedef void *(*NRT_realloc_func)(void *ptr, size_t new_size);
 typedef void (*NRT_free_func)(void *ptr);
 
+typedef void (*NRT_profile_alloc_hook)(NRT_MemInfo *mi, size_t size);
+typedef void (*NRT_profile_free_hook)(NRT_MemInfo *mi);
+
 
 /* Memory System API */
 
@@ -49,6 +52,15 @@ void NRT_MemSys_shutdown(void);
 VISIBILITY_HIDDEN
 void NRT_MemSys_set_allocator(NRT_malloc_func, NRT_realloc_func, NRT_free_func);
 
+/*
+ * Register the functions called after the allocation of a MemInfo by
+ * NRT_MemInfo_alloc*() or NRT_MemInfo_new_varsize*(), and before the
+ * destruction of any MemInfo.  NULL disables a hook.
+ */
+VISIBILITY_HIDDEN
+void NRT_MemSys_set_profile_hooks(NRT_profile_alloc_hook alloc_hook,
+                                  NRT_profile_free_hook free_hook);
+
 /*
  * Register the atomic increment and decrement functions
  */
@@ -194,6 +206,23 @@ void *NRT_MemInfo_varsize_realloc(NRT_MemInfo *mi, size_t size);
 VISIBILITY_HIDDEN
 void NRT_MemInfo_varsize_free(NRT_MemInfo *mi, void *ptr);
 
+/*
+ * Open an arena scope in the calling thread: until the matching
+ * NRT_arena_pop(), the small allocations of NRT_MemInfo_alloc*() in the
+ * thread are bump-allocated in a chunk, and the chunk is reused once they
+ * are all released.  Scopes can be nested.  Returns the number of scopes
+ * open in the thread.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_arena_push(void);
+
+/*
+ * Close the innermost arena scope of the calling thread.  Returns -1 if no
+ * scope is open, 0 otherwise.
+ */
+VISIBILITY_HIDDEN
+int NRT_arena_pop(void);
+
 /*
  * Print debug info to FILE
  */
@@ -1,4 +1,6 @@
+import threading
 from collections import namedtuple
+from contextlib import contextmanager
 from weakref import finalize as _finalize
 
 from numba.core.runtime import nrtdynmod
@@ -6,15 +8,27 @@ from llvmlite import binding as ll
 
 from numba.core.compiler_lock import global_compiler_lock
 from numba.core.typing.typeof import typeof_impl
-from numba.core import types
+from numba.core import config, types
 from numba.core.runtime import _nrt_python as _nrt
 
 _nrt_mstats = namedtuple("nrt_mstats", ["alloc", "free", "mi_alloc", "mi_free"])
 
+_nrt_pool_stats = namedtuple("nrt_pool_stats", ["thread_id", "alloc", "free",
+                                                "cache_hit", "cache_miss",
+                                                "cached"])
+
+_nrt_allocator_stats = namedtuple("nrt_allocator_stats",
+                                  ["threads", "retired"])
+
+_nrt_site_stats = namedtuple("nrt_site_stats",
+                             ["filename", "lineno", "function", "count",
+                              "bytes", "max_bytes", "freed", "lifetime"])
+
 
 class _Runtime(object):
     def __init__(self):
         self._init = False
+        self._allocator = 'system'
 
     @global_compiler_lock
     def initialize(self, ctx):
@@ -106,6 +120,64 @@ class _Runtime(object):
                            mi_free=_nrt.memsys_get_stats_mi_free())
 
 
+    @property
+    def allocator(self):
+        """
+        The name of the allocator of the NRT, 'system' or 'pool'.
+        """
+        return self._allocator
+
+    def set_allocator(self, name):
+        """
+        Select the allocator of the NRT: 'system' for the CPython raw
+        allocator, or 'pool' for a thread-caching allocator of size classes
+        on top of it, which is faster for code making many small allocations.
+
+        The allocator can only be changed while no memory allocated by the
+        NRT is alive, and no other thread is running compiled code.
+        """
+        if name not in ('system', 'pool'):
+            raise ValueError("NRT allocator must be one of 'system' or "
+                             "'pool', got %r" % (name,))
+        if name == self._allocator:
+            return
+        stats = self.get_allocation_stats()
+        live = (stats.alloc - stats.free) + (stats.mi_alloc - stats.mi_free)
+        if live:
+            msg = ("cannot change the NRT allocator while memory allocated "
+                   "by the NRT is alive (%d blocks)")
+            raise RuntimeError(msg % live)
+        if name == 'pool':
+            _nrt.memsys_use_pool_allocator()
+        else:
+            _nrt.memsys_use_cpython_allocator()
+        self._allocator = name
+
+    def get_allocator_stats(self):
+        """
+        Returns the statistics of the 'pool' allocator, a namedtuple of
+        (threads, retired). `threads` is a list of namedtuples of
+        (thread_id, alloc, free, cache_hit, cache_miss, cached) for the live
+        threads that used the allocator, where `thread_id` is the value of
+        `threading.get_ident()` in the thread and `cached` the number of
+        blocks in its cache. `retired` sums the statistics of the threads
+        that exited, its `cached` is the number of blocks in the pool shared
+        by the threads.
+        """
+        threads, retired = _nrt.memsys_pool_get_stats()
+        return _nrt_allocator_stats(threads=[_nrt_pool_stats(*t)
+                                             for t in threads],
+                                    retired=_nrt_pool_stats(*retired))
+
+    def trim_allocator(self):
+        """
+        Release the blocks held by the 'pool' allocator in the shared pool
+        and in the cache of the calling thread to the system allocator.
+        Returns the number of blocks released.
+        """
+        return _nrt.memsys_pool_trim()
+
+
 # Alias to _nrt_python._MemInfo
 MemInfo = _nrt._MemInfo
 
@@ -115,9 +187,142 @@ def typeof_meminfo(val, c):
     return types.MemInfoPointer(types.voidptr)
 
 
+@contextmanager
+def arena():
+    """
+    A context manager opening a NRT arena scope in the calling thread, as
+    the functions compiled with `arena=True` do for the duration of their
+    calls.
+
+    Inside the scope, the small arrays allocated by compiled code in this
+    thread are bump-allocated in a chunk of memory, which is reused at once
+    when the scope is closed if they are all released.  The arrays that
+    are still alive keep their chunk alive and remain valid.
+    """
+    _nrt.memsys_arena_push()
+    try:
+        yield
+    finally:
+        _nrt.memsys_arena_pop()
+
+
+# The (filename, lineno, function) of the allocation sites, indexed by the
+# site identifiers passed to NRT_profile_set_site(), site 0 is unknown
+_profile_sites = [(None, None, None)]
+_profile_site_ids = {}
+_profile_lock = threading.Lock()
+_profile_active = False
+
+
+def get_profile_site(filename, lineno, function):
+    """
+    Returns the identifier of the allocation site at `lineno` of `filename`
+    in `function`.
+    """
+    key = (filename, lineno, function)
+    with _profile_lock:
+        try:
+            return _profile_site_ids[key]
+        except KeyError:
+            site = _profile_site_ids[key] = len(_profile_sites)
+            _profile_sites.append(key)
+            return site
+
+
+class AllocationProfile(object):
+    """
+    The NRT allocations recorded by profile(), by allocation site.
+    """
+
+    def __init__(self):
+        self.sites = []
+
+    def _collect(self):
+        self.sites = []
+        with _profile_lock:
+            sites = list(_profile_sites)
+        for site, stats in enumerate(_nrt.memsys_profile_get_stats()):
+            if stats[0]:
+                self.sites.append(_nrt_site_stats(*(sites[site] + stats)))
+
+    def top(self, n=10, key='bytes'):
+        """
+        Returns the statistics of the `n` sites allocating the most, by
+        `key`: 'bytes', 'count', 'max_bytes' or 'live'.  Each is a
+        namedtuple of (filename, lineno, function, count, bytes, max_bytes,
+        freed, lifetime), where `freed` is the number of the allocations
+        released while profiling and `lifetime` the sum of their lifetimes
+        in seconds.
+        """
+        keys = {'bytes': lambda s: s.bytes,
+                'count': lambda s: s.count,
+                'max_bytes': lambda s: s.max_bytes,
+                'live': lambda s: s.count - s.freed}
+        if key not in keys:
+            raise ValueError("key must be one of %s, got %r"
+                             % (", ".join(sorted(keys)), key))
+        return sorted(self.sites, key=keys[key], reverse=True)[:n]
+
+    def report(self, n=10, key='bytes'):
+        """
+        Returns a text report of the `n` sites allocating the most, see
+        top().
+        """
+        lines = ["NRT allocations by site (top %d by %s)" % (n, key),
+                 "%10s %14s %10s %10s %14s  %s"
+                 % ("count", "bytes", "max bytes", "live", "mean lifetime",
+                    "site")]
+        for s in self.top(n, key):
+            if s.filename is None:
+                location = "<unknown>"
+            else:
+                location = "%s:%d (%s)" % (s.filename, s.lineno, s.function)
+            lifetime = ("%.3g s" % (s.lifetime / s.freed)
+                        if s.freed else "-")
+            lines.append("%10d %14d %10d %10d %14s  %s"
+                         % (s.count, s.bytes, s.max_bytes, s.count - s.freed,
+                            lifetime, location))
+        return "\n".join(lines)
+
+    def dump(self, n=10, key='bytes', file=None):
+        """
+        Print the report of the `n` sites allocating the most, see top().
+        """
+        print(self.report(n, key), file=file)
+
+
+@contextmanager
+def profile():
+    """
+    A context manager recording the NRT allocations made in its scope, by
+    allocation site.  It yields an AllocationProfile which is filled when the
+    scope is exited.
+
+    The allocations are attributed to the source lines of the functions
+    compiled while the NUMBA_NRT_PROFILE environment variable is set, the
+    other allocations are attributed to the last such line executed by the
+    thread, or to an unknown site.
+    """
+    global _profile_active
+    with _profile_lock:
+        if _profile_active:
+            raise RuntimeError("an NRT allocation profile is already active")
+        _profile_active = True
+    prof = AllocationProfile()
+    _nrt.memsys_profile_start()
+    try:
+        yield prof
+    finally:
+        _nrt.memsys_profile_stop()
+        prof._collect()
+        with _profile_lock:
+            _profile_active = False
+
+
 # Create runtime
 _nrt.memsys_use_cpython_allocator()
 rtsys = _Runtime()
+rtsys.set_allocator(config.NRT_ALLOCATOR)
 
 # Install finalizer
 _finalize(rtsys, _Runtime.shutdown)
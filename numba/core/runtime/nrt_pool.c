@@ -0,0 +1,397 @@
+/*
+ * A thread-caching size-class allocator for the NRT.
+ *
+ * Requests of up to NRT_POOL_MAX_SIZE bytes are rounded up to one of
+ * NRT_POOL_NUM_CLASSES size classes.  Freed blocks are not returned to the
+ * underlying allocator but kept in a free list of their size class, first
+ * in a cache owned by the freeing thread, which needs no locking, and when
+ * the cache of a class is full, in a shared pool protected by a lock.  A
+ * thread whose cache is empty takes a batch of blocks from the shared pool
+ * before falling back to the underlying allocator.  Larger requests are
+ * passed to the underlying allocator.
+ *
+ * Each block is preceded by a header holding its size class, so that
+ * NRT_pool_free() and NRT_pool_realloc() know where the block belongs.
+ *
+ * The cache of a thread is returned to the shared pool when the thread
+ * exits (POSIX only, on Windows the cache of an exited thread is kept).
+ * NRT_pool_trim() releases the blocks of the shared pool.
+ */
+
+#include <string.h>
+
+#ifdef _MSC_VER
+#include <windows.h>
+#define NRT_POOL_WINTHREAD
+#define NRT_POOL_THREAD_LOCAL __declspec(thread)
+typedef CRITICAL_SECTION pool_lock_t;
+#define pool_lock_init(lock) InitializeCriticalSection(lock)
+#define pool_lock(lock) EnterCriticalSection(lock)
+#define pool_unlock(lock) LeaveCriticalSection(lock)
+#else
+#include <pthread.h>
+#define NRT_POOL_PTHREAD
+#define NRT_POOL_THREAD_LOCAL __thread
+typedef pthread_mutex_t pool_lock_t;
+#define pool_lock_init(lock) pthread_mutex_init(lock, NULL)
+#define pool_lock(lock) pthread_mutex_lock(lock)
+#define pool_unlock(lock) pthread_mutex_unlock(lock)
+#endif
+
+#include "nrt_pool.h"
+
+/* Keeps the blocks aligned like the underlying allocator */
+#define HEADER_SIZE 16
+/* The size class of the blocks larger than NRT_POOL_MAX_SIZE */
+#define LARGE_CLASS NRT_POOL_NUM_CLASSES
+/* The number of bytes of each size class a thread cache can hold */
+#define CACHE_BYTES (64 * 1024)
+/* The minimum number of blocks of each size class a thread cache can hold */
+#define CACHE_MIN_BLOCKS 16
+
+static const size_t class_sizes[NRT_POOL_NUM_CLASSES] = {
+    16, 32, 48, 64, 80, 96, 112, 128,
+    160, 192, 224, 256,
+    320, 384, 448, 512,
+    640, 768, 896, 1024,
+    1280, 1536, 1792, 2048,
+    2560, 3072, 3584, 4096,
+};
+
+typedef struct {
+    size_t cls;
+    size_t padding;
+} block_header;
+
+typedef struct free_block {
+    struct free_block *next;
+} free_block;
+
+typedef struct {
+    free_block *head;
+    size_t count;
+} free_list;
+
+typedef struct thread_cache {
+    free_list lists[NRT_POOL_NUM_CLASSES];
+    NRT_pool_stats stats;
+    struct thread_cache *prev, *next;
+} thread_cache;
+
+static struct {
+    int initialized;
+    NRT_malloc_func malloc;
+    NRT_realloc_func realloc;
+    NRT_free_func free;
+    /* The size class of each (size + 15) / 16 */
+    unsigned char size_to_class[NRT_POOL_MAX_SIZE / 16 + 1];
+    /* Protects the members below */
+    pool_lock_t lock;
+    free_list lists[NRT_POOL_NUM_CLASSES];
+    thread_cache *caches;
+    NRT_pool_stats retired;
+#ifdef NRT_POOL_PTHREAD
+    pthread_key_t key;
+#endif
+} Pool;
+
+static NRT_POOL_THREAD_LOCAL thread_cache *tls_cache = NULL;
+
+
+static size_t
+cache_limit(size_t cls) {
+    size_t limit = CACHE_BYTES / class_sizes[cls];
+    return limit < CACHE_MIN_BLOCKS ? CACHE_MIN_BLOCKS : limit;
+}
+
+static void *
+to_payload(block_header *header) {
+    return (char *) header + HEADER_SIZE;
+}
+
+static block_header *
+to_header(void *ptr) {
+    return (block_header *) ((char *) ptr - HEADER_SIZE);
+}
+
+static size_t
+current_thread_id(void) {
+#ifdef NRT_POOL_WINTHREAD
+    return (size_t) GetCurrentThreadId();
+#else
+    return (size_t) pthread_self();
+#endif
+}
+
+/* Move the first *count* blocks of *list* to the shared pool */
+static void
+flush_blocks(free_list *list, size_t cls, size_t count) {
+    free_block *first = list->head, *last = list->head;
+    size_t i;
+    if (count == 0)
+        return;
+    for (i = 1; i < count; i++)
+        last = last->next;
+    list->head = last->next;
+    list->count -= count;
+    pool_lock(&Pool.lock);
+    last->next = Pool.lists[cls].head;
+    Pool.lists[cls].head = first;
+    Pool.lists[cls].count += count;
+    pool_unlock(&Pool.lock);
+}
+
+static void
+flush_cache(thread_cache *cache) {
+    size_t cls;
+    for (cls = 0; cls < NRT_POOL_NUM_CLASSES; cls++) {
+        flush_blocks(&cache->lists[cls], cls, cache->lists[cls].count);
+    }
+}
+
+#ifdef NRT_POOL_PTHREAD
+/* Called when a thread with a cache exits */
+static void
+release_cache(void *arg) {
+    thread_cache *cache = arg;
+    flush_cache(cache);
+    pool_lock(&Pool.lock);
+    Pool.retired.alloc += cache->stats.alloc;
+    Pool.retired.free += cache->stats.free;
+    Pool.retired.cache_hit += cache->stats.cache_hit;
+    Pool.retired.cache_miss += cache->stats.cache_miss;
+    if (cache->prev)
+        cache->prev->next = cache->next;
+    else
+        Pool.caches = cache->next;
+    if (cache->next)
+        cache->next->prev = cache->prev;
+    pool_unlock(&Pool.lock);
+    tls_cache = NULL;
+    Pool.free(cache);
+}
+#endif
+
+static thread_cache *
+get_cache(void) {
+    thread_cache *cache = tls_cache;
+    if (cache != NULL)
+        return cache;
+    cache = Pool.malloc(sizeof(thread_cache));
+    if (cache == NULL)
+        return NULL;
+    memset(cache, 0, sizeof(thread_cache));
+    cache->stats.thread_id = current_thread_id();
+    pool_lock(&Pool.lock);
+    cache->next = Pool.caches;
+    if (Pool.caches)
+        Pool.caches->prev = cache;
+    Pool.caches = cache;
+    pool_unlock(&Pool.lock);
+#ifdef NRT_POOL_PTHREAD
+    pthread_setspecific(Pool.key, cache);
+#endif
+    tls_cache = cache;
+    return cache;
+}
+
+static void *
+new_block(size_t cls, size_t size) {
+    block_header *header = Pool.malloc(size + HEADER_SIZE);
+    if (header == NULL)
+        return NULL;
+    header->cls = cls;
+    return to_payload(header);
+}
+
+/* Take up to half a cache of blocks from the shared pool */
+static void
+refill_cache(free_list *list, size_t cls) {
+    size_t count = 0, batch = cache_limit(cls) / 2;
+    free_block *first, *last;
+    pool_lock(&Pool.lock);
+    first = last = Pool.lists[cls].head;
+    if (first != NULL) {
+        count = 1;
+        while (count < batch && last->next != NULL) {
+            last = last->next;
+            count++;
+        }
+        Pool.lists[cls].head = last->next;
+        Pool.lists[cls].count -= count;
+        last->next = list->head;
+        list->head = first;
+        list->count += count;
+    }
+    pool_unlock(&Pool.lock);
+}
+
+void
+NRT_pool_init(NRT_malloc_func malloc_func,
+              NRT_realloc_func realloc_func,
+              NRT_free_func free_func)
+{
+    size_t i, cls = 0;
+    if (Pool.initialized)
+        return;
+    Pool.malloc = malloc_func;
+    Pool.realloc = realloc_func;
+    Pool.free = free_func;
+    for (i = 0; i <= NRT_POOL_MAX_SIZE / 16; i++) {
+        while (class_sizes[cls] < i * 16)
+            cls++;
+        Pool.size_to_class[i] = (unsigned char) cls;
+    }
+    pool_lock_init(&Pool.lock);
+#ifdef NRT_POOL_PTHREAD
+    pthread_key_create(&Pool.key, release_cache);
+#endif
+    Pool.initialized = 1;
+}
+
+void *
+NRT_pool_malloc(size_t size) {
+    thread_cache *cache;
+    free_list *list;
+    free_block *block;
+    size_t cls;
+
+    cache = get_cache();
+    if (size > NRT_POOL_MAX_SIZE) {
+        if (cache) {
+            cache->stats.alloc++;
+            cache->stats.cache_miss++;
+        }
+        return new_block(LARGE_CLASS, size);
+    }
+    cls = Pool.size_to_class[(size + 15) / 16];
+    if (cache == NULL)
+        return new_block(cls, class_sizes[cls]);
+
+    cache->stats.alloc++;
+    list = &cache->lists[cls];
+    if (list->head == NULL) {
+        cache->stats.cache_miss++;
+        refill_cache(list, cls);
+        if (list->head == NULL)
+            return new_block(cls, class_sizes[cls]);
+    } else {
+        cache->stats.cache_hit++;
+    }
+    block = list->head;
+    list->head = block->next;
+    list->count--;
+    return block;
+}
+
+void
+NRT_pool_free(void *ptr) {
+    thread_cache *cache;
+    free_list *list;
+    free_block *block = ptr;
+    block_header *header;
+    size_t cls;
+
+    if (ptr == NULL)
+        return;
+    header = to_header(ptr);
+    cls = header->cls;
+    cache = get_cache();
+    if (cache)
+        cache->stats.free++;
+    if (cls == LARGE_CLASS) {
+        Pool.free(header);
+        return;
+    }
+    if (cache == NULL) {
+        pool_lock(&Pool.lock);
+        block->next = Pool.lists[cls].head;
+        Pool.lists[cls].head = block;
+        Pool.lists[cls].count++;
+        pool_unlock(&Pool.lock);
+        return;
+    }
+    list = &cache->lists[cls];
+    block->next = list->head;
+    list->head = block;
+    list->count++;
+    if (list->count > cache_limit(cls)) {
+        /* Keep half of the cache for the next allocations */
+        flush_blocks(list, cls, list->count - cache_limit(cls) / 2);
+    }
+}
+
+void *
+NRT_pool_realloc(void *ptr, size_t size) {
+    block_header *header;
+    void *new_ptr;
+    size_t old_size;
+
+    if (ptr == NULL)
+        return NRT_pool_malloc(size);
+    header = to_header(ptr);
+    if (header->cls == LARGE_CLASS && size > NRT_POOL_MAX_SIZE) {
+        header = Pool.realloc(header, size + HEADER_SIZE);
+        return header ? to_payload(header) : NULL;
+    }
+    if (header->cls != LARGE_CLASS && size <= class_sizes[header->cls]) {
+        /* The block is large enough */
+        return ptr;
+    }
+    new_ptr = NRT_pool_malloc(size);
+    if (new_ptr == NULL)
+        return NULL;
+    /* A large block is only moved to a size class when shrinking */
+    old_size = header->cls == LARGE_CLASS ? size : class_sizes[header->cls];
+    memcpy(new_ptr, ptr, old_size < size ? old_size : size);
+    NRT_pool_free(ptr);
+    return new_ptr;
+}
+
+size_t
+NRT_pool_trim(void) {
+    size_t cls, count = 0;
+    free_block *block, *next;
+    if (!Pool.initialized)
+        return 0;
+    if (tls_cache)
+        flush_cache(tls_cache);
+    pool_lock(&Pool.lock);
+    for (cls = 0; cls < NRT_POOL_NUM_CLASSES; cls++) {
+        for (block = Pool.lists[cls].head; block != NULL; block = next) {
+            next = block->next;
+            Pool.free(to_header(block));
+            count++;
+        }
+        Pool.lists[cls].head = NULL;
+        Pool.lists[cls].count = 0;
+    }
+    pool_unlock(&Pool.lock);
+    return count;
+}
+
+size_t
+NRT_pool_get_stats(NRT_pool_stats *out, size_t count,
+                   NRT_pool_stats *retired) {
+    thread_cache *cache;
+    size_t cls, n = 0;
+    if (!Pool.initialized) {
+        memset(retired, 0, sizeof(NRT_pool_stats));
+        return 0;
+    }
+    pool_lock(&Pool.lock);
+    for (cache = Pool.caches; cache != NULL; cache = cache->next, n++) {
+        if (n >= count)
+            continue;
+        out[n] = cache->stats;
+        out[n].cached = 0;
+        for (cls = 0; cls < NRT_POOL_NUM_CLASSES; cls++)
+            out[n].cached += cache->lists[cls].count;
+    }
+    *retired = Pool.retired;
+    retired->cached = 0;
+    for (cls = 0; cls < NRT_POOL_NUM_CLASSES; cls++)
+        retired->cached += Pool.lists[cls].count;
+    pool_unlock(&Pool.lock);
+    return n;
+}
@@ -0,0 +1,67 @@
+/*
+ * A thread-caching size-class allocator for the NRT.
+ */
+
+#ifndef NUMBA_NRT_POOL_H_
+#define NUMBA_NRT_POOL_H_
+
+#include "nrt.h"
+
+/* Number of the size classes, the largest is NRT_POOL_MAX_SIZE bytes */
+#define NRT_POOL_NUM_CLASSES 28
+#define NRT_POOL_MAX_SIZE 4096
+
+/* The allocation statistics of a thread */
+typedef struct {
+    /* The thread identifier, as threading.get_ident() */
+    size_t thread_id;
+    /* Number of allocations and frees made by the thread */
+    size_t alloc;
+    size_t free;
+    /* Allocations served by the cache of the thread */
+    size_t cache_hit;
+    /* Allocations that refilled the cache from the shared pool or the
+       underlying allocator, or that were larger than the size classes */
+    size_t cache_miss;
+    /* Number of blocks currently held by the cache of the thread */
+    size_t cached;
+} NRT_pool_stats;
+
+/*
+ * Initialize the pool, the blocks are allocated with the given functions.
+ */
+VISIBILITY_HIDDEN
+void NRT_pool_init(NRT_malloc_func malloc_func,
+                   NRT_realloc_func realloc_func,
+                   NRT_free_func free_func);
+
+/*
+ * The allocation functions of the pool, for NRT_MemSys_set_allocator().
+ */
+VISIBILITY_HIDDEN
+void *NRT_pool_malloc(size_t size);
+
+VISIBILITY_HIDDEN
+void *NRT_pool_realloc(void *ptr, size_t size);
+
+VISIBILITY_HIDDEN
+void NRT_pool_free(void *ptr);
+
+/*
+ * Return the blocks of the cache of the calling thread and of the shared
+ * pool to the underlying allocator.  Returns the number of blocks released.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_pool_trim(void);
+
+/*
+ * Copy the statistics of at most *count* live threads to *out*, and the
+ * sum of the statistics of the threads that exited to *retired*.  Returns
+ * the number of live threads.  The *cached* statistic of *retired* is the
+ * number of blocks in the shared pool.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_pool_get_stats(NRT_pool_stats *out, size_t count,
+                          NRT_pool_stats *retired);
+
+#endif /* NUMBA_NRT_POOL_H_ */
@@ -0,0 +1,254 @@
+/*
+ * An allocation profiler for the NRT.
+ *
+ * The compiled code sets the current site of the thread before the
+ * instructions which may allocate (see NRT_profile_set_site()).  While
+ * profiling, the allocation hooks of the NRT record the size of each
+ * allocation in the statistics of the current site, and the site and time
+ * of the allocation in a hash table of the live MemInfos, from which the
+ * lifetime of the allocation is computed when it is released.
+ */
+
+#include <string.h>
+
+#ifdef _MSC_VER
+#include <windows.h>
+#define NRT_PROFILE_WINTHREAD
+#define NRT_PROFILE_THREAD_LOCAL __declspec(thread)
+typedef CRITICAL_SECTION profile_lock_t;
+#define profile_lock_init(lock) InitializeCriticalSection(lock)
+#define profile_lock(lock) EnterCriticalSection(lock)
+#define profile_unlock(lock) LeaveCriticalSection(lock)
+#else
+#include <pthread.h>
+#include <time.h>
+#define NRT_PROFILE_THREAD_LOCAL __thread
+typedef pthread_mutex_t profile_lock_t;
+#define profile_lock_init(lock) pthread_mutex_init(lock, NULL)
+#define profile_lock(lock) pthread_mutex_lock(lock)
+#define profile_unlock(lock) pthread_mutex_unlock(lock)
+#endif
+
+#include "nrt_profile.h"
+
+/* The initial capacity of the hash table, a power of two */
+#define INITIAL_CAPACITY 1024
+
+typedef struct {
+    NRT_MemInfo *mi;
+    size_t site;
+    double time;
+} live_entry;
+
+static struct {
+    int initialized;
+    /* Protects the members below */
+    profile_lock_t lock;
+    int active;
+    /* Open addressing hash table of the live MemInfos, with linear
+       probing, NULL marks the empty entries */
+    live_entry *table;
+    size_t capacity, used;
+    NRT_profile_site_stats *sites;
+    size_t num_sites;
+} Profile;
+
+static NRT_PROFILE_THREAD_LOCAL size_t current_site = 0;
+
+
+static double
+current_time(void) {
+#ifdef NRT_PROFILE_WINTHREAD
+    LARGE_INTEGER count, frequency;
+    QueryPerformanceCounter(&count);
+    QueryPerformanceFrequency(&frequency);
+    return (double) count.QuadPart / (double) frequency.QuadPart;
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec * 1e-9;
+#endif
+}
+
+static size_t
+hash_pointer(NRT_MemInfo *mi) {
+    size_t h = (size_t) mi >> 4;
+    h ^= h >> 16;
+    h *= 0x45d9f3b;
+    h ^= h >> 16;
+    return h;
+}
+
+/* Returns the index of the entry of *mi*, or of the empty entry ending its
+   probe sequence */
+static size_t
+find_entry(NRT_MemInfo *mi) {
+    size_t mask = Profile.capacity - 1;
+    size_t i = hash_pointer(mi) & mask;
+    while (Profile.table[i].mi != NULL && Profile.table[i].mi != mi)
+        i = (i + 1) & mask;
+    return i;
+}
+
+static int
+grow_table(void) {
+    live_entry *old_table = Profile.table;
+    size_t old_capacity = Profile.capacity, i;
+    size_t capacity = old_capacity ? 2 * old_capacity : INITIAL_CAPACITY;
+    live_entry *table = malloc(capacity * sizeof(live_entry));
+    if (table == NULL)
+        return -1;
+    memset(table, 0, capacity * sizeof(live_entry));
+    Profile.table = table;
+    Profile.capacity = capacity;
+    for (i = 0; i < old_capacity; i++) {
+        if (old_table[i].mi != NULL)
+            table[find_entry(old_table[i].mi)] = old_table[i];
+    }
+    if (old_table != NULL)
+        free(old_table);
+    return 0;
+}
+
+/* Remove the entry at *i* by shifting back the entries of its cluster */
+static void
+remove_entry(size_t i) {
+    size_t mask = Profile.capacity - 1;
+    size_t j = i, home;
+    for (;;) {
+        j = (j + 1) & mask;
+        if (Profile.table[j].mi == NULL)
+            break;
+        home = hash_pointer(Profile.table[j].mi) & mask;
+        /* Move the entry unless its home is cyclically in (i, j] */
+        if ((i <= j) ? (home <= i || home > j) : (home <= i && home > j)) {
+            Profile.table[i] = Profile.table[j];
+            i = j;
+        }
+    }
+    Profile.table[i].mi = NULL;
+    Profile.used--;
+}
+
+static NRT_profile_site_stats *
+get_site_stats(size_t site) {
+    NRT_profile_site_stats *sites;
+    size_t num_sites;
+    if (site >= Profile.num_sites) {
+        num_sites = site + 1 > 2 * Profile.num_sites
+                    ? site + 1 : 2 * Profile.num_sites;
+        sites = malloc(num_sites * sizeof(NRT_profile_site_stats));
+        if (sites == NULL)
+            return NULL;
+        memset(sites, 0, num_sites * sizeof(NRT_profile_site_stats));
+        if (Profile.sites != NULL) {
+            memcpy(sites, Profile.sites,
+                   Profile.num_sites * sizeof(NRT_profile_site_stats));
+            free(Profile.sites);
+        }
+        Profile.sites = sites;
+        Profile.num_sites = num_sites;
+    }
+    return &Profile.sites[site];
+}
+
+static void
+profile_alloc(NRT_MemInfo *mi, size_t size) {
+    NRT_profile_site_stats *stats;
+    size_t site = current_site, i;
+    double time = current_time();
+    profile_lock(&Profile.lock);
+    if (!Profile.active)
+        goto done;
+    stats = get_site_stats(site);
+    if (stats == NULL)
+        goto done;
+    stats->count++;
+    stats->bytes += size;
+    if (size > stats->max_bytes)
+        stats->max_bytes = size;
+    /* Keep the table at most half full */
+    if (2 * (Profile.used + 1) > Profile.capacity && grow_table())
+        goto done;
+    i = find_entry(mi);
+    if (Profile.table[i].mi == NULL)
+        Profile.used++;
+    Profile.table[i].mi = mi;
+    Profile.table[i].site = site;
+    Profile.table[i].time = time;
+done:
+    profile_unlock(&Profile.lock);
+}
+
+static void
+profile_free(NRT_MemInfo *mi) {
+    NRT_profile_site_stats *stats;
+    size_t i;
+    double time = current_time();
+    profile_lock(&Profile.lock);
+    if (!Profile.active || Profile.used == 0)
+        goto done;
+    i = find_entry(mi);
+    if (Profile.table[i].mi == NULL)
+        /* Allocated before profiling */
+        goto done;
+    stats = &Profile.sites[Profile.table[i].site];
+    stats->freed++;
+    stats->lifetime += time - Profile.table[i].time;
+    remove_entry(i);
+done:
+    profile_unlock(&Profile.lock);
+}
+
+void
+NRT_profile_set_site(size_t site) {
+    current_site = site;
+}
+
+void
+NRT_profile_start(void) {
+    if (!Profile.initialized) {
+        profile_lock_init(&Profile.lock);
+        Profile.initialized = 1;
+    }
+    profile_lock(&Profile.lock);
+    if (Profile.sites != NULL)
+        memset(Profile.sites, 0,
+               Profile.num_sites * sizeof(NRT_profile_site_stats));
+    Profile.active = 1;
+    profile_unlock(&Profile.lock);
+    NRT_MemSys_set_profile_hooks(profile_alloc, profile_free);
+}
+
+void
+NRT_profile_stop(void) {
+    if (!Profile.initialized)
+        return;
+    NRT_MemSys_set_profile_hooks(NULL, NULL);
+    profile_lock(&Profile.lock);
+    Profile.active = 0;
+    if (Profile.table != NULL)
+        free(Profile.table);
+    Profile.table = NULL;
+    Profile.capacity = Profile.used = 0;
+    profile_unlock(&Profile.lock);
+}
+
+size_t
+NRT_profile_get_stats(NRT_profile_site_stats *out, size_t count) {
+    size_t num_sites = 0, i;
+    if (!Profile.initialized)
+        return 0;
+    profile_lock(&Profile.lock);
+    /* Trailing sites without allocations are not reported */
+    for (i = 0; i < Profile.num_sites; i++) {
+        if (Profile.sites[i].count)
+            num_sites = i + 1;
+    }
+    if (count > num_sites)
+        count = num_sites;
+    if (count)
+        memcpy(out, Profile.sites, count * sizeof(NRT_profile_site_stats));
+    profile_unlock(&Profile.lock);
+    return num_sites;
+}
@@ -0,0 +1,50 @@
+/*
+ * An allocation profiler for the NRT, attributing the allocations to the
+ * call sites of the compiled code.
+ */
+
+#ifndef NUMBA_NRT_PROFILE_H_
+#define NUMBA_NRT_PROFILE_H_
+
+#include "nrt.h"
+
+/* The allocation statistics of a call site */
+typedef struct {
+    /* Number of allocations and bytes allocated */
+    size_t count;
+    size_t bytes;
+    /* Size of the largest allocation */
+    size_t max_bytes;
+    /* Number of the allocations released while profiling */
+    size_t freed;
+    /* Sum of the lifetimes of the released allocations, in seconds */
+    double lifetime;
+} NRT_profile_site_stats;
+
+/*
+ * Attribute the next allocations of the calling thread to *site*, an
+ * identifier chosen by the compiler.  Site 0 is the unknown site.
+ */
+VISIBILITY_HIDDEN
+void NRT_profile_set_site(size_t site);
+
+/*
+ * Start recording the allocations, discarding the previous statistics.
+ */
+VISIBILITY_HIDDEN
+void NRT_profile_start(void);
+
+/*
+ * Stop recording the allocations.  The statistics are kept.
+ */
+VISIBILITY_HIDDEN
+void NRT_profile_stop(void);
+
+/*
+ * Copy the statistics of the sites 0 to *count* - 1 to *out*.  Returns the
+ * number of sites with statistics, i.e. the largest site seen plus one.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_profile_get_stats(NRT_profile_site_stats *out, size_t count);
+
+#endif /* NUMBA_NRT_PROFILE_H_ */
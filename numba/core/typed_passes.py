@@ -1,6 +1,7 @@
 from contextlib import contextmanager
 from collections import defaultdict
 from copy import copy
+import functools
 import warnings
 
 from numba.core import (errors, types, typing, ir, funcdesc, rewrites,
@@ -443,6 +444,14 @@ class NoPythonBackend(LoweringPass):
         lowered = state['cr']
         signature = typing.signature(state.return_type, *state.args)
 
+        # The instrumented parallel regions are registered again when the
+        # function is loaded from the cache
+        regions = state.metadata.get('parallel_stats_regions')
+        if regions:
+            from numba.np.ufunc import parallel_stats
+            state.reload_init.append(
+                functools.partial(parallel_stats._register_regions, regions))
+
         from numba.core.compiler import compile_result
         state.cr = compile_result(
             typing_context=state.typingctx,
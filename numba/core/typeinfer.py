@@ -16,6 +16,7 @@ Constraints push types forward following the dataflow.
 import logging
 import operator
 import contextlib
+import heapq
 import itertools
 from pprint import pprint
 from collections import OrderedDict, defaultdict
@@ -41,9 +42,11 @@ _termcolor = termcolor()
 
 
 class TypeVar(object):
-    def __init__(self, context, var):
+    def __init__(self, context, var, changes=None):
         self.context = context
         self.var = var
+        # Set collecting the names of the changed typevars, if any
+        self._changes = changes
         self.type = None
         self.locked = False
         # Stores source location of first definition
@@ -75,6 +78,8 @@ class TypeVar(object):
                 unified = tp
                 self.define_loc = loc
 
+            if unified != self.type:
+                self._changed()
             self.type = unified
 
         return self.type
@@ -96,12 +101,17 @@ class TypeVar(object):
             raise TypingError("No conversion from %s to %s for "
                               "'%s'" % (tp, self.type, self.var), loc=loc)
 
+        self._changed()
         self.type = tp
         self.locked = True
         if self.define_loc is None:
             self.define_loc = loc
         self.literal_value = literal_value
 
+    def _changed(self):
+        if self._changes is not None:
+            self._changes.add(self.var)
+
     def union(self, other, loc):
         if other.type is not None:
             self.add_type(other.type, loc=loc)
@@ -129,50 +139,107 @@ class TypeVar(object):
 
 class ConstraintNetwork(object):
     """
-    TODO: It is possible to optimize constraint propagation to consider only
-          dirty type variables.
+    Execute constraints until the types reach a fixpoint.
+
+    Only the constraints which read a typevar whose type changed since
+    their last execution are re-executed.  The typevars read by each
+    constraint are recorded when executing it (see TypeVarMap).
     """
 
     def __init__(self):
         self.constraints = []
+        # Indices of the constraints to execute
+        self._pending = set()
+        # typevar name -> indices of the constraints reading it
+        self._readers = defaultdict(set)
+        # Indices of the constraints reading all typevars
+        self._reads_all = set()
+        # Constraint index -> error of its last execution
+        self._errors = {}
 
     def append(self, constraint):
+        self._pending.add(len(self.constraints))
         self.constraints.append(constraint)
 
     def propagate(self, typeinfer):
         """
-        Execute all constraints.  Errors are caught and returned as a list.
-        This allows progressing even though some constraints may fail
-        due to lack of information
+        Execute constraints until no type changes.  Errors are caught and
+        returned as a list.  This allows progressing even though some
+        constraints may fail due to lack of information
         (e.g. imprecise types such as List(undefined)).
         """
-        errors = []
-        for constraint in self.constraints:
-            loc = constraint.loc
-            with typeinfer.warnings.catch_warnings(filename=loc.filename,
-                                                   lineno=loc.line):
-                try:
-                    constraint(typeinfer)
-                except ForceLiteralArg as e:
-                    errors.append(e)
-                except TypingError as e:
-                    _logger.debug("captured error", exc_info=e)
-                    new_exc = TypingError(
-                        str(e), loc=constraint.loc,
-                        highlighting=False,
-                    )
-                    errors.append(utils.chain_exception(new_exc, e))
-                except Exception as e:
-                    _logger.debug("captured error", exc_info=e)
-                    msg = ("Internal error at {con}.\n"
-                           "{err}\nEnable logging at debug level for details.")
-                    new_exc = TypingError(
-                        msg.format(con=constraint, err=str(e)),
-                        loc=constraint.loc,
-                        highlighting=False,
-                    )
-                    errors.append(utils.chain_exception(new_exc, e))
-        return errors
+        typevars = typeinfer.typevars
+        # Types may have been changed outside of constraints
+        self._pending |= self._get_readers(typevars.pop_changes())
+        while self._pending:
+            # Each sweep executes the pending constraints in order.  As
+            # all constraints used to be executed in order, this keeps
+            # the outcome independent of the dependency tracking.
+            queue = sorted(self._pending)
+            queued = set(queue)
+            self._pending = set()
+            while queue:
+                index = heapq.heappop(queue)
+                queued.discard(index)
+                self._execute(typeinfer, index)
+                for reader in self._get_readers(typevars.pop_changes()):
+                    if reader > index:
+                        if reader not in queued:
+                            heapq.heappush(queue, reader)
+                            queued.add(reader)
+                    else:
+                        self._pending.add(reader)
+        return [self._errors[i] for i in sorted(self._errors)]
+
+    def _get_readers(self, names):
+        if not names:
+            return set()
+        readers = set(self._reads_all)
+        for name in names:
+            readers.update(self._readers.get(name, ()))
+        return readers
+
+    def _execute(self, typeinfer, index):
+        """
+        Execute the constraint at *index* and record the typevars it read.
+        """
+        constraint = self.constraints[index]
+        with typeinfer.typevars.record_reads() as reads:
+            error = self._execute_constraint(typeinfer, constraint)
+        if reads.all:
+            self._reads_all.add(index)
+        for name in reads:
+            self._readers[name].add(index)
+        if error is None:
+            self._errors.pop(index, None)
+        else:
+            self._errors[index] = error
+
+    def _execute_constraint(self, typeinfer, constraint):
+        loc = constraint.loc
+        with typeinfer.warnings.catch_warnings(filename=loc.filename,
+                                               lineno=loc.line):
+            try:
+                constraint(typeinfer)
+            except ForceLiteralArg as e:
+                return e
+            except TypingError as e:
+                _logger.debug("captured error", exc_info=e)
+                new_exc = TypingError(
+                    str(e), loc=constraint.loc,
+                    highlighting=False,
+                )
+                return utils.chain_exception(new_exc, e)
+            except Exception as e:
+                _logger.debug("captured error", exc_info=e)
+                msg = ("Internal error at {con}.\n"
+                       "{err}\nEnable logging at debug level for details.")
+                new_exc = TypingError(
+                    msg.format(con=constraint, err=str(e)),
+                    loc=constraint.loc,
+                    highlighting=False,
+                )
+                return utils.chain_exception(new_exc, e)
 
 
 class Propagate(object):
@@ -812,15 +879,54 @@ class PrintConstraint(object):
         return self.signature
 
 
+class _TypeVarReads(set):
+    """
+    The names of the typevars read, see TypeVarMap.record_reads().
+    """
+    all = False
+
+
 class TypeVarMap(dict):
     def set_context(self, context):
         self.context = context
+        self._reads = None
+        self._changes = set()
 
     def __getitem__(self, name):
+        if self._reads is not None:
+            self._reads.add(name)
         if name not in self:
-            self[name] = TypeVar(self.context, name)
+            self[name] = TypeVar(self.context, name, self._changes)
         return super(TypeVarMap, self).__getitem__(name)
 
+    def items(self):
+        if self._reads is not None:
+            self._reads.all = True
+        return super(TypeVarMap, self).items()
+
+    @contextlib.contextmanager
+    def record_reads(self):
+        """
+        Record the names of the typevars read in the block into the
+        yielded set.  Its *all* attribute is set if all the typevars
+        were read (e.g. when copying the map).
+        """
+        old_reads = self._reads
+        self._reads = reads = _TypeVarReads()
+        try:
+            yield reads
+        finally:
+            self._reads = old_reads
+
+    def pop_changes(self):
+        """
+        Return the names of the typevars whose type changed since the
+        last call.
+        """
+        changes = set(self._changes)
+        self._changes.clear()
+        return changes
+
     def __setitem__(self, name, value):
         assert isinstance(name, str)
         if name in self:
@@ -973,19 +1079,13 @@ class TypeInferer(object):
         return cloned._unify_return_types(rettypes)
 
     def propagate(self, raise_errors=True):
-        newtoken = self.get_state_token()
-        oldtoken = None
         # Since the number of types are finite, the typesets will eventually
         # stop growing.
-
-        while newtoken != oldtoken:
-            self.debug.propagate_started()
-            oldtoken = newtoken
-            # Errors can appear when the type set is incomplete; only
-            # raise them when there is no progress anymore.
-            errors = self.constraints.propagate(self)
-            newtoken = self.get_state_token()
-            self.debug.propagate_finished()
+        self.debug.propagate_started()
+        # Errors can appear when the type set is incomplete; only
+        # raise them when there is no progress anymore.
+        errors = self.constraints.propagate(self)
+        self.debug.propagate_finished()
         if errors:
             if raise_errors:
                 force_lit_args = [e for e in errors
@@ -1280,12 +1380,6 @@ http://numba.pydata.org/numba-doc/latest/user/troubleshoot.html#my-code-has-an-u
             rettypes.add(typemap[var.name])
         return self._unify_return_types(rettypes)
 
-    def get_state_token(self):
-        """The algorithm is monotonic.  It can only grow or "refine" the
-        typevar map.
-        """
-        return [tv.type for name, tv in sorted(self.typevars.items())]
-
     def constrain_statement(self, inst):
         if isinstance(inst, ir.Assign):
             self.typeof_assign(inst)
@@ -11,7 +11,7 @@ from collections.abc import Sequence
 from types import MethodType, FunctionType
 
 import numba
-from numba.core import types, utils
+from numba.core import types, utils, config
 from numba.core.errors import TypingError, InternalError
 from numba.core.cpu_options import InlineOptions
 
@@ -603,6 +603,11 @@ class _OverloadFunctionTemplate(AbstractTemplate):
         # Make dispatcher
         jitdecor = jit(nopython=True, **self._jit_options)
         disp = jitdecor(pyfunc)
+        # Cache the compiled implementations provided by Numba itself.
+        # Their closure variables are part of the cache key.
+        if (config.CACHE_OVERLOADS and
+                (pyfunc.__module__ or '').startswith('numba.')):
+            disp.enable_overload_caching()
         if cache_key is not None:
             self._impl_cache[cache_key] = disp, args
         return disp, args
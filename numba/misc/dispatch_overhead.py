@@ -0,0 +1,86 @@
+"""
+A microbenchmark of the overhead of calling a ``@njit`` function from
+Python, for each kind of argument resolved by the dispatcher.
+
+Run ``python -m numba.misc.dispatch_overhead`` to print the time taken by a
+call of a jitted function ignoring its argument on this machine, next to
+the time taken by the same call of a pure Python function.  The difference
+is mostly the resolution of the type of the argument and its unboxing.
+"""
+
+import timeit
+from collections import namedtuple
+
+import numpy as np
+
+from numba import njit
+from numba.core import types
+from numba.experimental import jitclass
+
+
+_Point = namedtuple('_Point', ('x', 'y'))
+
+
+@jitclass([('x', types.float64)])
+class _Scalar(object):
+    def __init__(self, x):
+        self.x = x
+
+
+def _ignore(x):
+    pass
+
+
+def _arguments():
+    """
+    Return a list of (kind, value) of the arguments to measure.
+    """
+    return [
+        ('int', 1),
+        ('float', 1.0),
+        ('complex', 1j),
+        ('bool', True),
+        ('numpy scalar', np.float32(1.0)),
+        ('1d array', np.zeros(10)),
+        ('2d F-order array', np.zeros((3, 3), order='F')),
+        ('record array', np.zeros(3, dtype=[('a', np.int32),
+                                            ('b', np.float64)])),
+        ('tuple', (1, 2.0)),
+        ('nested tuple', (1, (2.0, np.zeros(3)))),
+        ('named tuple', _Point(1, 2.0)),
+        ('jitclass instance', _Scalar(1.0)),
+    ]
+
+
+def measure_dispatch_overhead(number=100000, repeat=5):
+    """
+    Measure the time taken by a call of a jitted function for each kind of
+    argument.
+
+    Returns a dict mapping the kind of argument to a dict of the best time
+    in seconds of a call of the ``jitted`` function and of the same
+    ``python`` function.
+    """
+    results = {}
+    for kind, value in _arguments():
+        # A new dispatcher per kind, so that the overloads of the other
+        # kinds don't change its resolution
+        jitted = njit(_ignore)
+        jitted(value)   # compile
+        results[kind] = {}
+        for name, func in (('jitted', jitted), ('python', _ignore)):
+            times = timeit.repeat(lambda: func(value), number=number,
+                                  repeat=repeat)
+            results[kind][name] = min(times) / number
+    return results
+
+
+def main():
+    print("%-20s %12s %12s" % ("Argument", "jitted (ns)", "python (ns)"))
+    for kind, times in measure_dispatch_overhead().items():
+        print("%-20s %12.1f %12.1f" % (kind, times['jitted'] * 1e9,
+                                       times['python'] * 1e9))
+
+
+if __name__ == '__main__':
+    main()
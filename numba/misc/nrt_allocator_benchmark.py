@@ -0,0 +1,89 @@
+"""
+A microbenchmark of the allocators of the Numba runtime on workloads making
+many small allocations, serially and in ``@njit(parallel=True)`` loops.
+
+Run ``python -m numba.misc.nrt_allocator_benchmark`` to print the time taken
+with each allocator on this machine, see :envvar:`NUMBA_NRT_ALLOCATOR`.
+"""
+
+import timeit
+
+import numpy as np
+
+from numba import njit, prange, get_num_threads
+from numba.core.runtime import rtsys
+
+
+def _small_arrays(n):
+    total = 0.0
+    for i in range(n):
+        a = np.empty(8)
+        a[:] = i
+        total += a.sum()
+    return total
+
+
+def _list_of_arrays(n):
+    arrays = [np.zeros(4) for _ in range(n)]
+    total = 0.0
+    for a in arrays:
+        total += a[0]
+    return total
+
+
+def _parallel_small_arrays(n):
+    out = np.empty(n)
+    for i in prange(n):
+        a = np.empty(8)
+        a[:] = i
+        out[i] = a.sum()
+    return out.sum()
+
+
+_workloads = [
+    ('small arrays', njit(_small_arrays)),
+    ('list of arrays', njit(_list_of_arrays)),
+    ('parallel small arrays', njit(parallel=True)(_parallel_small_arrays)),
+]
+
+
+def measure_allocators(n=100000, number=10, repeat=5):
+    """
+    Measure the time taken by the workloads with each allocator.
+
+    Returns a dict mapping the name of each workload to a dict of the best
+    time in seconds with the ``system`` and ``pool`` allocators.  The
+    allocator is switched for the measurement, so no memory allocated by
+    the runtime may be alive.
+    """
+    previous = rtsys.allocator
+    results = {name: {} for name, _ in _workloads}
+    try:
+        for allocator in ('system', 'pool'):
+            rtsys.set_allocator(allocator)
+            for name, func in _workloads:
+                func(n)   # compile and warm up the caches
+                times = timeit.repeat(lambda: func(n), number=number,
+                                      repeat=repeat)
+                results[name][allocator] = min(times) / number
+    finally:
+        rtsys.set_allocator(previous)
+    return results
+
+
+def main():
+    print("Number of threads: %d" % get_num_threads())
+    print("%-24s %12s %12s %8s" % ("Workload", "system (ms)", "pool (ms)",
+                                   "speedup"))
+    for name, times in measure_allocators().items():
+        print("%-24s %12.3f %12.3f %7.2fx"
+              % (name, times['system'] * 1e3, times['pool'] * 1e3,
+                 times['system'] / times['pool']))
+    stats = rtsys.get_allocator_stats()
+    hits = sum(t.cache_hit for t in stats.threads) + stats.retired.cache_hit
+    allocs = sum(t.alloc for t in stats.threads) + stats.retired.alloc
+    print("Pool cache hit rate: %.1f%%" % (100.0 * hits / max(allocs, 1)))
+
+
+if __name__ == '__main__':
+    main()
@@ -378,6 +378,10 @@ def make_parser():
                         help='Output source annotation as html')
     parser.add_argument('-s', '--sysinfo', action="store_true",
                         help='Output system information for bug reporting')
+    parser.add_argument('--cache-gc', nargs='*', metavar='DIR',
+                        help='Garbage collect the on-disk cache in the given '
+                             'directories (defaults to NUMBA_CACHE_DIR and '
+                             'the user-wide cache directory)')
     parser.add_argument('filename', nargs='?', help='Python source filename')
     return parser
 
@@ -398,6 +402,15 @@ def main():
         get_sys_info()
         sys.exit(0)
 
+    if args.cache_gc is not None:
+        from numba.core.caching import gc
+        stats = gc(args.cache_gc or None)
+        print("Removed %d file(s), freeing %d bytes" %
+              (len(stats.removed_files), stats.removed_bytes))
+        print("Remaining: %d cache entries, %d bytes" %
+              (stats.entries, stats.bytes))
+        sys.exit(0)
+
     os.environ['NUMBA_DUMP_ANNOTATION'] = str(int(args.annotate))
     if args.annotate_html is not None:
         try:
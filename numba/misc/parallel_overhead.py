@@ -0,0 +1,113 @@
+"""
+A microbenchmark of the fixed cost of running the parallel loops of
+``@njit(parallel=True)`` functions and the ufuncs of
+``@vectorize(target='parallel')`` in the threading layer.
+
+Run ``python -m numba.misc.parallel_overhead`` to print the cost on this
+machine, along with the matching :envvar:`NUMBA_PARFOR_SERIAL_THRESHOLD`
+and :envvar:`NUMBA_PARALLEL_UFUNC_SERIAL_THRESHOLD`.
+"""
+
+import timeit
+
+import numpy as np
+
+from numba import (njit, prange, vectorize, get_num_threads,
+                   threading_layer)
+
+
+def _increment(a):
+    for i in prange(a.size):
+        a[i] += 1.0
+
+
+def _add_one(x):
+    return x + 1.0
+
+
+def _best_time(func, arg, number, repeat):
+    func(arg)   # compile
+    times = timeit.repeat(lambda: func(arg), number=number, repeat=repeat)
+    return min(times) / number
+
+
+def _overhead(serial, parallel, size, number, repeat):
+    """
+    Return the overhead and iteration time of *parallel* over *serial*,
+    which both take a float64 array.
+    """
+    num_threads = get_num_threads()
+    # A single iteration per thread, so the time is all overhead
+    small = np.zeros(num_threads)
+    large = np.zeros(max(size, 2 * num_threads))
+    small_time = _best_time(serial, small, number, repeat)
+    large_time = _best_time(serial, large, max(1, number // 100), repeat)
+    overhead = max(_best_time(parallel, small, number, repeat) - small_time,
+                   0.0)
+    iteration_time = max((large_time - small_time) / (large.size - small.size),
+                         1e-12)
+    return overhead, iteration_time
+
+
+def measure_parallel_overhead(size=100000, number=1000, repeat=5):
+    """
+    Measure the time taken by a parallel loop on top of the time taken to
+    run its iterations serially.
+
+    Returns a dict with the ``threading_layer`` and ``num_threads`` in use,
+    the ``region_overhead`` and ``iteration_time`` in seconds, and the
+    ``serial_threshold``, the number of iterations of a trivial loop body
+    which take as long as the overhead.
+    """
+    serial = njit(_increment)
+    parallel = njit(parallel={'serial_threshold': 0})(_increment)
+    overhead, iteration_time = _overhead(serial, parallel, size, number,
+                                         repeat)
+    return {'threading_layer': threading_layer(),
+            'num_threads': get_num_threads(),
+            'region_overhead': overhead,
+            'iteration_time': iteration_time,
+            'serial_threshold': int(overhead / iteration_time)}
+
+
+def measure_ufunc_overhead(size=100000, number=1000, repeat=5):
+    """
+    Measure the time taken by a parallel ufunc on top of the time taken by
+    the same ufunc built for the "cpu" target.
+
+    Returns a dict like measure_parallel_overhead(), where
+    ``serial_threshold`` is the number of elements of a trivial ufunc which
+    take as long as the overhead.
+    """
+    sig = ['float64(float64)']
+    serial = vectorize(sig)(_add_one)
+    parallel = vectorize(sig, target='parallel', serial_threshold=0,
+                         chunksize=0)(_add_one)
+    overhead, iteration_time = _overhead(serial, parallel, size, number,
+                                         repeat)
+    return {'threading_layer': threading_layer(),
+            'num_threads': get_num_threads(),
+            'region_overhead': overhead,
+            'iteration_time': iteration_time,
+            'serial_threshold': int(overhead / iteration_time)}
+
+
+def main():
+    result = measure_parallel_overhead()
+    print("Threading layer:    %s" % result['threading_layer'])
+    print("Number of threads:  %d" % result['num_threads'])
+    print("Region overhead:    %.2f us" % (result['region_overhead'] * 1e6))
+    print("Iteration time:     %.2f ns" % (result['iteration_time'] * 1e9))
+    print("Suggested NUMBA_PARFOR_SERIAL_THRESHOLD: %d"
+          % result['serial_threshold'])
+    result = measure_ufunc_overhead()
+    print("Parallel ufunc overhead: %.2f us"
+          % (result['region_overhead'] * 1e6))
+    print("Ufunc element time:      %.2f ns"
+          % (result['iteration_time'] * 1e9))
+    print("Suggested NUMBA_PARALLEL_UFUNC_SERIAL_THRESHOLD: %d"
+          % result['serial_threshold'])
+
+
+if __name__ == '__main__':
+    main()
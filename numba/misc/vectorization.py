@@ -0,0 +1,283 @@
+"""
+Vectorization report: the LLVM optimization remarks of the loop vectorizer
+and of the SLP vectorizer are collected while a function is recompiled with
+debug info, and attributed to the loops of the Python source using the
+source locations of the remarks.
+"""
+
+import collections
+import contextlib
+import inspect
+import os
+import re
+import sys
+import tempfile
+
+import llvmlite.binding as ll
+
+from numba.core import compiler, types
+from numba.core.analysis import compute_cfg_from_blocks
+from numba.core.compiler_lock import global_compiler_lock
+
+
+# The LLVM passes whose remarks are collected
+_REMARK_PASSES = 'loop-vectorize|slp-vectorizer'
+_REMARK_OPTIONS = ('-pass-remarks', '-pass-remarks-missed',
+                   '-pass-remarks-analysis')
+# LLVM ignores an empty pattern, so remarks are turned off again with a
+# pattern that matches no pass name.
+_NO_REMARK_PASSES = '^$'
+
+# What the default LLVM diagnostic handler prints for a remark
+_remark_re = re.compile(r'^remark: (?P<filename>.*?):(?P<line>\d+):'
+                        r'(?P<column>\d+): (?P<message>.*)$')
+_vectorized_re = re.compile(r'^vectorized loop|SLP vectorized|'
+                            r'^Vectorized horizontal reduction')
+
+# The reasons why a loop is not vectorized, from the substrings of the
+# analysis remarks of the loop vectorizer, and how they can be addressed.
+_reasons = [
+    (('cannot identify array bounds', 'unsafe dependent memory operations',
+      'cannot check memory dependencies', 'safe to reorder memory'),
+     'aliasing',
+     "the arrays used in the loop may overlap; read the inputs into local "
+     "copies (e.g. a.copy()) or write to a new output array, and pass "
+     "contiguous arrays"),
+    (('stride',),
+     'non-unit stride',
+     "the loop accesses memory with a non-unit stride; iterate over the "
+     "contiguous dimension or make a contiguous copy of the array"),
+    (('control flow', 'could not determine number of loop iterations'),
+     'exceptions',
+     "the loop has more than one exit, usually because it can raise an "
+     "exception (e.g. ZeroDivisionError); consider "
+     "error_model='numpy'"),
+    (('call instruction cannot be vectorized',),
+     'function call',
+     "the loop calls a function that has no vector version; check that "
+     "the callee is inlined or has a SIMD implementation (e.g. SVML)"),
+    (('floating-point operations',),
+     'floating point ordering',
+     "vectorizing would change the order of floating point operations; "
+     "consider fastmath=True"),
+    (('cost-model indicates that vectorization is not beneficial',),
+     'cost model',
+     "LLVM found vectorization not profitable, often because of "
+     "non-contiguous array accesses or mixed types"),
+]
+
+
+Remark = collections.namedtuple('Remark', ('filename', 'line', 'column',
+                                           'message'))
+
+
+def _classify(remark, flags, argtypes):
+    """
+    Return the (reason, hint) explaining a missed vectorization remark, or
+    None if it isn't understood.
+    """
+    for substrings, reason, hint in _reasons:
+        if any(s in remark.message for s in substrings):
+            break
+    else:
+        return None
+    if reason == 'exceptions' and flags.boundscheck:
+        reason = 'bounds checks'
+        hint = ("the loop can raise an IndexError from bounds checking; "
+                "consider boundscheck=False")
+    elif reason == 'cost model' and any(
+            isinstance(t, types.Array) and t.layout != 'C'
+            for t in argtypes):
+        reason = 'non-unit stride'
+        hint = ("some array arguments are not C contiguous, so their "
+                "elements are accessed with a runtime stride")
+    return reason, hint
+
+
+class LoopReport(object):
+    """
+    The vectorization remarks of a loop of the Python source, starting at
+    *line*.
+    """
+
+    def __init__(self, line, lines, source):
+        self.line = line
+        self.lines = lines
+        self.source = source
+        self.remarks = []
+        self.reasons = []
+
+    @property
+    def vectorized(self):
+        """
+        Whether (a version of) the loop was vectorized.
+        """
+        return any(_vectorized_re.search(r.message) for r in self.remarks)
+
+    def __repr__(self):
+        return "<LoopReport line %d vectorized=%s>" % (self.line,
+                                                      self.vectorized)
+
+
+class VectorizationReport(object):
+    """
+    The vectorization report of a function and signature, as returned by
+    ``Dispatcher.inspect_vectorization()``.  *loops* holds a
+    :class:`LoopReport` for each loop of the source and *other_remarks* the
+    remarks that aren't attributed to a loop (e.g. of inlined library code).
+    """
+
+    def __init__(self, name, signature, loops, other_remarks):
+        self.name = name
+        self.signature = signature
+        self.loops = loops
+        self.other_remarks = other_remarks
+
+    def dump(self, file=None):
+        if file is None:
+            file = sys.stdout
+        print(str(self), file=file)
+
+    def __str__(self):
+        out = ["Vectorization report for %s %s" % (self.name,
+                                                     self.signature),
+               '-' * 80]
+        if not self.loops:
+            out.append("No loops found.")
+        for loop in self.loops:
+            status = "vectorized" if loop.vectorized else "NOT vectorized"
+            out.append("Loop at line %d: %s" % (loop.line, status))
+            out.append("    %s" % loop.source)
+            for reason, hint in loop.reasons:
+                out.append("    - %s: %s" % (reason, hint))
+            for remark in loop.remarks:
+                out.append("    line %d: %s" % (remark.line, remark.message))
+        if self.other_remarks:
+            out.append("Remarks outside of the source loops:")
+            for remark in self.other_remarks:
+                out.append("    %s:%d: %s" % (remark.filename, remark.line,
+                                              remark.message))
+        out.append('=' * 80)
+        return '\n'.join(out)
+
+
+def _set_remark_passes(pattern):
+    for option in _REMARK_OPTIONS:
+        ll.set_option('numba', '%s=%s' % (option, pattern))
+
+
+@contextlib.contextmanager
+def _capture_remarks():
+    """
+    Collect the optimization remarks printed by LLVM to the stderr file
+    descriptor.  Other output is written back to sys.stderr.
+    """
+    remarks = []
+    sys.stderr.flush()
+    saved_fd = os.dup(2)
+    with tempfile.TemporaryFile() as tmp:
+        os.dup2(tmp.fileno(), 2)
+        _set_remark_passes(_REMARK_PASSES)
+        try:
+            yield remarks
+        finally:
+            _set_remark_passes(_NO_REMARK_PASSES)
+            os.dup2(saved_fd, 2)
+            os.close(saved_fd)
+            tmp.seek(0)
+            output = tmp.read().decode('utf-8', 'replace')
+        for text in output.splitlines():
+            m = _remark_re.match(text)
+            if m is None:
+                print(text, file=sys.stderr)
+            else:
+                remarks.append(Remark(m.group('filename'),
+                                      int(m.group('line')),
+                                      int(m.group('column')),
+                                      m.group('message')))
+
+
+def _find_loops(func):
+    """
+    Return a LoopReport for each loop of the Python function, innermost
+    loops first.
+    """
+    func_ir = compiler.run_frontend(func)
+    cfg = compute_cfg_from_blocks(func_ir.blocks)
+    try:
+        source_lines, firstline = inspect.getsourcelines(func)
+    except (IOError, OSError, TypeError):
+        source_lines, firstline = [], 0
+    loops = []
+    for loop in cfg.loops().values():
+        lines = set()
+        for label in loop.body:
+            lines.update(stmt.loc.line for stmt in func_ir.blocks[label].body)
+        line = min(lines)
+        index = line - firstline
+        if 0 <= index < len(source_lines):
+            source = source_lines[index].strip()
+        else:
+            source = ''
+        loops.append(LoopReport(line, lines, source))
+    loops.sort(key=lambda loop: len(loop.lines))
+    return loops
+
+
+def _compile_with_remarks(dispatcher, signature):
+    """
+    Recompile the dispatcher's function for *signature* with debug info
+    while collecting the vectorizer remarks.  The dispatcher's overloads
+    are left unchanged.
+    """
+    func_compiler = dispatcher._compiler
+    flags = compiler.Flags()
+    dispatcher.targetdescr.options.parse_as_flags(flags,
+                                                  dispatcher.targetoptions)
+    flags = func_compiler._customize_flags(flags)
+    flags.set('debuginfo')
+    flags.set('no_cpython_wrapper')
+    flags.set('no_cfunc_wrapper')
+    cres = dispatcher.overloads[signature]
+    impl = func_compiler._get_implementation(signature, {})
+    with global_compiler_lock:
+        with _capture_remarks() as remarks:
+            compiler.compile_extra(dispatcher.targetdescr.typing_context,
+                                   dispatcher.targetdescr.target_context,
+                                   impl, args=signature,
+                                   return_type=cres.signature.return_type,
+                                   flags=flags, locals=func_compiler.locals,
+                                   pipeline_class=func_compiler.pipeline_class)
+    return impl, flags, remarks
+
+
+def inspect_vectorization(dispatcher, signature):
+    """
+    Return the VectorizationReport of the dispatcher's function for the
+    given (already compiled) signature.
+    """
+    signature = tuple(signature)
+    impl, flags, remarks = _compile_with_remarks(dispatcher, signature)
+    loops = _find_loops(impl)
+    filename = os.path.basename(impl.__code__.co_filename)
+    other_remarks = []
+    seen = set()
+    for remark in remarks:
+        # The same loop may be optimized more than once, e.g. when the
+        # function is inlined into a wrapper.
+        if remark in seen:
+            continue
+        seen.add(remark)
+        loop = None
+        if remark.filename == filename:
+            loop = next((loop for loop in loops if remark.line in loop.lines),
+                        None)
+        if loop is None:
+            other_remarks.append(remark)
+            continue
+        loop.remarks.append(remark)
+        reason = _classify(remark, flags, signature)
+        if reason is not None and reason not in loop.reasons:
+            loop.reasons.append(reason)
+    loops.sort(key=lambda loop: loop.line)
+    return VectorizationReport(impl.__name__, signature, loops, other_remarks)
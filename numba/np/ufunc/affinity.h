@@ -0,0 +1,104 @@
+/*
+Binding of the threads of the threading layers to CPUs.
+
+set_thread_affinity() records the CPUs, the threads of a threading layer then
+call affinity_bind_thread() before running work and bind themselves when the
+CPUs changed since they last did.  This must be included after Python.h.
+*/
+
+#ifndef NUMBA_AFFINITY_H_
+#define NUMBA_AFFINITY_H_
+
+#if defined(_WIN32)
+#include <windows.h>
+#elif defined(__linux__)
+#include <sched.h>
+#endif
+
+/* The maximum number of CPUs threads are bound to */
+#define AFFINITY_MAX_CPUS 1024
+
+static int _affinity_cpus[AFFINITY_MAX_CPUS];
+static int _affinity_count = 0;
+static int _affinity_per_thread = 0;
+/* Incremented by each set_thread_affinity() call, 0 is no binding */
+static volatile int _affinity_generation = 0;
+
+/* Set the CPUs threads are bound to.
+
+ Args:
+
+ cpus - the CPUs
+ count - the number of CPUs
+ per_thread - if nonzero the thread with slot i is bound to the CPU
+              cpus[i % count] only, otherwise threads are bound to all CPUs.
+
+ Returns 0, or -1 if binding threads is not supported on this platform.
+ This must not be called while a parallel region runs.
+ */
+static int
+set_thread_affinity(int *cpus, int count, int per_thread)
+{
+    int i;
+#if defined(_WIN32) || defined(__linux__)
+    if (count > AFFINITY_MAX_CPUS)
+        count = AFFINITY_MAX_CPUS;
+    for (i = 0; i < count; i++)
+        _affinity_cpus[i] = cpus[i];
+    _affinity_count = count;
+    _affinity_per_thread = per_thread;
+    _affinity_generation++;
+    return 0;
+#else
+    (void)i;
+    return -1;
+#endif
+}
+
+/* Bind the calling thread, with the given slot in the thread pool, to its
+ CPUs if they changed since *generation, which is then updated.
+ */
+static void
+affinity_bind_thread(int slot, int *generation)
+{
+    int generation_now = _affinity_generation;
+    int first = 0, last = _affinity_count, i;
+
+    if (*generation == generation_now)
+        return;
+    *generation = generation_now;
+    if (last == 0)
+        return;
+    if (_affinity_per_thread)
+    {
+        first = slot % last;
+        last = first + 1;
+    }
+    {
+#if defined(_WIN32)
+        DWORD_PTR mask = 0;
+        for (i = first; i < last; i++)
+        {
+            if (_affinity_cpus[i] >= 0 &&
+                _affinity_cpus[i] < (int)(8 * sizeof(DWORD_PTR)))
+                mask |= ((DWORD_PTR)1) << _affinity_cpus[i];
+        }
+        if (mask)
+            SetThreadAffinityMask(GetCurrentThread(), mask);
+#elif defined(__linux__)
+        cpu_set_t mask;
+        CPU_ZERO(&mask);
+        for (i = first; i < last; i++)
+        {
+            if (_affinity_cpus[i] >= 0 && _affinity_cpus[i] < CPU_SETSIZE)
+                CPU_SET(_affinity_cpus[i], &mask);
+        }
+        if (CPU_COUNT(&mask))
+            sched_setaffinity(0, sizeof(mask), &mask);
+#else
+        (void)i;
+#endif
+    }
+}
+
+#endif  /* NUMBA_AFFINITY_H_ */
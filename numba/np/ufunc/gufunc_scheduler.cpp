@@ -360,3 +360,155 @@ extern "C" void do_scheduling_unsigned(uintp num_dim, intp *starts, intp *ends,
     std::vector<RangeActual> ret = create_schedule(full_space, num_threads);
     flatten_schedule(ret, sched);
 }
+
+/*
+ * Chunked schedules.
+ *
+ * The iteration space is split into chunks along dimension 0, which are
+ * claimed by the threads as they run.  Each of the num_threads rows of the
+ * schedule is laid out as:
+ *
+ *     start_dim0, ..., start_dimN, end_dim0, ..., end_dimN, state, index
+ *
+ * where the bounds are those of the chunk being run by the thread, state
+ * is a pointer to the sched_state shared by all the threads, and index is
+ * the next chunk of a static schedule, whose chunks are dealt round-robin.
+ * Dynamic and guided schedules claim the next chunk from the shared state
+ * instead, with chunks of decreasing size for guided.
+ */
+
+#ifdef _MSC_VER
+#include <intrin.h>
+
+static intp sched_fetch_add(intp *ptr, intp value) {
+#if defined(_WIN64)
+    return _InterlockedExchangeAdd64((volatile __int64 *) ptr, value);
+#else
+    return _InterlockedExchangeAdd((volatile long *) ptr, value);
+#endif
+}
+
+static bool sched_compare_exchange(intp *ptr, intp *expected, intp desired) {
+#if defined(_WIN64)
+    intp old = _InterlockedCompareExchange64((volatile __int64 *) ptr, desired, *expected);
+#else
+    intp old = _InterlockedCompareExchange((volatile long *) ptr, desired, *expected);
+#endif
+    if (old == *expected) return true;
+    *expected = old;
+    return false;
+}
+
+static intp sched_load(intp *ptr) {
+    return sched_fetch_add(ptr, 0);
+}
+#else
+static intp sched_fetch_add(intp *ptr, intp value) {
+    return __atomic_fetch_add(ptr, value, __ATOMIC_RELAXED);
+}
+
+static bool sched_compare_exchange(intp *ptr, intp *expected, intp desired) {
+    return __atomic_compare_exchange_n(ptr, expected, desired, false,
+                                       __ATOMIC_RELAXED, __ATOMIC_RELAXED);
+}
+
+static intp sched_load(intp *ptr) {
+    return __atomic_load_n(ptr, __ATOMIC_RELAXED);
+}
+#endif
+
+template<class T>
+void chunked_schedule(uintp num_dim, intp *starts, intp *ends, uintp num_threads, T *sched, intp kind, intp chunksize, sched_state *state, intp debug) {
+    if (debug) {
+        printf("chunked schedule: kind = %d, chunksize = %d\n", (int)kind, (int)chunksize);
+    }
+    if (chunksize <= 0) {
+        /* Let the default for static schedules be the plain static schedule
+           split, and the default for guided schedules be the OpenMP one. */
+        if (kind == SCHEDULE_STATIC) {
+            intp total = ends[0] - starts[0] + 1;
+            chunksize = total > 0 ? (total + num_threads - 1) / num_threads : 1;
+        } else {
+            chunksize = 1;
+        }
+    }
+    state->next = starts[0];
+    state->chunksize = chunksize;
+    state->kind = kind;
+    state->num_threads = num_threads;
+    state->starts = starts;
+    state->ends = ends;
+    uintp row_size = 2 * num_dim + 2;
+    for (uintp i = 0; i < num_threads; ++i) {
+        T *row = sched + i * row_size;
+        /* The bounds are filled in by do_scheduling_next() */
+        row[2 * num_dim] = (T) state;
+        row[2 * num_dim + 1] = (T) i;
+    }
+}
+
+/*
+    Initialize a chunked schedule: as do_scheduling_signed(), but each of the
+    num_threads rows of sched is of size 2xD+2, and the chunks are claimed by
+    calling do_scheduling_next() (see above).
+    kind is one of the SCHEDULE_* values.
+    chunksize is the size of the chunks (the minimum size for guided
+    schedules), or 0 for the default.
+    state is pre-allocated memory shared by the threads, it must stay alive
+    while the schedule runs, as must starts and ends.
+*/
+extern "C" void do_scheduling_chunked_signed(uintp num_dim, intp *starts, intp *ends, uintp num_threads, intp *sched, intp kind, intp chunksize, sched_state *state, intp debug) {
+    if (num_threads == 0) return;
+    chunked_schedule(num_dim, starts, ends, num_threads, sched, kind, chunksize, state, debug);
+}
+
+extern "C" void do_scheduling_chunked_unsigned(uintp num_dim, intp *starts, intp *ends, uintp num_threads, uintp *sched, intp kind, intp chunksize, sched_state *state, intp debug) {
+    if (num_threads == 0) return;
+    chunked_schedule(num_dim, starts, ends, num_threads, sched, kind, chunksize, state, debug);
+}
+
+/*
+    Claim the next chunk for the thread running the given row of a chunked
+    schedule, and store its bounds at the start of the row.
+    Returns 0 when the thread has no work left.
+*/
+extern "C" int do_scheduling_next(uintp num_dim, intp *sched) {
+    sched_state *state = (sched_state *) sched[2 * num_dim];
+    intp end = state->ends[0];
+    intp chunksize = state->chunksize;
+    intp start;
+
+    switch (state->kind) {
+    case SCHEDULE_STATIC: {
+        intp index = sched[2 * num_dim + 1];
+        if (index > (end - state->starts[0]) / chunksize) return 0;
+        start = state->starts[0] + index * chunksize;
+        sched[2 * num_dim + 1] = index + state->num_threads;
+        break;
+    }
+    case SCHEDULE_DYNAMIC:
+        start = sched_fetch_add(&state->next, chunksize);
+        break;
+    default: {
+        /* Guided: the chunk size is proportional to the remaining work */
+        start = sched_load(&state->next);
+        do {
+            if (start > end) return 0;
+            intp remaining = end - start + 1;
+            chunksize = (remaining + state->num_threads - 1) / state->num_threads;
+            if (chunksize < state->chunksize)
+                chunksize = state->chunksize;
+        } while (!sched_compare_exchange(&state->next, &start, start + chunksize));
+        break;
+    }
+    }
+    if (start > end || start < state->starts[0]) return 0;
+
+    sched[0] = start;
+    sched[num_dim] = std::min(start + chunksize - 1, end);
+    for (uintp i = 1; i < num_dim; ++i) {
+        sched[i] = state->starts[i];
+        sched[num_dim + i] = state->ends[i];
+    }
+    return 1;
+}
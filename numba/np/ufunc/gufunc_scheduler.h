@@ -41,6 +41,25 @@ extern "C"
 void do_scheduling_signed(uintp num_dim, intp *starts, intp *ends, uintp num_threads, intp *sched, intp debug);
 void do_scheduling_unsigned(uintp num_dim, intp *starts, intp *ends, uintp num_threads, uintp *sched, intp debug);
 
+/* Kinds of chunked schedules, see do_scheduling_chunked_signed() */
+#define SCHEDULE_STATIC 0
+#define SCHEDULE_DYNAMIC 1
+#define SCHEDULE_GUIDED 2
+
+/* The shared state of a chunked schedule */
+typedef struct {
+    intp next;          /* start of the next unclaimed chunk in dimension 0 */
+    intp chunksize;     /* size (minimum size for guided) of the chunks */
+    intp kind;          /* SCHEDULE_* */
+    intp num_threads;
+    intp *starts;       /* inclusive ranges of all the dimensions */
+    intp *ends;
+} sched_state;
+
+void do_scheduling_chunked_signed(uintp num_dim, intp *starts, intp *ends, uintp num_threads, intp *sched, intp kind, intp chunksize, sched_state *state, intp debug);
+void do_scheduling_chunked_unsigned(uintp num_dim, intp *starts, intp *ends, uintp num_threads, uintp *sched, intp kind, intp chunksize, sched_state *state, intp debug);
+int do_scheduling_next(uintp num_dim, intp *sched);
+
 #ifdef __cplusplus
 }
 #endif
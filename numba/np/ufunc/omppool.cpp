@@ -14,6 +14,8 @@ Threading layer on top of OpenMP.
 #include <stdio.h>
 #include "workqueue.h"
 #include "gufunc_scheduler.h"
+#include "affinity.h"
+#include "parallel_stats.h"
 
 #ifdef _MSC_VER
 #include <malloc.h>
@@ -56,6 +58,9 @@ static int _INIT_NUM_THREADS = -1;
 // This is the per-thread thread mask, each thread can carry its own mask.
 static THREAD_LOCAL(int) _TLS_num_threads = 0;
 
+// The affinity generation the thread is bound for, see affinity.h
+static THREAD_LOCAL(int) _TLS_affinity_generation = 0;
+
 static void
 set_num_threads(int count)
 {
@@ -163,6 +168,10 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
         // tell the active thread team about the number of threads
         set_num_threads(agreed_nthreads);
 
+        // the calling thread is left unbound
+        if (omp_get_thread_num() != 0)
+            affinity_bind_thread(omp_get_thread_num(), &_TLS_affinity_generation);
+
         #pragma omp for
         for(ptrdiff_t r = 0; r < size; r++)
         {
@@ -257,6 +266,12 @@ MOD_INIT(omppool)
                            PyLong_FromVoidPtr((void*)&do_scheduling_signed));
     PyObject_SetAttrString(m, "do_scheduling_unsigned",
                            PyLong_FromVoidPtr((void*)&do_scheduling_unsigned));
+    PyObject_SetAttrString(m, "do_scheduling_chunked_signed",
+                           PyLong_FromVoidPtr((void*)&do_scheduling_chunked_signed));
+    PyObject_SetAttrString(m, "do_scheduling_chunked_unsigned",
+                           PyLong_FromVoidPtr((void*)&do_scheduling_chunked_unsigned));
+    PyObject_SetAttrString(m, "do_scheduling_next",
+                           PyLong_FromVoidPtr((void*)&do_scheduling_next));
     PyObject_SetAttrString(m, "openmp_vendor",
                            PyString_FromString(_OMP_VENDOR));
     PyObject_SetAttrString(m, "set_num_threads",
@@ -265,5 +280,15 @@ MOD_INIT(omppool)
                            PyLong_FromVoidPtr((void*)&get_num_threads));
     PyObject_SetAttrString(m, "get_thread_id",
                            PyLong_FromVoidPtr((void*)&get_thread_id));
+    PyObject_SetAttrString(m, "set_thread_affinity",
+                           PyLong_FromVoidPtr((void*)&set_thread_affinity));
+    PyObject_SetAttrString(m, "parallel_stats_now",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_now));
+    PyObject_SetAttrString(m, "parallel_stats_record",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_record));
+    PyObject_SetAttrString(m, "parallel_stats_read",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_read));
+    PyObject_SetAttrString(m, "parallel_stats_dropped",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_dropped));
     return MOD_SUCCESS_VAL(m);
 }
@@ -15,7 +15,7 @@ import sys
 import warnings
 from threading import RLock as threadRLock
 import multiprocessing
-from ctypes import CFUNCTYPE, c_int, CDLL
+from ctypes import CFUNCTYPE, POINTER, c_int, CDLL
 
 import numpy as np
 
@@ -25,8 +25,8 @@ import llvmlite.binding as ll
 from numba.np.numpy_support import as_dtype
 from numba.core import types, config, errors
 from numba.np.ufunc.wrappers import _wrapper_info
-from numba.np.ufunc import ufuncbuilder
-from numba.extending import overload
+from numba.np.ufunc import ufuncbuilder, parallel_stats
+from numba.extending import overload, intrinsic
 
 
 _IS_OSX = sys.platform.startswith('darwin')
@@ -47,7 +47,8 @@ def get_thread_count():
 NUM_THREADS = get_thread_count()
 
 
-def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
+def build_gufunc_kernel(library, ctx, info, sig, inner_ndim,
+                        stats_region=None, serial_threshold=0, chunksize=0):
     """Wrap the original CPU ufunc/gufunc with a parallel dispatcher.
     This function will wrap gufuncs and ufuncs something like.
 
@@ -66,6 +67,18 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
         inner dimension of the gufunc (this is len(sig.args) in the case of a
         ufunc)
 
+    stats_region
+        if not None, the id of the parallel_stats region the runs of the
+        gufunc and the work of each thread are recorded for
+
+    serial_threshold
+        the outer dimension size below which the kernel runs in the calling
+        thread instead of the thread pool
+
+    chunksize
+        the minimum size of the part of the outer dimension given to each
+        thread, fewer threads are used for smaller sizes (0 for no minimum)
+
     Returns
     -------
     wrapper_info : (library, env, name)
@@ -148,18 +161,52 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
     )
     wrapperlib.add_linking_library(info.library)
 
+    if stats_region is not None:
+        # Time the work of each thread with a wrapper of the inner function
+        timed_func = mod.add_function(innerfunc_fnty,
+                                      name=kernel_name + ".timed")
+        timed_builder = lc.Builder(timed_func.append_basic_block(''))
+        start = parallel_stats.emit_now(timed_builder)
+        timed_builder.call(tmp_voidptr, timed_func.args)
+        parallel_stats.emit_record(timed_builder, stats_region,
+                                   parallel_stats.WORK, start)
+        timed_builder.ret_void()
+        tmp_voidptr = timed_func
+        region_start = parallel_stats.emit_now(builder)
+
     get_num_threads = builder.module.get_or_insert_function(
         lc.Type.function(lc.Type.int(types.intp.bitwidth), []),
         name="get_num_threads")
 
     num_threads = builder.call(get_num_threads, [])
+    total = builder.load(dimensions)
+    if chunksize > 1:
+        # Use at most one thread per chunk
+        num_chunks = builder.sdiv(builder.add(total, intp_t(chunksize - 1)),
+                                  intp_t(chunksize))
+        fewer = builder.icmp_signed('<', num_chunks, num_threads)
+        num_threads = builder.select(fewer, num_chunks, num_threads)
 
     # Prepare call
     fnptr = builder.bitcast(tmp_voidptr, byte_ptr_t)
     innerargs = [as_void_ptr(x) for x
                  in [args, dimensions, steps, data]]
-    builder.call(parallel_for, [fnptr] + innerargs +
-                 [intp_t(x) for x in (inner_ndim, array_count)] + [num_threads])
+    # A single item of work, or fewer items than the serial threshold, is
+    # run in the calling thread, this avoids waking up the threading layer
+    # for parfors that are run serially (see call_parallel_gufunc()) and for
+    # small ufunc calls
+    serial = builder.icmp_signed('<', total, intp_t(max(serial_threshold, 2)))
+    with builder.if_else(serial) as (then, otherwise):
+        with then:
+            builder.call(tmp_voidptr, [args, dimensions, steps, data])
+        with otherwise:
+            builder.call(parallel_for, [fnptr] + innerargs +
+                         [intp_t(x) for x in (inner_ndim, array_count)] +
+                         [num_threads])
+
+    if stats_region is not None:
+        parallel_stats.emit_record(builder, stats_region,
+                                   parallel_stats.REGION, region_start)
 
     # Release the GIL
     pyapi.restore_thread(thread_state)
@@ -175,6 +222,22 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
 # ------------------------------------------------------------------------------
 
 class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
+    def __init__(self, py_func, identity=None, cache=False, targetoptions={}):
+        targetoptions = targetoptions.copy()
+        self.serial_threshold = targetoptions.pop(
+            'serial_threshold', config.PARALLEL_UFUNC_SERIAL_THRESHOLD)
+        self.chunksize = targetoptions.pop(
+            'chunksize', config.PARALLEL_UFUNC_CHUNKSIZE)
+        for name in ('serial_threshold', 'chunksize'):
+            value = getattr(self, name)
+            if not isinstance(value, int) or not 0 <= value < 2 ** 31:
+                msg = ("Expected %s to be a non-negative integer less than "
+                       "2**31, got %r" % (name, value))
+                raise ValueError(msg)
+        super(ParallelUFuncBuilder, self).__init__(
+            py_func, identity=identity, cache=cache,
+            targetoptions=targetoptions)
+
     def build(self, cres, sig):
         _launch_threads()
 
@@ -184,7 +247,14 @@ class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
         library = cres.library
         fname = cres.fndesc.llvm_func_name
 
-        info = build_ufunc_wrapper(library, ctx, fname, signature, cres)
+        stats_region = None
+        if config.PARALLEL_STATS:
+            stats_region = parallel_stats.new_region('ufunc',
+                                                     cres.fndesc.qualname)
+        info = build_ufunc_wrapper(library, ctx, fname, signature, cres,
+                                   stats_region=stats_region,
+                                   serial_threshold=self.serial_threshold,
+                                   chunksize=self.chunksize)
         ptr = info.library.get_pointer_to_function(info.name)
         # Get dtypes
         dtypenums = [np.dtype(a.name).num for a in signature.args]
@@ -193,12 +263,15 @@ class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
         return dtypenums, ptr, keepalive
 
 
-def build_ufunc_wrapper(library, ctx, fname, signature, cres):
+def build_ufunc_wrapper(library, ctx, fname, signature, cres,
+                        stats_region=None, serial_threshold=0, chunksize=0):
     innerfunc = ufuncbuilder.build_ufunc_wrapper(library, ctx, fname,
                                                  signature, objmode=False,
                                                  cres=cres)
     info = build_gufunc_kernel(library, ctx, innerfunc, signature,
-                               len(signature.args))
+                               len(signature.args), stats_region=stats_region,
+                               serial_threshold=serial_threshold,
+                               chunksize=chunksize)
     return info
 
 # ---------------------------------------------------------------------------
@@ -224,10 +297,15 @@ class ParallelGUFuncBuilder(ufuncbuilder.GUFuncBuilder):
         """
         _launch_threads()
 
+        stats_region = None
+        if config.PARALLEL_STATS:
+            stats_region = parallel_stats.new_region('gufunc',
+                                                     self.py_func.__name__)
+
         # Build wrapper for ufunc entry point
         info = build_gufunc_wrapper(
             self.py_func, cres, self.sin, self.sout, cache=self.cache,
-            is_parfors=False,
+            is_parfors=False, stats_region=stats_region,
         )
         ptr = info.library.get_pointer_to_function(info.name)
         env = info.env
@@ -247,11 +325,13 @@ class ParallelGUFuncBuilder(ufuncbuilder.GUFuncBuilder):
 # This is not a member of the ParallelGUFuncBuilder function because it is
 # called without an enclosing instance from parfors
 
-def build_gufunc_wrapper(py_func, cres, sin, sout, cache, is_parfors):
+def build_gufunc_wrapper(py_func, cres, sin, sout, cache, is_parfors,
+                         stats_region=None):
     """Build gufunc wrapper for the given arguments.
     The *is_parfors* is a boolean indicating whether the gufunc is being
     built for use as a ParFors kernel. This changes codegen and caching
-    behavior.
+    behavior.  If *stats_region* is not None, the gufunc records its
+    timings for that parallel_stats region.
     """
     library = cres.library
     ctx = cres.target_context
@@ -265,6 +345,7 @@ def build_gufunc_wrapper(py_func, cres, sin, sout, cache, is_parfors):
 
     info = build_gufunc_kernel(
         library, ctx, innerinfo, signature, inner_ndim,
+        stats_region=stats_region,
     )
     return info
 
@@ -488,17 +569,36 @@ def _launch_threads():
             ll.add_symbol('numba_parallel_for', lib.parallel_for)
             ll.add_symbol('do_scheduling_signed', lib.do_scheduling_signed)
             ll.add_symbol('do_scheduling_unsigned', lib.do_scheduling_unsigned)
+            ll.add_symbol('do_scheduling_chunked_signed',
+                          lib.do_scheduling_chunked_signed)
+            ll.add_symbol('do_scheduling_chunked_unsigned',
+                          lib.do_scheduling_chunked_unsigned)
+            ll.add_symbol('do_scheduling_next', lib.do_scheduling_next)
+            ll.add_symbol('parallel_stats_now', lib.parallel_stats_now)
+            ll.add_symbol('parallel_stats_record', lib.parallel_stats_record)
+            parallel_stats._bind(lib)
+
+            if hasattr(lib, 'set_spin_count'):
+                set_spin_count = CFUNCTYPE(None, c_int)(lib.set_spin_count)
+                set_spin_count(config.WORKQUEUE_SPIN_COUNT)
 
             launch_threads = CFUNCTYPE(None, c_int)(lib.launch_threads)
             launch_threads(NUM_THREADS)
 
             _load_num_threads_funcs(lib)  # load late
+            _load_thread_affinity_func(lib)
 
             # set library name so it can be queried
             global _threading_layer
             _threading_layer = libname
             _is_initialized = True
 
+            if config.THREAD_AFFINITY:
+                try:
+                    _apply_thread_affinity(config.THREAD_AFFINITY)
+                except NotImplementedError as e:
+                    warnings.warn(errors.NumbaWarning(str(e)))
+
 
 def _load_num_threads_funcs(lib):
 
@@ -646,6 +746,178 @@ def ol_get_thread_id():
     return impl
 
 
+def _load_thread_affinity_func(lib):
+    global _set_thread_affinity
+    _set_thread_affinity = CFUNCTYPE(c_int, POINTER(c_int), c_int,
+                                     c_int)(lib.set_thread_affinity)
+
+
+# The CPUs the threads are bound to, in the order of the threads, or None
+_thread_affinity = None
+
+
+def _available_cpus():
+    """
+    Returns the sorted CPUs the process may run on.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _cpu_topology_ids(cpu):
+    """
+    Returns the (package, core) ids of the given CPU, as (0, cpu) where they
+    are unknown.
+    """
+    ids = []
+    for name, default in (('physical_package_id', 0), ('core_id', cpu)):
+        path = '/sys/devices/system/cpu/cpu%d/topology/%s' % (cpu, name)
+        try:
+            with open(path) as f:
+                ids.append(int(f.read()))
+        except (OSError, ValueError):
+            ids.append(default)
+    return tuple(ids)
+
+
+def _parse_thread_affinity(affinity, available=None):
+    """
+    Returns the CPUs given by the *affinity* specification, in the order the
+    threads are bound to them, and whether each thread is bound to a single
+    CPU.  *available* are the CPUs that may be used, all those of the process
+    by default.
+    """
+    if available is None:
+        available = _available_cpus()
+    available = sorted(available)
+    spec = affinity.strip().lower() if affinity else 'none'
+    if spec == 'none':
+        return available, False
+    elif spec in ('compact', 'scatter'):
+        ids = {cpu: _cpu_topology_ids(cpu) for cpu in available}
+        # hardware threads of a core are next to each other
+        cpus = sorted(available, key=lambda cpu: ids[cpu] + (cpu,))
+        if spec == 'scatter':
+            # deal the cores of the packages out in turn
+            packages = {}
+            for cpu in cpus:
+                packages.setdefault(ids[cpu][0], []).append(cpu)
+            groups = [packages[k] for k in sorted(packages)]
+            cpus = [group[i] for i in range(max(map(len, groups)))
+                    for group in groups if i < len(group)]
+        return cpus, True
+
+    cpus = []
+    try:
+        for item in spec.split(','):
+            start, _, stop = item.partition('-')
+            start = int(start)
+            stop = int(stop) if stop else start
+            if stop < start:
+                raise ValueError
+            cpus.extend(range(start, stop + 1))
+    except ValueError:
+        msg = ("Invalid thread affinity %r, expected 'none', 'compact', "
+               "'scatter' or a list of CPUs such as '0,2,4-7'")
+        raise ValueError(msg % (affinity,))
+    unavailable = sorted(set(cpus) - set(available))
+    if unavailable:
+        msg = "The CPUs %s of the thread affinity %r are not available"
+        raise ValueError(msg % (unavailable, affinity))
+    return cpus, True
+
+
+def _apply_thread_affinity(affinity):
+    global _thread_affinity
+    cpus, per_thread = _parse_thread_affinity(affinity)
+    if _set_thread_affinity((c_int * len(cpus))(*cpus), len(cpus),
+                            per_thread) != 0:
+        raise NotImplementedError("Binding threads to CPUs is not supported "
+                                  "on this platform")
+    _thread_affinity = cpus if per_thread else None
+
+
+def set_thread_affinity(affinity):
+    """
+    Bind the threads of the threading layer to CPUs.
+
+    The threads are bound before they next run work, the thread launching a
+    parallel region is not bound.
+
+    Parameters
+    ----------
+    affinity: One of
+
+        * ``'compact'``: bind the threads one by one to the CPUs of a
+          package before those of the next.
+        * ``'scatter'``: bind the threads one by one to the CPUs of each
+          package in turn.
+        * a list of CPUs such as ``'0,2,4-7'`` or ``[0, 2, 4]``: bind the
+          threads one by one to the listed CPUs.
+        * ``'none'`` or ``None``: let the threads run on any CPU.
+
+        Threads wrap around to the start of the CPUs if there are more
+        threads than CPUs.
+
+    See Also
+    --------
+    get_thread_affinity, :envvar:`NUMBA_THREAD_AFFINITY`
+
+    """
+    _launch_threads()
+    if not (affinity is None or isinstance(affinity, str)):
+        affinity = ','.join(str(int(cpu)) for cpu in affinity)
+    _apply_thread_affinity(affinity)
+
+
+def get_thread_affinity():
+    """
+    Get the CPUs the threads of the threading layer are bound to, in the
+    order of the threads, or None if they are not bound.
+
+    See Also
+    --------
+    set_thread_affinity
+
+    """
+    _launch_threads()
+    return None if _thread_affinity is None else list(_thread_affinity)
+
+
+# The kinds of the chunked schedules of parfors, as in gufunc_scheduler.h
+SCHEDULE_KINDS = {'static': 0, 'dynamic': 1, 'guided': 2}
+
+# The size in intp of the sched_state struct of gufunc_scheduler.h
+SCHED_STATE_SIZE = 6
+
+
+@intrinsic
+def _parfor_next_chunk(typingctx, sched, num_dim):
+    """
+    Claim the next chunk of a chunked parfor schedule for the thread running
+    the given *sched* row, whose bounds are written at the start of the row.
+    Returns False when the thread has no work left.
+    """
+    _launch_threads()
+    sig = types.boolean(sched, num_dim)
+
+    def codegen(context, builder, signature, args):
+        sched, num_dim = args
+        intp_t = context.get_value_type(types.intp)
+        fnty = lc.Type.function(lc.Type.int(), [intp_t,
+                                                lc.Type.pointer(intp_t)])
+        fn = builder.module.get_or_insert_function(
+            fnty, name="do_scheduling_next")
+        ary = context.make_array(signature.args[0])(context, builder, sched)
+        num_dim = context.cast(builder, num_dim, signature.args[1],
+                               types.intp)
+        data = builder.bitcast(ary.data, lc.Type.pointer(intp_t))
+        res = builder.call(fn, [num_dim, data])
+        return builder.icmp_signed('!=', res, res.type(0))
+    return sig, codegen
+
+
 _DYLD_WORKAROUND_SET = 'NUMBA_DYLD_WORKAROUND' in os.environ
 _DYLD_WORKAROUND_VAL = int(os.environ.get('NUMBA_DYLD_WORKAROUND', 0))
 
@@ -0,0 +1,67 @@
+/*
+ * Recording of the timings of parallel regions, see
+ * numba/np/ufunc/parallel_stats.py.
+ */
+
+#include <atomic>
+#include <chrono>
+#include <deque>
+#include <mutex>
+#include "parallel_stats.h"
+
+/* The maximum number of pending events, to bound the memory use when the
+ * events are never read.
+ */
+static const size_t MAX_PENDING_EVENTS = 1 << 22;
+
+static std::mutex events_lock;
+static std::deque<parallel_stats_event> events;
+static int64_t dropped = 0;
+
+static std::atomic<int64_t> next_thread(0);
+
+static int64_t
+current_thread(void)
+{
+    static thread_local int64_t thread = next_thread++;
+    return thread;
+}
+
+extern "C" int64_t
+parallel_stats_now(void)
+{
+    auto now = std::chrono::steady_clock::now().time_since_epoch();
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(now).count();
+}
+
+extern "C" void
+parallel_stats_record(int64_t region, int64_t kind, int64_t start,
+                      int64_t end)
+{
+    parallel_stats_event event = {region, kind, current_thread(), start, end};
+    std::lock_guard<std::mutex> guard(events_lock);
+    if (events.size() < MAX_PENDING_EVENTS)
+        events.push_back(event);
+    else
+        dropped++;
+}
+
+extern "C" int64_t
+parallel_stats_read(parallel_stats_event *out, int64_t count)
+{
+    std::lock_guard<std::mutex> guard(events_lock);
+    int64_t n = 0;
+    while (n < count && !events.empty())
+    {
+        out[n++] = events.front();
+        events.pop_front();
+    }
+    return n;
+}
+
+extern "C" int64_t
+parallel_stats_dropped(void)
+{
+    std::lock_guard<std::mutex> guard(events_lock);
+    return dropped;
+}
@@ -0,0 +1,49 @@
+/*
+ * Recording of the timings of parallel regions, see
+ * numba/np/ufunc/parallel_stats.py.
+ */
+
+#ifndef NUMBA_PARALLEL_STATS_H_
+#define NUMBA_PARALLEL_STATS_H_
+
+#ifdef _MSC_VER
+    #define int64_t signed __int64
+#else
+    #include <stdint.h>
+#endif
+
+#ifdef __cplusplus
+extern "C"
+{
+#endif
+
+/* The layout of a recorded event */
+typedef struct
+{
+    int64_t region;  /* the id of the parallel region */
+    int64_t kind;    /* what was timed, see parallel_stats.py */
+    int64_t thread;  /* a small integer identifying the recording thread */
+    int64_t start;   /* the times of parallel_stats_now() */
+    int64_t end;
+} parallel_stats_event;
+
+/* A monotonic time in nanoseconds */
+int64_t parallel_stats_now(void);
+
+/* Record an event, events are dropped once too many are pending */
+void parallel_stats_record(int64_t region, int64_t kind, int64_t start,
+                           int64_t end);
+
+/* Move up to *count* of the pending events, oldest first, to *events*.
+ * Returns the number of events moved.
+ */
+int64_t parallel_stats_read(parallel_stats_event *events, int64_t count);
+
+/* Returns the number of events dropped so far */
+int64_t parallel_stats_dropped(void);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif  /* NUMBA_PARALLEL_STATS_H_ */
@@ -0,0 +1,289 @@
+"""
+Runtime statistics of parallel regions.
+
+When :envvar:`NUMBA_PARALLEL_STATS` is set, the parallel regions compiled
+afterwards, i.e. the parfors of ``@njit(parallel=True)`` functions and the
+``@vectorize`` and ``@guvectorize`` functions of the ``parallel`` target, are
+instrumented to record the time taken by:
+
+* each run of the region, as seen from the calling thread,
+* the work done by each thread,
+* computing the schedule of a parfor,
+* combining the partial results of the reductions of a parfor.
+
+The events are recorded by the threading layer and collected here on demand.
+"""
+
+import json
+import os
+import threading
+import uuid
+import warnings
+from collections import defaultdict, namedtuple
+from ctypes import CFUNCTYPE, POINTER, Structure, c_int64
+
+import llvmlite.llvmpy.core as lc
+
+from numba.core import errors
+
+
+# The kinds of events
+REGION, WORK, SCHEDULE, REDUCTION = range(4)
+
+_KIND_NAMES = {REGION: 'region', WORK: 'work', SCHEDULE: 'schedule',
+               REDUCTION: 'reduction'}
+
+
+class _Event(Structure):
+    # As parallel_stats_event in parallel_stats.h
+    _fields_ = [('region', c_int64), ('kind', c_int64), ('thread', c_int64),
+                ('start', c_int64), ('end', c_int64)]
+
+
+RegionInfo = namedtuple('RegionInfo', ['kind', 'name', 'parfor_id', 'loc'])
+
+_lock = threading.RLock()
+
+# Region id -> RegionInfo
+_regions = {}
+
+# Region id -> [(kind, thread, start, end)] of the events collected so far
+_events = defaultdict(list)
+
+# Bound by _bind() when the threading layer is launched
+_read_events = None
+_get_dropped = None
+_dropped = 0
+
+
+def _bind(lib):
+    """
+    Bind to the event buffer of the threading layer library *lib*.
+    """
+    global _read_events, _get_dropped
+    _read_events = CFUNCTYPE(c_int64, POINTER(_Event), c_int64)(
+        lib.parallel_stats_read)
+    _get_dropped = CFUNCTYPE(c_int64)(lib.parallel_stats_dropped)
+
+
+def new_region(kind, name, parfor_id=None, loc=None):
+    """
+    Register a new instrumented region and return its id.  *kind* is one of
+    'parfor', 'ufunc' and 'gufunc', *name* the name of its function, and for
+    parfors *parfor_id* and *loc* identify the parfor.
+
+    The ids are random so that those of functions loaded from the cache don't
+    clash with new ones.
+    """
+    region = uuid.uuid4().int >> 65
+    _register_regions({region: (kind, name, parfor_id, loc)})
+    return region
+
+
+def _register_regions(regions):
+    """
+    Register the regions of the dict *regions*, mapping their ids to their
+    RegionInfo as a tuple.  This is also run when cached functions are
+    loaded.
+    """
+    with _lock:
+        for region, info in regions.items():
+            _regions[region] = RegionInfo(*info)
+
+
+def _collect():
+    """
+    Move the pending events of the threading layer to _events.
+    """
+    global _dropped
+    if _read_events is None:
+        return
+    count = 4096
+    buf = (_Event * count)()
+    with _lock:
+        while True:
+            n = _read_events(buf, count)
+            for event in buf[:n]:
+                _events[event.region].append((event.kind, event.thread,
+                                              event.start, event.end))
+            if n < count:
+                break
+        dropped = _get_dropped()
+        if dropped > _dropped:
+            msg = ("%d parallel region events were dropped because they were "
+                   "not collected in time" % (dropped - _dropped))
+            warnings.warn(errors.NumbaWarning(msg))
+            _dropped = dropped
+
+
+def reset():
+    """
+    Discard the events recorded so far.
+    """
+    with _lock:
+        _collect()
+        _events.clear()
+
+
+class RegionStats(object):
+    """
+    The statistics of the runs of a parallel region so far.  Times are in
+    seconds.
+
+    Attributes
+    ----------
+    region: The id of the region.
+    info: Its RegionInfo.
+    runs: The number of runs.
+    wall_time: The total time of the runs, as seen from the calling thread.
+    thread_times: A dict of the time each thread spent working in the region.
+    schedule_time: The total time spent computing the schedule of a parfor.
+    reduction_time: The total time spent combining the partial results of
+        the reductions of a parfor.
+    """
+
+    def __init__(self, region, info, events):
+        self.region = region
+        self.info = info
+        self.runs = 0
+        self.wall_time = 0.
+        self.thread_times = defaultdict(float)
+        self.schedule_time = 0.
+        self.reduction_time = 0.
+        for kind, thread, start, end in events:
+            duration = (end - start) * 1e-9
+            if kind == REGION:
+                self.runs += 1
+                self.wall_time += duration
+            elif kind == WORK:
+                self.thread_times[thread] += duration
+            elif kind == SCHEDULE:
+                self.schedule_time += duration
+            elif kind == REDUCTION:
+                self.reduction_time += duration
+        self.thread_times = dict(self.thread_times)
+
+    @property
+    def busy_time(self):
+        """
+        The total time spent working by all the threads.
+        """
+        return sum(self.thread_times.values())
+
+    @property
+    def idle_time(self):
+        """
+        The time the threads that took part in the region spent waiting
+        during its runs.
+        """
+        return max(self.wall_time * len(self.thread_times) - self.busy_time,
+                   0.)
+
+    @property
+    def imbalance(self):
+        """
+        The ratio of the maximum to the mean time spent working by the
+        threads, 1.0 for a perfectly balanced load.
+        """
+        if not self.thread_times or not self.busy_time:
+            return 1.
+        mean = self.busy_time / len(self.thread_times)
+        return max(self.thread_times.values()) / mean
+
+    def __repr__(self):
+        return "<RegionStats %s: %d runs, %.6fs>" % (self._title(), self.runs,
+                                                     self.wall_time)
+
+    def _title(self):
+        if self.info.kind == 'parfor':
+            return "%s parfor #%s" % (self.info.name, self.info.parfor_id)
+        return "%s %s" % (self.info.name, self.info.kind)
+
+    def report(self):
+        """
+        Returns a report of the statistics as a string.
+        """
+        lines = [self._title()]
+        if self.info.loc:
+            lines.append("  at %s" % (self.info.loc,))
+        lines += ["  runs:           %d" % self.runs,
+                  "  wall time:      %.6fs" % self.wall_time,
+                  "  busy time:      %.6fs" % self.busy_time,
+                  "  idle time:      %.6fs" % self.idle_time,
+                  "  imbalance:      %.2f" % self.imbalance]
+        if self.info.kind == 'parfor':
+            lines += ["  schedule time:  %.6fs" % self.schedule_time,
+                      "  reduction time: %.6fs" % self.reduction_time]
+        for thread in sorted(self.thread_times):
+            lines.append("  thread %-7d %.6fs" % (thread,
+                                                  self.thread_times[thread]))
+        return '\n'.join(lines)
+
+
+def _select_regions(regions, name):
+    if regions is None:
+        regions = [region for region, info in _regions.items()
+                   if name is None or info.name == name]
+    return regions
+
+
+def get_stats(regions=None, name=None):
+    """
+    Returns the RegionStats of the given region ids, or of all the regions
+    of the functions called *name*, or of all the regions.
+    """
+    with _lock:
+        _collect()
+        return [RegionStats(region, _regions[region], _events.get(region, ()))
+                for region in _select_regions(regions, name)]
+
+
+def export_trace(file, regions=None, name=None):
+    """
+    Write the events of the given regions, selected as by get_stats(), to
+    *file*, a path or a file object, in the Chrome trace event format.  This
+    can be viewed with e.g. chrome://tracing or https://ui.perfetto.dev.
+    """
+    pid = os.getpid()
+    trace = []
+    with _lock:
+        _collect()
+        for region in _select_regions(regions, name):
+            title = RegionStats(region, _regions[region], ())._title()
+            for kind, thread, start, end in _events.get(region, ()):
+                trace.append({'name': title, 'cat': _KIND_NAMES[kind],
+                              'ph': 'X', 'pid': pid, 'tid': thread,
+                              'ts': start / 1e3, 'dur': (end - start) / 1e3,
+                              'args': {'region': str(region)}})
+    trace.sort(key=lambda event: event['ts'])
+    data = {'traceEvents': trace, 'displayTimeUnit': 'ns'}
+    if hasattr(file, 'write'):
+        json.dump(data, file)
+    else:
+        with open(file, 'w') as f:
+            json.dump(data, f)
+
+
+# Code generation
+
+def emit_now(builder):
+    """
+    Emit a call returning the current time in nanoseconds.
+    """
+    fnty = lc.Type.function(lc.Type.int(64), [])
+    fn = builder.module.get_or_insert_function(fnty,
+                                               name="parallel_stats_now")
+    return builder.call(fn, [])
+
+
+def emit_record(builder, region, kind, start):
+    """
+    Emit the recording of an event of the given *region* and *kind* from
+    *start*, as given by emit_now(), to now.
+    """
+    i64 = lc.Type.int(64)
+    end = emit_now(builder)
+    fnty = lc.Type.function(lc.Type.void(), [i64] * 4)
+    fn = builder.module.get_or_insert_function(fnty,
+                                               name="parallel_stats_record")
+    builder.call(fn, [i64(region), i64(kind), start, end])
@@ -13,11 +13,14 @@ Implement parallel vectorize workqueue on top of Intel TBB.
 #endif
 
 #include <tbb/tbb.h>
+#include <atomic>
 #include <string.h>
 #include <stdio.h>
 #include "workqueue.h"
 
 #include "gufunc_scheduler.h"
+#include "affinity.h"
+#include "parallel_stats.h"
 
 /* TBB 2019 U5 is the minimum required version as this is needed:
  * https://github.com/intel/tbb/blob/18070344d755ece04d169e6cc40775cae9288cee/CHANGES#L133-L134
@@ -54,6 +57,14 @@ static int _INIT_NUM_THREADS = -1;
 // This is the per-thread thread mask, each thread can carry its own mask.
 static THREAD_LOCAL(int) _TLS_num_threads = 0;
 
+// The affinity generation the thread is bound for, see affinity.h
+static THREAD_LOCAL(int) _TLS_affinity_generation = 0;
+
+// The slot of a worker thread for affinity_bind_thread(), 0 if not assigned.
+// Workers join many arenas so their slots are handed out on first use.
+static THREAD_LOCAL(int) _TLS_affinity_slot = 0;
+static std::atomic<int> next_affinity_slot(1);
+
 
 static void
 set_num_threads(int count)
@@ -94,6 +105,12 @@ public:
 
 void fix_tls_observer::on_scheduler_entry(bool worker) {
     set_num_threads(mask_val);
+    if (worker)
+    {
+        if (_TLS_affinity_slot == 0)
+            _TLS_affinity_slot = next_affinity_slot++;
+        affinity_bind_thread(_TLS_affinity_slot, &_TLS_affinity_generation);
+    }
 }
 
 static void
@@ -311,12 +328,28 @@ MOD_INIT(tbbpool)
                            PyLong_FromVoidPtr((void*)&do_scheduling_signed));
     PyObject_SetAttrString(m, "do_scheduling_unsigned",
                            PyLong_FromVoidPtr((void*)&do_scheduling_unsigned));
+    PyObject_SetAttrString(m, "do_scheduling_chunked_signed",
+                           PyLong_FromVoidPtr((void*)&do_scheduling_chunked_signed));
+    PyObject_SetAttrString(m, "do_scheduling_chunked_unsigned",
+                           PyLong_FromVoidPtr((void*)&do_scheduling_chunked_unsigned));
+    PyObject_SetAttrString(m, "do_scheduling_next",
+                           PyLong_FromVoidPtr((void*)&do_scheduling_next));
     PyObject_SetAttrString(m, "set_num_threads",
                            PyLong_FromVoidPtr((void*)&set_num_threads));
     PyObject_SetAttrString(m, "get_num_threads",
                            PyLong_FromVoidPtr((void*)&get_num_threads));
     PyObject_SetAttrString(m, "get_thread_id",
                            PyLong_FromVoidPtr((void*)&get_thread_id));
+    PyObject_SetAttrString(m, "set_thread_affinity",
+                           PyLong_FromVoidPtr((void*)&set_thread_affinity));
+    PyObject_SetAttrString(m, "parallel_stats_now",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_now));
+    PyObject_SetAttrString(m, "parallel_stats_record",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_record));
+    PyObject_SetAttrString(m, "parallel_stats_read",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_read));
+    PyObject_SetAttrString(m, "parallel_stats_dropped",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_dropped));
 
     return MOD_SUCCESS_VAL(m);
 }
@@ -4,9 +4,17 @@ Implement parallel vectorize workqueue.
 This keeps a set of worker threads running all the time.
 They wait and spin on a task queue for jobs.
 
+parallel_for() balances the load between the threads by work stealing: each
+participating thread starts with an equal share of the outer dimension, and
+threads which run out of work steal half of the remaining share of another.
+Parfors with the default static schedule are launched with a few schedule
+rows per thread for that purpose (see _STATIC_ROWS_PER_THREAD in
+parfor_lowering.py), unless they have reductions combined serially.
+
 **WARNING**
-This module is not thread-safe.  Adding task to queue is not protected from
-race conditions.
+Adding task to queue is not protected from race conditions.  parallel_for()
+is safe to call from several threads and from within a parallel region, but
+it then runs serially in the calling thread if the thread pool is busy.
 */
 #include "../../_pymodule.h"
 #ifdef _POSIX_C_SOURCE
@@ -39,19 +47,11 @@ race conditions.
 #include <stdio.h>
 #include "workqueue.h"
 #include "gufunc_scheduler.h"
+#include "affinity.h"
+#include "parallel_stats.h"
 
 #define _DEBUG 0
 
-/* workqueue is not threadsafe, so we use DSO globals to flag and update various
- * states.
- */
-/* This variable is the nesting level, it's incremented at the start of each
- * parallel region and decremented at the end, if parallel regions are nested
- * on entry the value == 1 and workqueue will abort (this in preference to just
- * hanging or segfaulting).
- */
-static int _nesting_level = 0;
-
 /* As the thread-pool isn't inherited by children,
    free the task-queue, too. */
 static void reset_after_fork(void);
@@ -104,6 +104,38 @@ queue_condition_wait(queue_condition_t *qc)
     pthread_cond_wait(&qc->cond, &qc->mutex);
 }
 
+typedef pthread_mutex_t range_lock_t;
+
+static void
+range_lock_init(range_lock_t *lock)
+{
+    pthread_mutex_init(lock, NULL);
+}
+
+static void
+range_lock_destroy(range_lock_t *lock)
+{
+    pthread_mutex_destroy(lock);
+}
+
+static void
+range_lock(range_lock_t *lock)
+{
+    pthread_mutex_lock(lock);
+}
+
+static int
+range_trylock(range_lock_t *lock)
+{
+    return pthread_mutex_trylock(lock) == 0;
+}
+
+static void
+range_unlock(range_lock_t *lock)
+{
+    pthread_mutex_unlock(lock);
+}
+
 static thread_pointer
 numba_new_thread(void *worker, void *arg)
 {
@@ -177,6 +209,38 @@ queue_condition_wait(queue_condition_t *qc)
     SleepConditionVariableCS(&qc->cv, &qc->cs, INFINITE);
 }
 
+typedef CRITICAL_SECTION range_lock_t;
+
+static void
+range_lock_init(range_lock_t *lock)
+{
+    InitializeCriticalSection(lock);
+}
+
+static void
+range_lock_destroy(range_lock_t *lock)
+{
+    DeleteCriticalSection(lock);
+}
+
+static void
+range_lock(range_lock_t *lock)
+{
+    EnterCriticalSection(lock);
+}
+
+static int
+range_trylock(range_lock_t *lock)
+{
+    return TryEnterCriticalSection(lock) != 0;
+}
+
+static void
+range_unlock(range_lock_t *lock)
+{
+    LeaveCriticalSection(lock);
+}
+
 /* Adapted from Python/thread_nt.h */
 typedef struct
 {
@@ -246,21 +310,63 @@ static int queue_count;
 static int queue_pivot = 0;
 static int NUM_THREADS = -1;
 
+/* The number of times to poll the state of a queue before sleeping on its
+ * condition, see set_spin_count().
+ */
+static int spin_count = 0;
+
+/* The state is written with the condition locked, but is polled without */
+#ifdef _MSC_VER
+#define queue_state_load(queue) (*(volatile int *)&(queue)->state)
+#define queue_state_store(queue, value) \
+    (*(volatile int *)&(queue)->state = (value))
+#define cpu_relax() YieldProcessor()
+#else
+#define queue_state_load(queue) __atomic_load_n(&(queue)->state, __ATOMIC_ACQUIRE)
+#define queue_state_store(queue, value) \
+    __atomic_store_n(&(queue)->state, (value), __ATOMIC_RELEASE)
+#if defined(__x86_64__) || defined(__i386__)
+#define cpu_relax() __builtin_ia32_pause()
+#elif defined(__aarch64__)
+#define cpu_relax() __asm__ __volatile__("yield")
+#else
+#define cpu_relax() ((void)0)
+#endif
+#endif
+
 static void
 queue_state_wait(Queue *queue, int old, int repl)
 {
     queue_condition_t *cond = &queue->cond;
+    int i;
+
+    /* Waking up a thread sleeping on the condition can take longer than
+     * running a small parallel region, so poll for a while first.
+     */
+    for (i = 0; i < spin_count && queue_state_load(queue) != old; i++)
+    {
+        cpu_relax();
+    }
 
     queue_condition_lock(cond);
-    while (queue->state != old)
+    while (queue_state_load(queue) != old)
     {
         queue_condition_wait(cond);
     }
-    queue->state = repl;
+    queue_state_store(queue, repl);
     queue_condition_signal(cond);
     queue_condition_unlock(cond);
 }
 
+/* Set the number of times threads poll for work, or for the end of a
+ * parallel region, before they sleep.
+ */
+static void
+set_spin_count(int count)
+{
+    spin_count = count < 0 ? 0 : count;
+}
+
 // break on this for debug
 void debug_marker(void);
 void debug_marker() {};
@@ -280,6 +386,9 @@ static int _INIT_NUM_THREADS = -1;
 // This is the per-thread thread mask, each thread can carry its own mask.
 static THREAD_LOCAL(int) _TLS_num_threads = 0;
 
+// The affinity generation the thread is bound for, see affinity.h
+static THREAD_LOCAL(int) _TLS_affinity_generation = 0;
+
 static void
 set_num_threads(int count)
 {
@@ -303,17 +412,142 @@ get_num_threads(void)
 }
 
 
-// this complies to a launchable function from `add_task` like:
-// add_task(nopfn, NULL, NULL, NULL, NULL)
-// useful if you want to limit the number of threads locally
-// static void nopfn(void *args, void *dims, void *steps, void *data) {};
+// Whether the thread is running a parallel_for(), which is then run serially
+// when nested.
+static THREAD_LOCAL(int) _TLS_in_parallel_for = 0;
 
+// Held while parallel_for() uses the thread pool, other threads then run
+// their parallel_for() serially.
+static range_lock_t pool_lock;
+static int pool_lock_initialized = 0;
 
-// synchronize the TLS num_threads slot to value args[0]
-static void sync_tls(void *args, void *dims, void *steps, void *data) {
-    int nthreads = *((int *)(args));
-    _TLS_num_threads = nthreads;
-};
+
+/* The rows [begin, end) of the outer dimension of a parallel_for() call
+ * which are left to run by one of its participating threads.  Other
+ * participants steal from them once they run out of rows.
+ */
+typedef struct
+{
+    range_lock_t lock;
+    size_t begin, end;
+} WorkRange;
+
+/* A parallel_for() call */
+typedef struct
+{
+    void (*fn)(void *args, void *dims, void *steps, void *data);
+    char **args;
+    size_t *steps;
+    void *data;
+    size_t array_count;
+    /* The number of rows run by each call of fn */
+    size_t grain;
+    int num_threads;
+    WorkRange *ranges;
+} Region;
+
+/* A participating thread of a parallel_for() call, with its scratch space
+ * for the arguments of fn.
+ */
+typedef struct
+{
+    Region *region;
+    int index;
+    size_t *count_space;
+    char **array_arg_space;
+} Participant;
+
+static int
+pop_rows(WorkRange *range, size_t grain, size_t *begin, size_t *end)
+{
+    int found = 0;
+    range_lock(&range->lock);
+    if (range->begin < range->end)
+    {
+        *begin = range->begin;
+        if (range->end - range->begin > grain)
+            *end = range->begin + grain;
+        else
+            *end = range->end;
+        range->begin = *end;
+        found = 1;
+    }
+    range_unlock(&range->lock);
+    return found;
+}
+
+/* Move the upper half of the rows left to another participant to the empty
+ * range of participant *self*.  Returns 0 if there were none left.
+ */
+static int
+steal_rows(Region *region, int self)
+{
+    int i;
+    size_t begin, end;
+    WorkRange *victim, *own;
+
+    for (i = 1; i < region->num_threads; i++)
+    {
+        victim = &region->ranges[(self + i) % region->num_threads];
+        begin = end = 0;
+        range_lock(&victim->lock);
+        if (victim->begin < victim->end)
+        {
+            end = victim->end;
+            begin = victim->begin + (victim->end - victim->begin) / 2;
+            victim->end = begin;
+        }
+        range_unlock(&victim->lock);
+        if (begin < end)
+        {
+            own = &region->ranges[self];
+            range_lock(&own->lock);
+            own->begin = begin;
+            own->end = end;
+            range_unlock(&own->lock);
+            return 1;
+        }
+    }
+    return 0;
+}
+
+static void
+run_rows(Participant *participant, size_t begin, size_t end)
+{
+    Region *region = participant->region;
+    size_t j;
+
+    participant->count_space[0] = end - begin;
+    for (j = 0; j < region->array_count; j++)
+    {
+        participant->array_arg_space[j] = region->args[j] +
+                                          region->steps[j] * begin;
+    }
+    region->fn(participant->array_arg_space, participant->count_space,
+               region->steps, region->data);
+}
+
+// The task of a participating thread, args is its Participant
+static void
+participate(void *args, void *dims, void *steps, void *data)
+{
+    Participant *participant = (Participant *) args;
+    Region *region = participant->region;
+    WorkRange *own = &region->ranges[participant->index];
+    size_t begin, end;
+
+    // Kernels run with the thread count of the caller
+    _TLS_num_threads = region->num_threads;
+    _TLS_in_parallel_for = 1;
+    while (1)
+    {
+        if (pop_rows(own, region->grain, &begin, &end))
+            run_rows(participant, begin, end);
+        else if (!steal_rows(region, participant->index))
+            break;
+    }
+    _TLS_in_parallel_for = 0;
+}
 
 
 static void
@@ -326,141 +560,94 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     //     steps = <ir.Argument '.3' of type i64*>
     //     data = <ir.Argument '.4' of type i8*>
 
-    // check the nesting level, if it's already 1, abort, workqueue cannot
-    // handle nesting.
-    if (_nesting_level >= 1){
-        fprintf(stderr, "%s", "Terminating: Nested parallel kernel launch "
-                              "detected, the workqueue threading layer does "
-                              "not supported nested parallelism. Try the TBB "
-                              "threading layer.\n");
-        raise(SIGABRT);
-        return;
-    }
-
-    // increment the nest level
-    _nesting_level += 1;
-
-    size_t * count_space = NULL;
-    char ** array_arg_space = NULL;
+    void (*func)(void *args, void *dims, void *steps, void *data) = fn;
     const size_t arg_len = (inner_ndim + 1);
     int i; // induction var for chunking, thread count unlikely to overflow int
-    size_t j, count, remain, total;
-
-    ptrdiff_t offset;
-    char * base;
-    int old_queue_count = -1;
-
-    size_t step;
+    size_t count, total;
+    int old_queue_count, old_num_threads;
+    Region region;
+    Participant *participants;
+    Queue *queue;
 
     debug_marker();
 
     total = *((size_t *)dimensions);
+    if (num_threads > NUM_THREADS)
+        num_threads = NUM_THREADS;
+    if ((size_t) num_threads > total)
+        num_threads = (int) total;
+
+    // Nested calls, calls while another thread uses the pool and calls
+    // with a single thread just run in the calling thread.
+    if (num_threads <= 1 || _TLS_in_parallel_for ||
+        !range_trylock(&pool_lock))
+    {
+        func(args, dimensions, steps, data);
+        return;
+    }
+
     count = total / num_threads;
-    remain = total;
+
+    region.fn = func;
+    region.args = args;
+    region.steps = steps;
+    region.data = data;
+    region.array_count = array_count;
+    region.num_threads = num_threads;
+    // Run a few chunks per participant so that there is some left to
+    // steal in the end
+    region.grain = total / (num_threads * 4);
+    if (region.grain == 0)
+        region.grain = 1;
+    region.ranges = (WorkRange *)alloca(sizeof(WorkRange) * num_threads);
+    participants = (Participant *)alloca(sizeof(Participant) * num_threads);
 
     if(_DEBUG)
     {
         printf("inner_ndim: %ld\n",inner_ndim);
-        printf("arg_len: %ld\n", arg_len);
         printf("total: %ld\n", total);
         printf("count: %ld\n", count);
-
-        printf("dimensions: ");
-        for(j = 0; j < arg_len; j++)
-        {
-            printf("%ld, ", ((size_t *)dimensions)[j]);
-        }
-        printf("\n");
-
-        printf("steps: ");
-        for(j = 0; j < array_count; j++)
-        {
-            printf("%ld, ", steps[j]);
-        }
-        printf("\n");
-
-        printf("*args: ");
-        for(j = 0; j < array_count; j++)
-        {
-            printf("%p, ", (void *)args[j]);
-        }
+        printf("grain: %ld\n", region.grain);
     }
 
-    // sync the thread pool TLS slots, sync all slots, we don't know which
-    // threads will end up running.
-    for (i = 0; i < NUM_THREADS; i++)
+    for (i = 0; i < num_threads; i++)
     {
-        add_task(sync_tls, (void *)(&num_threads), NULL, NULL, NULL);
+        range_lock_init(&region.ranges[i].lock);
+        region.ranges[i].begin = count * i;
+        // Last thread takes all leftover
+        region.ranges[i].end = (i == num_threads - 1) ? total : count * (i + 1);
+
+        participants[i].region = &region;
+        participants[i].index = i;
+        participants[i].count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
+        memcpy(participants[i].count_space, dimensions, arg_len * sizeof(size_t));
+        participants[i].array_arg_space = alloca(sizeof(char*) * array_count);
     }
-    ready();
-    synchronize();
 
-    // This backend isn't threadsafe so just mutate the global
+    // The calling thread is participant 0, the workers of the first queues
+    // are the others.
     old_queue_count = queue_count;
-    queue_count = num_threads;
-
-    for (i = 0; i < num_threads; i++)
+    queue_count = num_threads - 1;
+    for (i = 1; i < num_threads; i++)
     {
-        count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
-        memcpy(count_space, dimensions, arg_len * sizeof(size_t));
-        if(i == num_threads - 1)
-        {
-            // Last thread takes all leftover
-            count_space[0] = remain;
-        }
-        else
-        {
-            count_space[0] = count;
-            remain = remain - count;
-        }
-
-        if(_DEBUG)
-        {
-            printf("\n=================== THREAD %d ===================\n", i);
-            printf("\ncount_space: ");
-            for(j = 0; j < arg_len; j++)
-            {
-                printf("%ld, ", count_space[j]);
-            }
-            printf("\n");
-        }
-
-        array_arg_space = alloca(sizeof(char*) * array_count);
-
-        for(j = 0; j < array_count; j++)
-        {
-            base = args[j];
-            step = steps[j];
-            offset = step * count * i;
-            array_arg_space[j] = (char *)(base + offset);
-
-            if(_DEBUG)
-            {
-                printf("Index %ld\n", j);
-                printf("-->Got base %p\n", (void *)base);
-                printf("-->Got step %ld\n", step);
-                printf("-->Got offset %ld\n", offset);
-                printf("-->Got addr %p\n", (void *)array_arg_space[j]);
-            }
-        }
-
-        if(_DEBUG)
-        {
-            printf("\narray_arg_space: ");
-            for(j = 0; j < array_count; j++)
-            {
-                printf("%p, ", (void *)array_arg_space[j]);
-            }
-        }
-        add_task(fn, (void *)array_arg_space, (void *)count_space, steps, data);
+        queue = &queues[i - 1];
+        queue->task.func = participate;
+        queue->task.args = &participants[i];
+        queue->task.dims = NULL;
+        queue->task.steps = NULL;
+        queue->task.data = NULL;
     }
 
+    old_num_threads = _TLS_num_threads;
     ready();
+    participate(&participants[0], NULL, NULL, NULL);
+    _TLS_num_threads = old_num_threads;
     synchronize();
 
     queue_count = old_queue_count;
-    // decrement the nest level
-    _nesting_level -= 1;
+    for (i = 0; i < num_threads; i++)
+        range_lock_destroy(&region.ranges[i].lock);
+    range_unlock(&pool_lock);
 }
 
 static void
@@ -497,6 +684,12 @@ void thread_worker(void *arg)
          */
         queue_state_wait(queue, READY, RUNNING);
 
+        /* The calling thread of parallel_for() is slot 0, the worker of
+         * each queue is the next.
+         */
+        affinity_bind_thread((int)(queue - queues) + 1,
+                             &_TLS_affinity_generation);
+
         task = &queue->task;
         task->func(task->args, task->dims, task->steps, task->data);
 
@@ -516,6 +709,11 @@ static void launch_threads(int count)
 
         /* set for use in parallel_for */
         NUM_THREADS = count;
+        if (!pool_lock_initialized)
+        {
+            range_lock_init(&pool_lock);
+            pool_lock_initialized = 1;
+        }
         queues = malloc(sz);     /* this memory will leak */
         /* Note this initializes the state to IDLE */
         memset(queues, 0, sz);
@@ -555,7 +753,8 @@ static void reset_after_fork(void)
     queues = NULL;
     NUM_THREADS = -1;
     _INIT_NUM_THREADS = -1;
-    _nesting_level = 0;
+    /* The lock may have been held by another thread of the parent */
+    range_lock_init(&pool_lock);
 }
 
 MOD_INIT(workqueue)
@@ -579,11 +778,29 @@ MOD_INIT(workqueue)
                            PyLong_FromVoidPtr(&do_scheduling_signed));
     PyObject_SetAttrString(m, "do_scheduling_unsigned",
                            PyLong_FromVoidPtr(&do_scheduling_unsigned));
+    PyObject_SetAttrString(m, "do_scheduling_chunked_signed",
+                           PyLong_FromVoidPtr(&do_scheduling_chunked_signed));
+    PyObject_SetAttrString(m, "do_scheduling_chunked_unsigned",
+                           PyLong_FromVoidPtr(&do_scheduling_chunked_unsigned));
+    PyObject_SetAttrString(m, "do_scheduling_next",
+                           PyLong_FromVoidPtr(&do_scheduling_next));
     PyObject_SetAttrString(m, "set_num_threads",
                            PyLong_FromVoidPtr((void*)&set_num_threads));
     PyObject_SetAttrString(m, "get_num_threads",
                            PyLong_FromVoidPtr((void*)&get_num_threads));
     PyObject_SetAttrString(m, "get_thread_id",
                            PyLong_FromVoidPtr((void*)&get_thread_id));
+    PyObject_SetAttrString(m, "set_thread_affinity",
+                           PyLong_FromVoidPtr((void*)&set_thread_affinity));
+    PyObject_SetAttrString(m, "set_spin_count",
+                           PyLong_FromVoidPtr((void*)&set_spin_count));
+    PyObject_SetAttrString(m, "parallel_stats_now",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_now));
+    PyObject_SetAttrString(m, "parallel_stats_record",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_record));
+    PyObject_SetAttrString(m, "parallel_stats_read",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_read));
+    PyObject_SetAttrString(m, "parallel_stats_dropped",
+                           PyLong_FromVoidPtr((void*)&parallel_stats_dropped));
     return MOD_SUCCESS_VAL(m);
 }
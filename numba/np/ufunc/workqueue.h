@@ -49,7 +49,12 @@ void ready(void);
  inner_ndim - inner dimension of the gufunc
  array_count - the number of arrays in the signature (Python: len(sig.args) + 1)
  the +1 is for the output array.
+ num_threads - the number of threads to run on, including the calling thread
 
+ The outer dimension is split evenly between the threads, which then steal
+ rows from each other to balance the load.  The call is run serially in the
+ calling thread if it is nested in another parallel_for() or if the thread
+ pool is in use by another thread.
  */
 static void
 parallel_for(void *fn, char **args, size_t *dims, size_t *steps, void *data,\
@@ -555,6 +555,9 @@ class Parfor(ir.Expr, ir.Stmt):
         # sequential lowering option
         self.no_sequential_lowering = no_sequential_lowering
         self.races = races
+        # the tile sizes of the loop nests when lowered in parallel, see
+        # get_tile_sizes()
+        self.tiles = None
         if config.DEBUG_ARRAY_OPT_STATS:
             fmt = 'Parallel for-loop #{} is produced from pattern \'{}\' at {}'
             print(fmt.format(
@@ -605,6 +608,8 @@ class Parfor(ir.Expr, ir.Stmt):
         print("index_var = ", self.index_var, file=file)
         print("params = ", self.params, file=file)
         print("races = ", self.races, file=file)
+        if self.tiles is not None:
+            print("tiles = ", self.tiles, file=file)
         for loopnest in self.loop_nests:
             print(loopnest, file=file)
         print("init block:", file=file)
@@ -675,6 +680,8 @@ class ParforDiagnostics(object):
         self.fusion_info = defaultdict(list)
         self.nested_fusion_info = defaultdict(list)
         self.fusion_reports = []
+        self.collapse_info = defaultdict(list)
+        self.tile_info = {}
         self.hoist_info = {}
         self.has_setup = False
 
@@ -1065,6 +1072,22 @@ class ParforDiagnostics(object):
 
 #----------- loop nest section
             if print_loopnest_rewrite:
+                if self.collapse_info != {}:
+                    print_wrapped((" Collapsing loop nests ").center(_termwidth, '-'))
+                    print_wrapped("Attempting to collapse perfectly nested parallel loops...\n ")
+                    root_msg = 'has the following loops collapsed into it:'
+                    node_msg = '(collapsed)'
+                    dump_graph_indented(self.collapse_info, root_msg, node_msg)
+                    print_wrapped(_termwidth * '-')
+                    print_wrapped("")
+                if self.tile_info != {}:
+                    print_wrapped((" Tiling loop nests ").center(_termwidth, '-'))
+                    for pf_id, tiles in sorted(self.tile_info.items()):
+                        sizes = ', '.join(str(x) if x else '-' for x in tiles)
+                        print_wrapped("Parallel for-loop #%s is tiled with "
+                                      "tiles of (%s) iterations." % (pf_id, sizes))
+                    print_wrapped(_termwidth * '-')
+                    print_wrapped("")
                 if self.nested_fusion_info != {}:
                     print_wrapped((" Optimising loop nests ").center(_termwidth, '-'))
                     print_wrapped("Attempting loop nest rewrites (optimising for the largest parallel loops)...\n ")
@@ -2635,6 +2658,14 @@ class ParforPass(ParforPassStates):
             dprint_func_ir(self.func_ir, "after fusion")
         # simplify again
         simplify(self.func_ir, self.typemap, self.calltypes)
+        if self.options.collapse:
+            self.collapse_parfors(self.func_ir.blocks)
+            dprint_func_ir(self.func_ir, "after collapse")
+        tile = self.options.tile
+        if tile is None:
+            tile = config.PARFOR_TILE_SIZE
+        if tile:
+            self.tile_parfors(self.func_ir.blocks, tile)
         # push function call variables inside parfors so gufunc function
         # wouldn't need function variables as argument
         push_call_vars(self.func_ir.blocks, {}, {}, self.typemap)
@@ -2769,6 +2800,32 @@ class ParforPass(ParforPassStates):
         self.fuse_parfors(arr_analysis, blocks)
         unwrap_parfor_blocks(parfor)
 
+    def collapse_parfors(self, blocks, call_table=None):
+        """Collapse the perfectly nested parfors in blocks, innermost first,
+        see try_collapse().
+        """
+        if call_table is None:
+            call_table, _ = get_call_table(blocks)
+        for block in blocks.values():
+            for stmt in block.body:
+                if isinstance(stmt, Parfor):
+                    self.collapse_parfors(stmt.loop_body, call_table)
+                    inner = try_collapse(stmt, self.typemap, call_table)
+                    if inner is not None:
+                        self.diagnostics.collapse_info[stmt.id].append(inner.id)
+
+    def tile_parfors(self, blocks, tile):
+        """Set the tile sizes of the parfors in blocks, see get_tile_sizes().
+        The parfors nested in others are lowered as serial loops and are not
+        tiled.
+        """
+        for block in blocks.values():
+            for stmt in block.body:
+                if isinstance(stmt, Parfor):
+                    stmt.tiles = get_tile_sizes(len(stmt.loop_nests), tile)
+                    if stmt.tiles is not None:
+                        self.diagnostics.tile_info[stmt.id] = stmt.tiles
+
 
 def _remove_size_arg(call_name, expr):
     "remove size argument from args or kws"
@@ -3824,6 +3881,156 @@ def has_cross_iter_dep(parfor):
     return False
 
 
+def _is_collapsible_stmt(stmt, typemap, call_table):
+    """Return True if stmt can be moved out of the body of a parfor being
+    collapsed, i.e. it computes a scalar or tuple cheaply, without side
+    effects and without raising.
+    """
+    if not isinstance(stmt, ir.Assign):
+        return False
+    rhs = stmt.value
+    if isinstance(rhs, (ir.Const, ir.Global, ir.FreeVar)):
+        return True
+
+    def is_scalar(typ):
+        return isinstance(typ, (types.Number, types.Boolean))
+
+    typ = typemap[stmt.target.name]
+    if not (is_scalar(typ) or (isinstance(typ, types.BaseTuple) and
+                               all(is_scalar(t) for t in typ.types))):
+        return False
+    if isinstance(rhs, ir.Var):
+        return True
+    if not isinstance(rhs, ir.Expr):
+        return False
+    if rhs.op == 'binop':
+        return rhs.fn in (operator.add, operator.sub, operator.mul,
+                          operator.and_, operator.or_, operator.xor,
+                          operator.eq, operator.ne, operator.lt,
+                          operator.le, operator.gt, operator.ge)
+    if rhs.op == 'static_getitem':
+        return isinstance(typemap[rhs.value.name], types.BaseTuple)
+    if rhs.op == 'call':
+        return call_table.get(rhs.func.name) == [len]
+    return rhs.op in ('unary', 'getattr', 'build_tuple', 'cast')
+
+
+def _get_carried_vars(parfor):
+    """Return the variables defined in the body of parfor that are live at
+    the start of an iteration, i.e. carried from one iteration to the next
+    as in reductions.
+    """
+    blocks = wrap_parfor_blocks(parfor)
+    cfg = compute_cfg_from_blocks(blocks)
+    usedefs = compute_use_defs(blocks)
+    live_map = compute_live_map(cfg, blocks, usedefs.usemap, usedefs.defmap)
+    unwrap_parfor_blocks(parfor)
+    body_defs = set()
+    for label in parfor.loop_body:
+        body_defs |= usedefs.defmap[label]
+    return live_map[min(parfor.loop_body.keys())] & body_defs
+
+
+def try_collapse(parfor, typemap, call_table):
+    """Collapse the parfor nested in parfor into it if they are perfectly
+    nested and return the nested parfor, otherwise return None.
+
+    The loop nests of the nested parfor are appended to those of parfor, so
+    its iterations are scheduled over the threads along with those of the
+    outer loops.  The statements of the body before the nested parfor have
+    to pass _is_collapsible_stmt(), those that depend on the outer loop
+    indices are moved to the start of the body of the nested parfor and the
+    others to the init block of parfor.  Loops with races or loop carried
+    variables, e.g. reductions, are not collapsed.
+    """
+    if len(parfor.loop_body) != 1 or parfor.races:
+        return None
+    [block] = parfor.loop_body.values()
+    nested = [i for i, stmt in enumerate(block.body)
+              if isinstance(stmt, Parfor)]
+    if len(nested) != 1:
+        return None
+    i = nested[0]
+    inner = block.body[i]
+    if inner.races:
+        return None
+    # constant assignments that are left over after the nested parfor are
+    # dead since there is no race
+    if not all(isinstance(stmt, ir.Assign) and isinstance(stmt.value, ir.Const)
+               for stmt in block.body[i + 1:]):
+        return None
+    pre_stmts = block.body[:i] + inner.init_block.body
+    if not all(_is_collapsible_stmt(stmt, typemap, call_table)
+               for stmt in pre_stmts):
+        return None
+    targets = [stmt.target.name for stmt in pre_stmts]
+    if len(set(targets)) != len(targets):
+        return None
+    loop_nests = parfor.loop_nests + inner.loop_nests
+    index_typ = typemap[loop_nests[0].index_variable.name]
+    if any(typemap[l.index_variable.name] != index_typ for l in loop_nests):
+        return None
+    if _get_carried_vars(parfor) or _get_carried_vars(inner):
+        return None
+
+    # split the statements before the nested parfor
+    dependent = {l.index_variable.name for l in parfor.loop_nests}
+    dependent.add(parfor.index_var.name)
+    hoisted = []
+    sunk = []
+    for stmt in pre_stmts:
+        uses = {v.name for v in stmt.list_vars()} - {stmt.target.name}
+        if dependent.isdisjoint(uses):
+            hoisted.append(stmt)
+        else:
+            dependent.add(stmt.target.name)
+            sunk.append(stmt)
+    for l in inner.loop_nests:
+        for v in (l.start, l.stop, l.step):
+            if isinstance(v, ir.Var) and v.name in dependent:
+                return None
+
+    parfor.init_block.body.extend(hoisted)
+    scope = block.scope
+    loc = parfor.loc
+    index_var = ir.Var(scope, mk_unique_var("$parfor_index_tuple_var"), loc)
+    typemap[index_var.name] = types.UniTuple(index_typ, len(loop_nests))
+    index_vars = [l.index_variable for l in loop_nests]
+    tuple_assign = ir.Assign(ir.Expr.build_tuple(index_vars, loc),
+                             index_var, loc)
+    first_block = inner.loop_body[min(inner.loop_body.keys())]
+    first_block.body = [tuple_assign] + sunk + first_block.body
+    parfor.loop_nests = loop_nests
+    parfor.loop_body = inner.loop_body
+    parfor.index_var = index_var
+    parfor.patterns.extend(inner.patterns)
+    parfor.no_sequential_lowering |= inner.no_sequential_lowering
+    if config.DEBUG_ARRAY_OPT_STATS:
+        print('Parallel for-loop #{} is collapsed into for-loop #{}.'.format(
+              inner.id, parfor.id))
+    return inner
+
+
+def get_tile_sizes(ndim, tile):
+    """Return the tile sizes of the loops of an ndim dimensional parfor as a
+    tuple, 0 for the loops that are not tiled, or None if it isn't tiled.
+
+    If tile is an integer, all the loops of multi-dimensional parfors are
+    split in tiles of that size.  If it is a tuple, it gives the tile sizes
+    of the innermost loops.  The iterations of a parfor are then run tile
+    by tile so that the data accessed by a tile stays in the cache.
+    """
+    if ndim < 2:
+        return None
+    if isinstance(tile, int):
+        tiles = (tile,) * ndim
+    else:
+        tiles = (0,) * max(ndim - len(tile), 0) + tuple(tile[-ndim:])
+    if not any(tiles):
+        return None
+    return tiles
+
+
 def dprint(*s):
     if config.DEBUG_ARRAY_OPT >= 1:
         print(*s)
@@ -91,6 +91,9 @@ def _lower_parfor_parallel(lowerer, parfor):
     parfor_redvars, parfor_reddict = numba.parfors.parfor.get_parfor_reductions(
         lowerer.func_ir, parfor, parfor.params, lowerer.fndesc.calltypes)
 
+    rows_per_thread = _get_rows_per_thread(
+        flags, parfor_redvars, parfor_reddict, lowerer.fndesc.typemap)
+
     # init reduction array allocation here.
     nredvars = len(parfor_redvars)
     redarrs = {}
@@ -110,6 +113,35 @@ def _lower_parfor_parallel(lowerer, parfor):
             if config.DEBUG_ARRAY_OPT:
                 print("redvar_typ", redvar_typ, redarrvar_typ, reddtype, types.DType(reddtype))
 
+            init_val, _, redop = parfor_reddict[parfor_redvars[i]]
+            if _get_partials_combine(redvar_typ, redop) is not None:
+                # The partial results are combined in parallel after the
+                # gufunc, so they can be allocated for the threads that
+                # actually run, initialized to the identity value.
+                alloc = _get_reduction_partials_helper('alloc')
+                alloc_node = pfbdr.bind_global_function(
+                    fobj=alloc,
+                    ftype=typingctx.resolve_value_type(alloc),
+                    args=(redvar_typ, reddtype, types.intp),
+                )
+                init_val_var = pfbdr.make_const_variable(
+                    cval=init_val,
+                    typ=reddtype,
+                    name="init_val",
+                )
+                rows_var = pfbdr.make_const_variable(
+                    cval=rows_per_thread,
+                    typ=types.intp,
+                    name="rows_per_thread",
+                )
+                redarrs[redvar.name] = pfbdr.assign(
+                    rhs=pfbdr.call(alloc_node,
+                                   args=[redvar, init_val_var, rows_var]),
+                    typ=redarrvar_typ,
+                    name="redarr",
+                )
+                continue
+
             # If this is reduction over an array,
             # the reduction array has just one added per-worker dimension.
             if isinstance(redvar_typ, types.npytypes.Array):
@@ -263,6 +295,14 @@ def _lower_parfor_parallel(lowerer, parfor):
     if config.DEBUG_ARRAY_OPT:
         print("gu_signature = ", gu_signature)
 
+    stats_region = None
+    if config.PARALLEL_STATS:
+        from numba.np.ufunc import parallel_stats
+        stats_region = parallel_stats.new_region(
+            'parfor', lowerer.fndesc.qualname, parfor.id, str(parfor.loc))
+        regions = lowerer.metadata.setdefault('parallel_stats_regions', {})
+        regions[stats_region] = tuple(parallel_stats._regions[stats_region])
+
     # call the func in parallel by wrapping it with ParallelGUFuncBuilder
     loop_ranges = [(l.start, l.stop, l.step) for l in parfor.loop_nests]
     if config.DEBUG_ARRAY_OPT:
@@ -282,11 +322,18 @@ def _lower_parfor_parallel(lowerer, parfor):
         parfor.init_block,
         index_var_typ,
         parfor.races,
-        exp_name_to_tuple_var)
+        exp_name_to_tuple_var,
+        *_get_schedule(flags),
+        serial_threshold=_get_serial_threshold(flags),
+        rows_per_thread=rows_per_thread,
+        stats_region=stats_region)
     if config.DEBUG_ARRAY_OPT:
         sys.stdout.flush()
 
     if nredvars > 0:
+        if stats_region is not None:
+            reduction_start = parallel_stats.emit_now(lowerer.builder)
+
         # Perform the final reduction across the reduction array created above.
         thread_count = get_thread_count()
         scope = parfor.init_block.scope
@@ -316,8 +363,26 @@ def _lower_parfor_parallel(lowerer, parfor):
                 print("res_print", res_print)
                 lowerer.lower_inst(res_print)
 
+            combine = _get_partials_combine(redvar_typ,
+                                            parfor_reddict[name][2])
+            if combine is not None:
+                # Combine the partial results into the first one in parallel
+                combine_node = pfbdr.bind_global_function(
+                    fobj=combine,
+                    ftype=typingctx.resolve_value_type(combine),
+                    args=(typemap[redarr.name],),
+                )
+                pfbdr.assign(
+                    rhs=pfbdr.call(combine_node, args=[redarr]),
+                    typ=types.none,
+                    name="combine_partials",
+                )
+                num_partials = 1
+            else:
+                num_partials = thread_count
+
             # For each element in the reduction array created above.
-            for j in range(thread_count):
+            for j in range(num_partials):
                 # Create index var to access that element.
                 index_var = pfbdr.make_const_variable(
                     cval=j, typ=types.uintp, name="index_var",
@@ -451,6 +516,11 @@ def _lower_parfor_parallel(lowerer, parfor):
         # Cleanup reduction variable
         for v in redarrs.values():
             lowerer.lower_inst(ir.Del(v.name, loc=loc))
+
+        if stats_region is not None:
+            parallel_stats.emit_record(lowerer.builder, stats_region,
+                                       parallel_stats.REDUCTION,
+                                       reduction_start)
     # Restore the original typemap of the function that was replaced temporarily at the
     # Beginning of this function.
     lowerer.fndesc.typemap = orig_typemap
@@ -462,6 +532,71 @@ def _lower_parfor_parallel(lowerer, parfor):
 lowering.lower_extensions[parfor.Parfor] = _lower_parfor_parallel
 
 
+# The minimum number of items of the per-thread partial results of an array
+# reduction for them to be combined by several threads.
+_PARALLEL_COMBINE_MIN_ITEMS = 1 << 14
+
+# The jitted helpers for the partial results of array reductions, created
+# lazily by _get_reduction_partials_helper().
+_reduction_partials_helpers = {}
+
+
+def _get_reduction_partials_helper(name):
+    """
+    Return the jitted helper *name* for the per-row partial results of
+    array reductions: 'alloc' allocates them, 'combine_add' and
+    'combine_mul' combine them element-wise into the first one.
+    """
+    helpers = _reduction_partials_helpers
+    if not helpers:
+        from numba.core.decorators import njit
+        from numba.misc.special import prange
+        from numba.np.ufunc.parallel import get_num_threads
+
+        def alloc_reduction_partials(redvar, init_val, rows_per_thread):
+            num_rows = np.intp(get_num_threads()) * rows_per_thread
+            return np.full((num_rows,) + redvar.shape, init_val)
+
+        def make_combine(op):
+            def combine_reduction_partials(partials):
+                flat = partials.reshape((partials.shape[0], -1))
+                num_partials, size = flat.shape
+                if size < _PARALLEL_COMBINE_MIN_ITEMS:
+                    for k in range(size):
+                        for j in range(1, num_partials):
+                            flat[0, k] = op(flat[0, k], flat[j, k])
+                else:
+                    for k in prange(size):
+                        for j in range(1, num_partials):
+                            flat[0, k] = op(flat[0, k], flat[j, k])
+            return njit(parallel=True)(combine_reduction_partials)
+
+        helpers['alloc'] = njit(alloc_reduction_partials)
+        helpers['combine_add'] = make_combine(operator.add)
+        helpers['combine_mul'] = make_combine(operator.mul)
+    return helpers[name]
+
+
+def _get_partials_combine(redvar_typ, redop):
+    """
+    Return the jitted function combining in parallel the per-thread partial
+    results of a reduction of type *redvar_typ* with the in-place operator
+    *redop*, or None if they are combined serially by the reduction nodes.
+    """
+    if not isinstance(redvar_typ, types.npytypes.Array):
+        return None
+    # As in the serial combine, subtractions and divisions of the reduction
+    # variable accumulate into partial results that are added or multiplied.
+    # Floor divisions are left to the serial combine, which applies the
+    # partial results one at a time: dividing by their product instead
+    # rounds differently for negative and inexact quotients.
+    if redop in (operator.iadd, operator.isub):
+        return _get_reduction_partials_helper('combine_add')
+    if redop in (operator.imul, operator.itruediv):
+        return _get_reduction_partials_helper('combine_mul')
+    return None
+
+
 def _create_shape_signature(
         get_shape_classes,
         num_inputs,
@@ -806,6 +941,48 @@ def to_scalar_from_0d(x):
             return x.dtype
     return x
 
+def _get_schedule(flags):
+    """
+    Return the (schedule, chunksize) of the parfors compiled with *flags*,
+    where schedule is None for the default static schedule without chunks,
+    and is otherwise the name of the kind of chunked schedule.
+    """
+    options = flags.auto_parallel
+    if options.schedule == 'static' and not options.chunksize:
+        return None, 0
+    return options.schedule, options.chunksize
+
+# The number of schedule rows per thread of parfors with the default static
+# schedule, so that the threading layer has rows left to balance between the
+# threads (e.g. by work stealing in the workqueue layer) when the cost of
+# the iterations is uneven.  Chunked schedules balance the load themselves.
+_STATIC_ROWS_PER_THREAD = 4
+
+def _get_rows_per_thread(flags, redvars, reddict, typemap):
+    """
+    Return the number of schedule rows per thread of a parfor compiled with
+    *flags*, with reduction variables *redvars*.  Each row has its own
+    partial results of the reductions, so that several rows are only used
+    if they are all combined by _get_partials_combine(): the other partial
+    results are combined by code unrolled for each of them.
+    """
+    if _get_schedule(flags)[0] is not None:
+        return 1
+    for name in redvars:
+        if _get_partials_combine(typemap[name], reddict[name][2]) is None:
+            return 1
+    return _STATIC_ROWS_PER_THREAD
+
+def _get_serial_threshold(flags):
+    """
+    Return the number of iterations below which the parfors compiled with
+    *flags* are run serially, 0 if they are always run in parallel.
+    """
+    threshold = flags.auto_parallel.serial_threshold
+    if threshold is None:
+        threshold = config.PARFOR_SERIAL_THRESHOLD
+    return min(max(threshold, 0), 2 ** 31 - 1)
+
 def _create_gufunc_for_parfor_body(
         lowerer,
         parfor,
@@ -1115,25 +1292,53 @@ def _create_gufunc_for_parfor_body(
             gufunc_txt += "    " + param_dict[var] + \
                  "=np.copy(" + param_dict[arr] + ")\n"
 
+    # With a chunked schedule, the loops below run each chunk of the
+    # iteration space claimed by the thread, whose bounds are written to
+    # the start of sched.
+    schedule, _ = _get_schedule(flags)
+    loop_indent = 0
+    if schedule is not None:
+        from numba.np.ufunc.parallel import _parfor_next_chunk
+        globls["__numba_parfor_next_chunk"] = _parfor_next_chunk
+        gufunc_txt += ("    while __numba_parfor_next_chunk(sched, " +
+                       str(parfor_dim) + "):\n")
+        loop_indent = 1
+
     # For each dimension of the parfor, create a for loop in the generated gufunc function.
     # Iterate across the proper values extracted from the schedule.
     # The form of the schedule is start_dim0, start_dim1, ..., start_dimN, end_dim0,
     # end_dim1, ..., end_dimN
+    # With tiling, the loops of the tiled dimensions iterate over a tile and
+    # are nested, along with the loops of the dimensions inside them, in
+    # loops over the starts of the tiles.
+    tiles = parfor.tiles or (0,) * parfor_dim
+    tiled_dims = [d for d in range(parfor_dim) if tiles[d]]
+    loops = []
     for eachdim in range(parfor_dim):
-        for indent in range(eachdim + 1):
-            gufunc_txt += "    "
         sched_dim = eachdim
-        gufunc_txt += ("for " +
-                       legal_loop_indices[eachdim] +
-                       " in range(sched[" +
-                       str(sched_dim) +
-                       "], sched[" +
-                       str(sched_dim +
-                           parfor_dim) +
-                       "] + np.uint8(1)):\n")
+        start = "sched[%d]" % sched_dim
+        stop = "sched[%d] + np.uint8(1)" % (sched_dim + parfor_dim)
+        if tiled_dims and eachdim == tiled_dims[0]:
+            for tiled_dim in tiled_dims:
+                loops.append(("__numba_parfor_tile_%d" % tiled_dim,
+                              "sched[%d]" % tiled_dim,
+                              "sched[%d] + np.uint8(1)" % (tiled_dim + parfor_dim),
+                              "np.uint32(%d)" % tiles[tiled_dim]))
+        if tiles[eachdim]:
+            tile_index = "__numba_parfor_tile_%d" % eachdim
+            start = tile_index
+            stop = "min(%s + np.uint32(%d), %s)" % (tile_index, tiles[eachdim],
+                                                   stop)
+        loops.append((legal_loop_indices[eachdim], start, stop))
+    for depth, loop in enumerate(loops):
+        for indent in range(loop_indent + depth + 1):
+            gufunc_txt += "    "
+        gufunc_txt += ("for " + loop[0] + " in range(" +
+                       ", ".join(loop[1:]) + "):\n")
+    loop_indent += len(tiled_dims)
 
     if config.DEBUG_ARRAY_OPT_RUNTIME:
-        for indent in range(parfor_dim + 1):
+        for indent in range(loop_indent + parfor_dim + 1):
             gufunc_txt += "    "
         gufunc_txt += "print("
         for eachdim in range(parfor_dim):
@@ -1142,7 +1347,7 @@ def _create_gufunc_for_parfor_body(
 
     # Add the sentinel assignment so that we can find the loop body position
     # in the IR.
-    for indent in range(parfor_dim + 1):
+    for indent in range(loop_indent + parfor_dim + 1):
         gufunc_txt += "    "
     gufunc_txt += sentinel_name + " = 0\n"
     # Add assignments of reduction variables (for returning the value)
@@ -1369,16 +1574,28 @@ def replace_var_with_array(vars, loop_body, typemap, calltypes):
 
 def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr_arg_types,
                          loop_ranges, redvars, reddict, redarrdict, init_block, index_var_typ, races,
-                         exp_name_to_tuple_var):
+                         exp_name_to_tuple_var, schedule=None, chunksize=0,
+                         serial_threshold=0, rows_per_thread=1,
+                         stats_region=None):
     '''
     Adds the call to the gufunc function from the main function.
+    If *schedule* isn't None, the gufunc is run with a chunked schedule
+    of that kind (see _get_schedule()), otherwise the iterations are split
+    into *rows_per_thread* schedule rows per thread.  If the loop nest has
+    fewer than *serial_threshold* iterations, the gufunc is run by the
+    calling thread.
+    If *stats_region* isn't None, the timings of the gufunc are recorded
+    for that parallel_stats region.
     '''
     context = lowerer.context
     builder = lowerer.builder
 
     from numba.np.ufunc.parallel import (build_gufunc_wrapper,
                            get_thread_count,
-                           _launch_threads)
+                           _launch_threads,
+                           SCHEDULE_KINDS,
+                           SCHED_STATE_SIZE)
+    from numba.np.ufunc import parallel_stats
 
     if config.DEBUG_ARRAY_OPT:
         print("make_parallel_loop")
@@ -1398,7 +1615,8 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     _launch_threads()
 
     info = build_gufunc_wrapper(llvm_func, cres, sin, sout,
-                                cache=False, is_parfors=True)
+                                cache=False, is_parfors=True,
+                                stats_region=stats_region)
     wrapper_name = info.name
     cres.library._ensure_finalized()
 
@@ -1479,7 +1697,13 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
         builder.store(stop, builder.gep(dim_stops,
                                         [context.get_constant(types.uintp, i)]))
 
-    sched_size = get_thread_count() * num_dim * 2
+    # Rows of chunked schedules also hold the shared state and the index
+    # of the next static chunk
+    if schedule is None:
+        sched_row_size = num_dim * 2
+    else:
+        sched_row_size = num_dim * 2 + 2
+    sched_size = get_thread_count() * rows_per_thread * sched_row_size
     sched = cgutils.alloca_once(
         builder, sched_type, size=context.get_constant(
             types.uintp, sched_size), name="sched")
@@ -1506,12 +1730,72 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
                                                   ("Invalid number of threads. "
                                                    "This likely indicates a bug in Numba.",))
 
-    builder.call(
-        do_scheduling, [
-            context.get_constant(
-                types.uintp, num_dim), dim_starts, dim_stops, num_threads,
-            sched, context.get_constant(
-                    types.intp, debug_flag)])
+    # The outer dimension of the gufunc
+    num_rows = builder.mul(num_threads, num_threads.type(rows_per_thread))
+
+    if serial_threshold > 0:
+        # Count the iterations, capped at the threshold so as not to overflow
+        threshold = context.get_constant(types.uintp, serial_threshold)
+        count = one
+        for i in range(num_dim):
+            index = context.get_constant(types.uintp, i)
+            start = builder.load(builder.gep(dim_starts, [index]))
+            stop = builder.load(builder.gep(dim_stops, [index]))
+            if index_var_typ.signed:
+                empty = builder.icmp_signed('>', start, stop)
+            else:
+                empty = builder.icmp_unsigned('>', start, stop)
+            length = builder.add(builder.sub(stop, start), one)
+            length = builder.select(empty, zero, length)
+            length = builder.select(
+                builder.icmp_unsigned('<', length, threshold),
+                length, threshold)
+            count = builder.mul(count, length)
+            count = builder.select(
+                builder.icmp_unsigned('<', count, threshold),
+                count, threshold)
+        # Scheduling a single thread makes the gufunc wrapper run the
+        # gufunc in the calling thread
+        serial = builder.icmp_unsigned('<', count, threshold)
+        num_threads = builder.select(serial, num_threads.type(1),
+                                     num_threads)
+        num_rows = builder.select(serial, num_rows.type(1), num_rows)
+
+    if stats_region is not None:
+        sched_start = parallel_stats.emit_now(builder)
+
+    if schedule is None:
+        builder.call(
+            do_scheduling, [
+                context.get_constant(
+                    types.uintp, num_dim), dim_starts, dim_stops, num_rows,
+                sched, context.get_constant(
+                        types.intp, debug_flag)])
+    else:
+        sched_state = cgutils.alloca_once(
+            builder, intp_t, size=context.get_constant(
+                types.uintp, SCHED_STATE_SIZE), name="sched_state")
+        chunked_fnty = lc.Type.function(
+            lc.Type.void(), [uintp_t, sched_ptr_type, sched_ptr_type, uintp_t,
+                             sched_ptr_type, intp_t, intp_t, intp_ptr_t,
+                             intp_t])
+        if index_var_typ.signed:
+            name = "do_scheduling_chunked_signed"
+        else:
+            name = "do_scheduling_chunked_unsigned"
+        do_scheduling_chunked = builder.module.get_or_insert_function(
+            chunked_fnty, name=name)
+        builder.call(
+            do_scheduling_chunked, [
+                context.get_constant(types.uintp, num_dim), dim_starts,
+                dim_stops, num_threads, sched,
+                context.get_constant(types.intp, SCHEDULE_KINDS[schedule]),
+                context.get_constant(types.intp, chunksize), sched_state,
+                context.get_constant(types.intp, debug_flag)])
+
+    if stats_region is not None:
+        parallel_stats.emit_record(builder, stats_region,
+                                   parallel_stats.SCHEDULE, sched_start)
 
     # Get the LLVM vars for the Numba IR reduction array vars.
     redarrs = [lowerer.loadvar(redarrdict[x].name) for x in redvars]
@@ -1520,15 +1804,15 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     ninouts = len(expr_args) - nredvars
 
     if config.DEBUG_ARRAY_OPT:
-        for i in range(get_thread_count()):
+        for i in range(get_thread_count() * rows_per_thread):
             cgutils.printf(builder, "sched[" + str(i) + "] = ")
-            for j in range(num_dim * 2):
+            for j in range(sched_row_size):
                 cgutils.printf(
                     builder, "%d ", builder.load(
                         builder.gep(
                             sched, [
                                 context.get_constant(
-                                    types.intp, i * num_dim * 2 + j)])))
+                                    types.intp, i * sched_row_size + j)])))
             cgutils.printf(builder, "\n")
 
     def load_potential_tuple_var(x):
@@ -1618,7 +1902,8 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     sig_dim_dict = {}
     occurances = []
     occurances = [sched_sig[0]]
-    sig_dim_dict[sched_sig[0]] = context.get_constant(types.intp, 2 * num_dim)
+    sig_dim_dict[sched_sig[0]] = context.get_constant(types.intp,
+                                                      sched_row_size)
     assert len(expr_args) == len(all_args)
     assert len(expr_args) == len(expr_arg_types)
     assert len(expr_args) == len(sin + sout)
@@ -1654,8 +1939,8 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     # the size of individual shape variables.
     nshapes = len(sig_dim_dict) + 1
     shapes = cgutils.alloca_once(builder, intp_t, size=nshapes, name="pshape")
-    # For now, outer loop size is the same as number of threads
-    builder.store(num_threads, shapes)
+    # The outer loop size is the number of schedule rows
+    builder.store(num_rows, shapes)
     # Individual shape variables go next
     i = 1
     for dim_sym in occurances:
@@ -1675,8 +1960,9 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     steps = cgutils.alloca_once(
         builder, intp_t, size=context.get_constant(
             types.intp, num_steps), name="psteps")
-    # First goes the step size for sched, which is 2 * num_dim
-    builder.store(context.get_constant(types.intp, 2 * num_dim * sizeof_intp),
+    # First goes the step size for sched, which is the size of its rows
+    builder.store(context.get_constant(types.intp,
+                                       sched_row_size * sizeof_intp),
                   steps)
     # The steps for all others are 0, except for reduction results.
     for i in range(num_args):
@@ -5,6 +5,7 @@ import numpy as np
 
 from numba.tests.support import captured_stdout
 from numba import vectorize, guvectorize
+from numba.np.ufunc.parallel import _get_thread_id
 import unittest
 
 
@@ -74,6 +75,36 @@ class TestParUfuncIssues(unittest.TestCase):
             self.assertEqual(got_output, expected_output)
             np.testing.assert_equal(got, 2 * acopy)
 
+    def test_serial_threshold(self):
+        def thread_id(x):
+            return _get_thread_id()
+
+        sig = ['int64(float64)']
+        fnv = vectorize(sig, target='parallel',
+                        serial_threshold=1000)(thread_id)
+        # Below the threshold, the calling thread does all the work
+        self.assertEqual(len(set(fnv(np.zeros(999)))), 1)
+        # Above the threshold, the result is still correct
+        a = np.arange(10 ** 5, dtype=np.float64)
+        add = vectorize(['float64(float64)'], target='parallel',
+                        serial_threshold=1000)(lambda x: x + 1)
+        np.testing.assert_equal(add(a[:10]), a[:10] + 1)
+        np.testing.assert_equal(add(a), a + 1)
+
+        with self.assertRaises(ValueError) as raises:
+            vectorize(sig, target='parallel', serial_threshold=-1)(thread_id)
+        self.assertIn("Expected serial_threshold to be a non-negative "
+                      "integer", str(raises.exception))
+
+    def test_chunksize(self):
+        def thread_id(x):
+            return _get_thread_id()
+
+        fnv = vectorize(['int64(float64)'], target='parallel',
+                        chunksize=500)(thread_id)
+        # At most one thread per chunk
+        self.assertLessEqual(len(set(fnv(np.zeros(1000)))), 2)
+        self.assertEqual(len(set(fnv(np.zeros(500)))), 1)
 
 
 class TestParGUfuncIssues(unittest.TestCase):
@@ -6,7 +6,7 @@ import sys
 import threading
 
 import unittest
-from numba.tests.support import TestCase
+from numba.tests.support import TestCase, temp_directory
 
 
 def run_cmd(cmdline, env=os.environ, timeout=60):
@@ -43,6 +43,16 @@ class TestCLi(TestCase):
         o, _ = run_cmd(cmdline)
         self.assertIn("System info", o)
 
+    def test_cache_gc(self):
+        tempdir = temp_directory('test_cli_cache_gc')
+        orphan = os.path.join(tempdir, 'orphan.f-1.py36.1.nbc')
+        with open(orphan, 'wb') as f:
+            f.write(b'junk')
+        cmdline = [sys.executable, "-m", "numba", "--cache-gc", tempdir]
+        o, _ = run_cmd(cmdline)
+        self.assertIn("Removed 1 file(s)", o)
+        self.assertFalse(os.path.exists(orphan))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+
+import numba
+from numba import njit
+from numba.core import compile_profiler
+from numba.core.extending import register_jitable
+from numba.tests.support import TestCase, temp_directory
+import unittest
+
+
+@register_jitable
+def inner(x):
+    return x * 2
+
+
+def outer(x):
+    return inner(x) + 1
+
+
+class TestCompileProfiler(TestCase):
+
+    def test_compile_profile(self):
+        cfunc = njit(outer)
+        with numba.compile_profile() as profile:
+            cfunc(1)
+        functions = [e for e in profile.events if e['cat'] == 'function']
+        passes = [e for e in profile.events if e['cat'] == 'pass']
+        names = [e['name'] for e in functions]
+        outer_name = '%s.outer(int64)' % (__name__,)
+        self.assertIn(outer_name, names)
+        # The nested compilation of the register_jitable function
+        inner_name = '%s.inner(int64)' % (__name__,)
+        self.assertIn(inner_name, names)
+        outer_event = functions[names.index(outer_name)]
+        inner_event = functions[names.index(inner_name)]
+        self.assertGreaterEqual(inner_event['ts'], outer_event['ts'])
+        self.assertLessEqual(inner_event['ts'] + inner_event['dur'],
+                             outer_event['ts'] + outer_event['dur'])
+        # Passes of both functions were recorded
+        pass_functions = {e['args']['function'] for e in passes}
+        self.assertIn('outer', pass_functions)
+        self.assertIn('inner', pass_functions)
+        self.assertIn('NopythonTypeInference',
+                      {e['name'] for e in passes})
+        if compile_profiler.resource is not None:
+            self.assertGreater(outer_event['args']['peak_rss'], 0)
+        summary = dict((name, (time, count))
+                       for name, time, count in profile.summary())
+        self.assertEqual(summary[outer_name][1], 1)
+        self.assertEqual(summary[outer_name][0], outer_event['dur'] / 1e6)
+
+    def test_compile_profile_inactive(self):
+        with numba.compile_profile() as profile:
+            pass
+        njit(outer)(1)
+        self.assertEqual(profile.events, [])
+
+    def test_compile_profile_write(self):
+        path = os.path.join(temp_directory(self.__class__.__name__),
+                            'profile.json')
+        with numba.compile_profile(path) as profile:
+            njit(outer)(1)
+        with open(path) as f:
+            trace = json.load(f)
+        self.assertEqual(trace['traceEvents'], profile.events)
+        for event in trace['traceEvents']:
+            self.assertEqual(event['ph'], 'X')
+
+    def test_environment_variable(self):
+        path = os.path.join(temp_directory(self.__class__.__name__),
+                            'env_profile.json')
+        code = """if 1:
+            from numba import njit
+            njit(lambda x: x + 1)(1)
+            """
+        env = dict(os.environ, NUMBA_COMPILE_PROFILE=path)
+        subprocess.check_call([sys.executable, '-c', code], env=env)
+        with open(path) as f:
+            trace = json.load(f)
+        self.assertTrue(any(event['cat'] == 'function'
+                            for event in trace['traceEvents']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
+import threading
 import unittest
+
+from numba import njit, types
 from numba.core.compiler_lock import (
     global_compiler_lock,
     require_global_compiler_lock,
@@ -18,6 +21,65 @@ class TestCompilerLock(TestCase):
 
         func()
 
+    def run_while_locked(self, func, timeout=60):
+        """
+        Run *func* in a thread while another thread holds the compiler lock,
+        and return whether it finished before the lock was released.
+        """
+        held = threading.Event()
+        release = threading.Event()
+        done = threading.Event()
+        results = []
+
+        def hold_lock():
+            with global_compiler_lock:
+                held.set()
+                release.wait()
+
+        def run():
+            held.wait()
+            results.append(func())
+            done.set()
+
+        holder = threading.Thread(target=hold_lock)
+        worker = threading.Thread(target=run)
+        holder.start()
+        worker.start()
+        try:
+            finished = done.wait(timeout)
+        finally:
+            release.set()
+            holder.join()
+            worker.join()
+        return finished, results[0]
+
+    def test_existing_overload_without_lock(self):
+        # The explicit compilation of an existing overload doesn't wait
+        # for the compiler lock held by another thread
+        @njit
+        def foo(x):
+            return x + 1
+
+        foo.compile((types.intp,))
+        finished, _ = self.run_while_locked(
+            lambda: foo.compile((types.intp,)))
+        self.assertTrue(finished)
+        self.assertEqual(foo(41), 42)
+
+    def test_new_overload_waits_for_lock(self):
+        # The compiler pipeline is serialized, so a new specialization
+        # waits for the compilation of another thread.  This is a known
+        # limitation (see compiler_lock.py): update this test if the lock
+        # gets split.
+        @njit
+        def foo(x):
+            return x + 1
+
+        finished, _ = self.run_while_locked(
+            lambda: foo.compile((types.intp,)), timeout=1)
+        self.assertFalse(finished)
+        self.assertEqual(foo(41), 42)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1039,6 +1039,69 @@ class TestTypedDict(MemoryLeakMixin, TestCase):
     def test_str(self):
         self.check_stringify(str)
 
+    def test_from_arrays(self):
+        keys = np.arange(10, dtype=np.int32)
+        values = np.arange(10, 20, dtype=np.float64)
+        d = Dict.from_arrays(keys, values)
+        self.assertEqual(typeof(d), types.DictType(int32, float64))
+        self.assertEqual(dict(d), dict(zip(keys.tolist(), values.tolist())))
+
+        with self.assertRaises(ValueError) as raises:
+            Dict.from_arrays(keys, values[:5])
+        self.assertIn("same length", str(raises.exception))
+        with self.assertRaises(ValueError) as raises:
+            Dict.from_arrays(keys.reshape(2, 5), values.reshape(2, 5))
+        self.assertIn("1-dimensional", str(raises.exception))
+
+    def test_update_arrays(self):
+        d = Dict.empty(int64, float64)
+        d[3] = 1.5
+        # Duplicated keys keep the last value
+        d.update_arrays(np.array([1, 2, 3, 1], dtype=np.int64),
+                        np.array([1., 2., 3., 4.]))
+        self.assertEqual(dict(d), {3: 3., 1: 4., 2: 2.})
+        self.assertEqual(list(d.keys()), [3, 1, 2])
+
+        # The types of an untyped dict are taken from the arrays
+        d = Dict()
+        d.update_arrays(np.arange(3, dtype=np.int64),
+                        np.arange(3, dtype=np.float32))
+        self.assertEqual(typeof(d), types.DictType(int64, float32))
+        self.assertEqual(dict(d), {0: 0., 1: 1., 2: 2.})
+
+    def test_get_many(self):
+        d = Dict.from_arrays(np.arange(5, dtype=np.int64),
+                             np.arange(0, 50, 10, dtype=np.int64))
+        got = d.get_many(np.array([4, 7, 0, -1]), -1)
+        self.assertEqual(got.dtype, np.dtype(np.int64))
+        np.testing.assert_equal(got, [40, -1, 0, -1])
+        self.assertEqual(len(d.get_many(np.empty(0, np.int64), 0)), 0)
+
+        # The value type of an untyped dict isn't known
+        with self.assertRaises(TypeError) as raises:
+            Dict().get_many(np.array([1]), 0)
+        self.assertIn("get_many() needs the key and value types",
+                      str(raises.exception))
+
+    def test_to_arrays(self):
+        keys = np.array([5, 1, 3], dtype=np.int32)
+        values = np.array([0.5, 0.1, 0.3], dtype=np.float32)
+        keys_got, values_got = Dict.from_arrays(keys, values).to_arrays()
+        self.assertEqual(keys_got.dtype, keys.dtype)
+        self.assertEqual(values_got.dtype, values.dtype)
+        np.testing.assert_equal(keys_got, keys)
+        np.testing.assert_equal(values_got, values)
+
+        keys_got, values_got = Dict.empty(int32, float32).to_arrays()
+        self.assertEqual(len(keys_got), 0)
+        self.assertEqual(len(values_got), 0)
+
+        # Neither are the types of an untyped dict
+        with self.assertRaises(TypeError) as raises:
+            Dict().to_arrays()
+        self.assertIn("to_arrays() needs the key and value types",
+                      str(raises.exception))
+
 
 class TestDictRefctTypes(MemoryLeakMixin, TestCase):
 
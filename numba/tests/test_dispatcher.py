@@ -10,26 +10,30 @@ import warnings
 import inspect
 import pickle
 import weakref
+from collections import namedtuple
 from itertools import chain
 from io import StringIO
 
 import numpy as np
 
 from numba import jit, generated_jit, typeof
-from numba.core import types, errors, codegen
+from numba.core import types, errors, codegen, caching
 from numba import _dispatcher
 from numba.core.compiler import compile_isolated
+from numba.core.compiler_lock import global_compiler_lock
 from numba.core.errors import NumbaWarning
 from numba.tests.support import (TestCase, temp_directory, import_dynamic,
-                                 override_env_config, capture_cache_log,
-                                 captured_stdout)
+                                 override_env_config, override_config,
+                                 capture_cache_log, captured_stdout)
 from numba.np.numpy_support import as_dtype
-from numba.core.caching import _UserWideCacheLocator
+from numba.core.caching import (_UserWideCacheLocator,
+                                ConsolidatedCacheFile)
 from numba.core.dispatcher import Dispatcher
 from numba.tests.support import skip_parfors_unsupported, needs_lapack
 
 import llvmlite.binding as ll
 import unittest
+import unittest.mock
 from numba.parfors import parfor
 
 try:
@@ -61,6 +65,9 @@ def addsub_defaults(x, y=2, z=3):
     return x - y + z
 
 
+Point = namedtuple('Point', 'x y')
+
+
 def star_defaults(x, y=2, *z):
     return x, y, z
 
@@ -190,6 +197,51 @@ class TestDispatcher(BaseTest):
             # Implicit conversion of complex to int disallowed
             c_add(12.3, 45.6j)
 
+    def test_fingerprinted_args(self):
+        # Named tuples and jitclass instances are typed from their type
+        # fingerprint once they have been seen, without calling back into
+        # typeof_pyval().
+        from collections import namedtuple
+        from unittest import mock
+        from numba.experimental import jitclass
+
+        Point = namedtuple('Point', ('x', 'y'))
+        Rect = namedtuple('Rect', ('x', 'y'))
+
+        @jitclass([('x', types.int64)])
+        class IntBox(object):
+            def __init__(self, x):
+                self.x = x
+
+        @jit(nopython=True)
+        def first(a):
+            return a[0]
+
+        @jit(nopython=True)
+        def getx(a):
+            return a.x
+
+        args = [(first, Point(1, 2)), (first, Rect(3.5, 4)),
+                (first, Point(np.arange(3), (1, 2))),
+                (getx, IntBox(5))]
+        for cfunc, arg in args:
+            cfunc(arg)
+        for cfunc, arg in args:
+            with mock.patch.object(cfunc, 'typeof_pyval',
+                                   side_effect=AssertionError):
+                self.assertPreciseEqual(cfunc(arg), cfunc.py_func(arg))
+        self.assertEqual(len(first.overloads), 3)
+        self.assertEqual(len(getx.overloads), 1)
+
+    def test_dispatch_overhead_benchmark(self):
+        from numba.misc.dispatch_overhead import (measure_dispatch_overhead,
+                                                  _arguments)
+        result = measure_dispatch_overhead(number=10, repeat=1)
+        self.assertEqual(list(result), [kind for kind, _ in _arguments()])
+        for times in result.values():
+            self.assertGreater(times['jitted'], 0)
+            self.assertGreater(times['python'], 0)
+
     def test_ambiguous_new_version(self):
         """Test compiling new version in an ambiguous case
         """
@@ -932,6 +984,36 @@ class TestDispatcherMethods(TestCase):
         result = foo.get_annotation_info()
         self.assertEqual(expected, result)
 
+    def test_inspect_vectorization(self):
+        @jit(nopython=True)
+        def foo(a, b):
+            for i in range(a.size):
+                a[i] += b[i]
+            for i in range(a.size):
+                a[i] = a[i] // b[i]
+
+        foo(np.ones(100), np.ones(100))
+        foo(np.ones(100, np.int64), np.ones(100, np.int64))
+        first_line = foo.py_func.__code__.co_firstlineno
+
+        reports = foo.inspect_vectorization()
+        self.assertEqual(set(reports), set(foo.signatures))
+
+        report = foo.inspect_vectorization(foo.signatures[1])
+        self.assertEqual([loop.line - first_line for loop in report.loops],
+                         [2, 4])
+        [add_loop, div_loop] = report.loops
+        self.assertTrue(add_loop.vectorized)
+        self.assertEqual(add_loop.source, "for i in range(a.size):")
+        # The integer division can raise ZeroDivisionError
+        self.assertFalse(div_loop.vectorized)
+        self.assertIn('exceptions', [r for r, _ in div_loop.reasons])
+        self.assertIn("Loop at line %d: NOT vectorized" % div_loop.line,
+                      str(report))
+
+        # The overloads are unchanged
+        self.assertEqual(foo.signatures, list(reports))
+
     def test_issue_with_array_layout_conflict(self):
         """
         This test an issue with the dispatcher when an array that is both
@@ -1104,6 +1186,74 @@ class TestCache(BaseCacheUsecasesTest):
         # Check the code runs ok from another process
         self.run_in_separate_process()
 
+    def test_fetch_overload_without_lock(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        sig = (types.float64, types.intp)
+        # The codegen isn't known before a load with the lock held
+        self.assertIsNone(f._cache.fetch_overload(sig, f.targetctx))
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        # The disk cache is then read while another thread compiles
+        held = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def hold_lock():
+            with global_compiler_lock:
+                held.set()
+                release.wait()
+
+        def fetch():
+            held.wait()
+            results.append(f._cache.fetch_overload(sig, f.targetctx))
+
+        holder = threading.Thread(target=hold_lock)
+        worker = threading.Thread(target=fetch)
+        holder.start()
+        worker.start()
+        try:
+            worker.join(60)
+            self.assertFalse(worker.is_alive())
+        finally:
+            release.set()
+            holder.join()
+            worker.join()
+        self.assertIsNotNone(results[0])
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 2, 0)
+
+    @skip_parfors_unsupported
+    def test_parallel_stats_cached(self):
+        ary = np.ones(10)
+        with override_env_config('NUMBA_PARALLEL_STATS', '1'):
+            mod = self.import_module()
+            f = mod.parfor_usecase
+            self.assertPreciseEqual(f(ary), ary * ary + ary)
+
+        # The regions of the instrumented overload are loaded with it
+        mod = self.import_module()
+        f = mod.parfor_usecase
+        self.assertPreciseEqual(f(ary), ary * ary + ary)
+        self.check_hits(f, 1, 0)
+        [stats] = f.parallel_stats(f.signatures[0])
+        self.assertEqual(stats.runs, 1)
+
+        # An overload cached without instrumentation
+        f.recompile()
+        mod = self.import_module()
+        f = mod.parfor_usecase
+        self.assertPreciseEqual(f(ary), ary * ary + ary)
+        self.check_hits(f, 1, 0)
+        with self.assertRaises(ValueError) as raises:
+            f.parallel_stats(f.signatures[0])
+        self.assertIn("loaded from the cache", str(raises.exception))
+
     def test_caching_nrt_pruned(self):
         self.check_pycache(0)
         mod = self.import_module()
@@ -1445,6 +1595,477 @@ class TestSequentialParForsCache(BaseCacheUsecasesTest):
         self.check_pycache(2)  # 1 index, 1 data
 
 
+class TestConsolidatedCache(BaseCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def setUp(self):
+        super(TestConsolidatedCache, self).setUp()
+        # Use an env override so that it is inherited by subprocesses
+        cm = override_env_config('NUMBA_CACHE_BACKEND', 'consolidated')
+        cm.__enter__()
+        self.addCleanup(cm.__exit__, None, None, None)
+
+    def test_caching(self):
+        self.check_pycache(0)
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 0, 2)
+        f = mod.add_objmode_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 0, 1)
+        # All entries go into a single store
+        self.check_pycache(1)
+        [store] = self.cache_contents()
+        self.assertTrue(store.endswith('.nbs'))
+
+        mod2 = self.import_module()
+        f = mod2.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 2, 0)
+        f = mod2.add_objmode_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 1, 0)
+        self.check_pycache(1)
+
+        self.run_in_separate_process()
+
+    def test_cache_invalidate(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        # This should change the functions' results
+        with open(self.modfile, "a") as f:
+            f.write("\nZ = 10\n")
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+        self.check_hits(f, 0, 1)
+
+    def test_recompile(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        mod.Z = 10
+        self.assertPreciseEqual(f(2, 3), 6)
+        f.recompile()
+        self.assertPreciseEqual(f(2, 3), 15)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+
+    def test_object_code_not_copied(self):
+        cache_file = ConsolidatedCacheFile(self.tempdir, 'fn', 'stamp')
+        payload = codegen.SerializedObjectCode(
+            ('lib', 'object', (b'object code', b'bitcode')))
+        cache_file.save('key', (payload, 42))
+        cache_file.save('other', 'data')
+        # Other tuples are pickled as usual, even with the same layout
+        for data in [('x', 'object', 3),
+                     ('lib', 'object', (b'object code', b'bitcode'))]:
+            cache_file.save('tuple', data)
+            self.assertEqual(cache_file.load('tuple'), data)
+        self.assertIsNone(cache_file.load('missing'))
+        (name, kind, (obj, bitcode)), val = cache_file.load('key')
+        self.assertEqual((name, kind, bitcode, val),
+                         ('lib', 'object', b'bitcode', 42))
+        # The object code is a view over the mapped store
+        self.assertIsInstance(obj, memoryview)
+        self.assertEqual(bytes(obj), b'object code')
+        self.assertEqual(cache_file.load('other'), 'data')
+
+        # A stale source stamp or a flush hides the entries
+        stale = ConsolidatedCacheFile(self.tempdir, 'fn', 'new stamp')
+        self.assertIsNone(stale.load('other'))
+        cache_file.flush()
+        self.assertIsNone(cache_file.load('other'))
+
+
+class TestOverloadCache(TestCase):
+    # Spawns subprocesses and changes the environment
+    _numba_parallel_test_ = False
+
+    def run_median(self, cache_dir):
+        code = """if 1:
+            import numpy as np
+            from numba import njit
+
+            @njit
+            def f(a):
+                return np.median(a)
+
+            assert f(np.arange(5.0)) == 2.0
+            """
+        env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir,
+                   NUMBA_CACHE_OVERLOADS='1', NUMBA_DEBUG_CACHE='1')
+        popen = subprocess.Popen([sys.executable, "-c", code], env=env,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = popen.communicate()
+        if popen.returncode != 0:
+            raise AssertionError("process failed with code %s: "
+                                 "stderr follows\n%s\n"
+                                 % (popen.returncode, err.decode()))
+        return out.decode()
+
+    def test_overload_cache(self):
+        cache_dir = temp_directory(self.__class__.__name__)
+        out = self.run_median(cache_dir)
+        self.assertIn("data saved to", out)
+        self.assertNotIn("data loaded from", out)
+        # Implementations are loaded by another process, and not recompiled
+        out = self.run_median(cache_dir)
+        self.assertIn("data loaded from", out)
+        self.assertNotIn("data saved to", out)
+
+    def test_closure_key(self):
+        def make_impl(value):
+            def impl(x):
+                return x + value
+            return impl
+
+        def closure_key(func):
+            return caching.OverloadCacheImpl(func).closure_key
+
+        self.assertEqual(closure_key(make_impl(types.int64)),
+                         closure_key(make_impl(types.int64)))
+        self.assertNotEqual(closure_key(make_impl(types.int64)),
+                            closure_key(make_impl(types.float64)))
+        self.assertNotEqual(closure_key(make_impl(1)),
+                            closure_key(make_impl(True)))
+        self.assertEqual(closure_key(make_impl((np.add, np.dtype('f8')))),
+                         closure_key(make_impl((np.add, np.dtype('f8')))))
+        # Values without a description stable across processes
+        self.assertIsNone(closure_key(make_impl(object())))
+        self.assertIsNone(closure_key(make_impl(lambda: None)))
+        self.assertIsNone(closure_key(make_impl(jit(dummy))))
+
+    def test_closure_key_namedtuple(self):
+        def make_impl(value):
+            def impl(x):
+                return x + value
+            return impl
+
+        def closure_key(func):
+            return caching.OverloadCacheImpl(func).closure_key
+
+        # The type's name only gives the __name__ of the class
+        LocalPoint = namedtuple('Point', 'x y')
+        point_type = typeof(Point(1, 2))
+        local_type = typeof(LocalPoint(1, 2))
+        self.assertEqual(str(point_type), str(local_type))
+        self.assertEqual(closure_key(make_impl(point_type)),
+                         closure_key(make_impl(typeof(Point(3, 4)))))
+        # Classes that can't be found by their qualified name are refused
+        self.assertIsNone(closure_key(make_impl(local_type)))
+
+
+class TestBundle(BaseCacheUsecasesTest):
+    # Spawns subprocesses
+    _numba_parallel_test_ = False
+
+    def test_export_import_bundle(self):
+        from numba.core.dispatcher import export_bundle
+        mod = self.import_module()
+        expected = mod.outer(2, 3)
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        path = os.path.join(self.tempdir, 'overloads.nbb')
+        # outer's callee is exported too
+        self.assertEqual(export_bundle([mod.outer, mod.add_usecase], path),
+                         4)
+        # The exported overloads keep working
+        self.assertPreciseEqual(mod.outer(2, 3), expected)
+
+        code = """if 1:
+            import sys
+            sys.path.insert(0, %(tempdir)r)
+            from numba.core.dispatcher import import_bundle
+            assert import_bundle(%(path)r) == 4
+            mod = __import__(%(modname)r)
+            for disp in (mod.outer, mod.inner, mod.add_usecase):
+                disp.disable_compile()
+            assert mod.outer(2, 3) == %(expected)r
+            assert mod.add_usecase(2.5, 3) == 6.5
+            # Overloads are only added once
+            assert import_bundle(%(path)r) == 0
+            """ % dict(tempdir=self.tempdir, modname=self.modname, path=path,
+                       expected=expected)
+        popen = subprocess.Popen([sys.executable, "-c", code],
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = popen.communicate()
+        if popen.returncode != 0:
+            raise AssertionError("process failed with code %s: "
+                                 "stderr follows\n%s\n"
+                                 % (popen.returncode, err.decode()))
+
+    def check_changed_source(self, modname, source, before, after, count,
+                             check):
+        """
+        Export a bundle of *modname*.f from *source* formatted with
+        *before*, then check that importing it in another process after
+        changing the source to *after* adds *count* overloads, and that
+        *check* holds.
+        """
+        from numba.core.dispatcher import export_bundle
+        modfile = os.path.join(self.tempdir, modname + '.py')
+        with open(modfile, 'w') as fout:
+            fout.write(source % before)
+        sys.path.insert(0, self.tempdir)
+        try:
+            mod = import_dynamic(modname)
+        finally:
+            sys.path.remove(self.tempdir)
+        mod.f(1)
+        path = os.path.join(self.tempdir, modname + '.nbb')
+        export_bundle([mod.f], path)
+
+        with open(modfile, 'w') as fout:
+            fout.write(source % after)
+        # The bytecode compiled from the first source may look up to date
+        shutil.rmtree(os.path.join(self.tempdir, '__pycache__'),
+                      ignore_errors=True)
+        code = """if 1:
+            import sys
+            sys.path.insert(0, %(tempdir)r)
+            from numba.core.dispatcher import import_bundle
+            assert import_bundle(%(path)r) == %(count)r
+            mod = __import__(%(modname)r)
+            assert %(check)s
+            """ % dict(tempdir=self.tempdir, modname=modname, path=path,
+                       count=count, check=check)
+        popen = subprocess.Popen([sys.executable, "-c", code],
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = popen.communicate()
+        if popen.returncode != 0:
+            raise AssertionError("process failed with code %s: "
+                                 "stderr follows\n%s\n"
+                                 % (popen.returncode, err.decode()))
+
+    def test_import_bundle_changed_constant(self):
+        source = """if 1:
+            from numba import njit
+
+            @njit
+            def f(x):
+                return x + %d
+            """
+        # Only the constant changes, not the bytecode
+        self.check_changed_source('bundle_constant_fodder', source, 1, 2, 0,
+                                  "mod.f(1) == 3")
+
+    def test_import_bundle_changed_global(self):
+        source = """if 1:
+            from numba import njit
+
+            N = %d
+
+            @njit
+            def g(x):
+                return x * 2
+
+            @njit
+            def f(x):
+                return g(x) + N
+            """
+        # g is still imported, f is compiled again
+        self.check_changed_source('bundle_global_fodder', source, 10, 20, 1,
+                                  "mod.f(1) == 22")
+
+    def test_import_bundle_changed_callee(self):
+        source = """if 1:
+            from numba import njit
+
+            @njit
+            def g(x):
+                return x * %d
+
+            @njit
+            def f(x):
+                return g(x) + 10
+            """
+        # Neither f nor g is imported
+        self.check_changed_source('bundle_callee_fodder', source, 2, 3, 0,
+                                  "mod.f(1) == 13")
+
+    def test_import_bundle_other_version(self):
+        from numba.core import dispatcher
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        path = os.path.join(self.tempdir, 'overloads.nbb')
+        dispatcher.export_bundle([mod.add_usecase], path)
+        with open(path, 'rb') as f:
+            f.read(len(dispatcher._BUNDLE_MAGIC))
+            version, entries = pickle.load(f)
+        with open(path, 'wb') as f:
+            f.write(dispatcher._BUNDLE_MAGIC)
+            pickle.dump(('0.0.0', entries), f)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always', NumbaWarning)
+            self.assertEqual(dispatcher.import_bundle(path), 0)
+        self.assertIn("written by Numba 0.0.0", str(w[0].message))
+
+
+class TestCacheGC(BaseCacheUsecasesTest):
+
+    def test_gc_obsolete_files(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_pycache(2)  # 1 index, 1 data
+        contents = set(self.cache_contents())
+
+        def write(name, data=b'junk'):
+            path = os.path.join(self.cache_dir, name)
+            with open(path, 'wb') as fout:
+                fout.write(data)
+            return path
+
+        # An index and data file from another Numba version
+        write('old.bar-3.py36.nbi', pickle.dumps('0.0.0') + b'junk')
+        write('old.bar-3.py36.1.nbc')
+        # An orphaned data file
+        write('orphan.baz-5.py36.1.nbc')
+        # A leftover temporary file
+        tmpfile = write('old.bar-3.py36.nbi.tmp.1234')
+        os.utime(tmpfile, (0, 0))
+
+        stats = caching.gc([self.cache_dir])
+        self.assertEqual(len(stats.removed_files), 4)
+        self.assertEqual(stats.entries, 1)
+        self.assertEqual(set(self.cache_contents()), contents)
+
+        # The remaining entry is still usable
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 1, 0)
+
+    def test_gc_budget(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_pycache(3)  # 1 index, 2 data
+
+        # Make the first entry the least recently used
+        [data1] = [os.path.join(self.cache_dir, fn)
+                   for fn in self.cache_contents() if fn.endswith('.1.nbc')]
+        os.utime(data1, (0, 0))
+        stats = caching.gc([self.cache_dir], max_entries=1)
+        self.assertEqual(stats.removed_files, [data1])
+        self.check_pycache(2)  # 1 index, 1 data
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 1, 1)
+
+    def test_gc_on_save(self):
+        collect = caching.CacheManager.collect
+        calls = []
+
+        def counting_collect(manager, paths):
+            calls.append(paths)
+            return collect(manager, paths)
+
+        with unittest.mock.patch.object(caching.CacheManager, 'collect',
+                                        counting_collect), \
+                override_config('CACHE_MAX_ENTRIES', 2):
+            mod = self.import_module()
+            f = mod.add_usecase
+            # The first save measures the usage of the directory
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.assertEqual(calls, [[self.cache_dir]])
+            # Saves within the budget don't collect
+            self.assertPreciseEqual(f(2.5, 3), 6.5)
+            self.assertEqual(len(calls), 1)
+            self.check_pycache(3)  # 1 index, 2 data
+            # A save beyond the budget collects and evicts
+            self.assertPreciseEqual(f(2j, 3), 4 + 2j)
+            self.assertEqual(len(calls), 2)
+            self.check_pycache(3)  # 1 index, 2 data
+
+    def test_gc_consolidated_store(self):
+        with override_env_config('NUMBA_CACHE_BACKEND', 'consolidated'):
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2, 3), 6)
+            f.recompile()
+            self.assertPreciseEqual(f(2, 3), 6)
+            [store] = self.cache_contents()
+            store = os.path.join(self.cache_dir, store)
+            size = os.path.getsize(store)
+
+            stats = caching.gc([self.cache_dir])
+            self.assertEqual(stats.entries, 1)
+            self.assertLess(os.path.getsize(store), size)
+
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.check_hits(f, 1, 0)
+
+
+    def test_gc_consolidated_budget(self):
+        with override_env_config('NUMBA_CACHE_BACKEND', 'consolidated'):
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.assertPreciseEqual(f(2.5, 3), 6.5)
+            self.check_pycache(1)
+            [store] = self.cache_contents()
+            store = caching._get_consolidated_store(
+                os.path.join(self.cache_dir, store))
+
+            # Make the first entry the least recently used
+            view, records = store.get_records(
+                f._cache._cache_file._filename_base)
+            self.assertEqual(len(records), 2)
+            with open(store.path, 'r+b') as fout:
+                fout.seek(store._time_offset(records[0]))
+                fout.write(store._record_time.pack(0))
+            # Records are evicted from the store, not the store as a whole
+            stats = caching.gc([self.cache_dir], max_entries=1)
+            self.assertEqual(stats.entries, 1)
+            self.assertEqual(stats.removed_files, [])
+            self.check_pycache(1)
+
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.assertPreciseEqual(f(2.5, 3), 6.5)
+            self.check_hits(f, 1, 1)
+
+    def test_gc_consolidated_on_save(self):
+        with override_env_config('NUMBA_CACHE_BACKEND', 'consolidated'), \
+                override_config('CACHE_MAX_ENTRIES', 2):
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.assertPreciseEqual(f(2.5, 3), 6.5)
+            # A save beyond the budget evicts the least recently used
+            # entry only, keeping the one just saved
+            self.assertPreciseEqual(f(2j, 3), 4 + 2j)
+            self.check_pycache(1)
+
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2j, 3), 4 + 2j)
+            self.assertPreciseEqual(f(2.5, 3), 6.5)
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.check_hits(f, 2, 1)
+
+
 class TestCacheWithCpuSetting(BaseCacheUsecasesTest):
     # Disable parallel testing due to envvars modification
     _numba_parallel_test_ = False
@@ -1928,5 +2549,133 @@ class TestNoRetryFailedSignature(unittest.TestCase):
         self.assertEqual(ct_bad, 1)
 
 
+class TestCompileParallel(TestCase):
+    # Spawns worker processes
+    _numba_parallel_test_ = False
+
+    sigs = ["int64(int64, int64)", "float64(float64, float64)",
+            "complex128(complex128, complex128)"]
+
+    def test_compile_parallel(self):
+        with override_config('COMPILE_WORKERS', 2):
+            f = jit(self.sigs, nopython=True)(add)
+        self.assertEqual(len(f.overloads), 3)
+        self.assertPreciseEqual(f(1, 2), 3)
+        self.assertPreciseEqual(f(1.5, 2.0), 3.5)
+        self.assertPreciseEqual(f(1j, 2j), 3j)
+        # Overloads compiled in workers keep their picklable metadata
+        for metadata in f.get_metadata().values():
+            self.assertIn('pipeline_times', metadata)
+            self.assertNotIn('parfor_diagnostics', metadata)
+        self.assertEqual(sum(f.stats.cache_misses.values()), 3)
+
+    @skip_parfors_unsupported
+    def test_compile_parallel_parfors(self):
+        # Functions using parfors are compiled in this process, so that
+        # their diagnostics are available
+        with override_config('COMPILE_WORKERS', 2):
+            f = jit(self.sigs, nopython=True, parallel=True)(add)
+        self.assertEqual(len(f.overloads), 3)
+        for metadata in f.get_metadata().values():
+            self.assertIn('parfor_diagnostics', metadata)
+        with captured_stdout():
+            f.parallel_diagnostics(level=1)
+
+    def test_compile_parallel_unguarded_main(self):
+        # A script compiling from its top-level code without a main guard
+        # doesn't spawn workers, which would run that code again
+        code = """if 1:
+            from numba import njit
+
+            def add(x, y):
+                return x + y
+
+            sigs = %r
+            f = njit(sigs)(add)
+            assert len(f.overloads) == 3
+            print("done")
+            """ % (self.sigs,)
+        tempdir = temp_directory('test_compile_parallel')
+        script = os.path.join(tempdir, 'unguarded.py')
+        with open(script, 'w') as f:
+            f.write(code)
+        env = dict(os.environ, NUMBA_COMPILE_WORKERS='2')
+        popen = subprocess.Popen([sys.executable, script], env=env,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = popen.communicate()
+        if popen.returncode != 0:
+            raise AssertionError("process failed with code %s: "
+                                 "stderr follows\n%s\n"
+                                 % (popen.returncode, err.decode()))
+        self.assertEqual(out.decode().split(), ["done"])
+        self.assertIn("NUMBA_COMPILE_WORKERS is ignored", err.decode())
+
+    def test_compile_parallel_error(self):
+        def bad(x, y):
+            return x + y.not_an_attribute
+
+        with override_config('COMPILE_WORKERS', 2):
+            with self.assertRaises(errors.TypingError):
+                jit(self.sigs, nopython=True)(bad)
+
+
+class TestBackgroundCompile(TestCase):
+
+    def test_background_compile(self):
+        f = jit(nopython=True, background=True)(add)
+        # Hold the compiler lock so that the background compilation can't
+        # finish before the call
+        with global_compiler_lock:
+            self.assertPreciseEqual(f(1, 2), 3)
+            self.assertEqual(f.signatures, [])
+        self.assertTrue(f.wait_background_compile())
+        self.assertEqual(f.signatures, [(types.intp, types.intp)])
+        self.assertPreciseEqual(f(1, 2), 3)
+        # Other types compile independently
+        self.assertPreciseEqual(f(1.5, 2.0), 3.5)
+        self.assertTrue(f.wait_background_compile())
+        self.assertEqual(len(f.signatures), 2)
+
+    def test_background_compile_args(self):
+        # The Python function gets the arguments as passed by the caller,
+        # not as folded by the dispatcher
+        def defaults(x, y=2, z=3):
+            return x, y, z
+
+        def star(x, *args):
+            return x, args
+
+        f = jit(nopython=True, background=True)(defaults)
+        g = jit(nopython=True, background=True)(star)
+        with global_compiler_lock:
+            self.assertPreciseEqual(f(1), (1, 2, 3))
+            self.assertPreciseEqual(f(1, z=4), (1, 2, 4))
+            self.assertPreciseEqual(f(y=5, x=1), (1, 5, 3))
+            self.assertPreciseEqual(g(1), (1, ()))
+            self.assertPreciseEqual(g(1, 2, 3), (1, (2, 3)))
+            self.assertEqual(f.signatures, [])
+            self.assertEqual(g.signatures, [])
+        self.assertTrue(f.wait_background_compile())
+        self.assertTrue(g.wait_background_compile())
+        self.assertPreciseEqual(f(1, z=4), (1, 2, 4))
+        self.assertPreciseEqual(g(1, 2, 3), (1, (2, 3)))
+
+    def test_background_compile_error(self):
+        def bad(x):
+            return object()
+
+        f = jit(nopython=True, background=True)(bad)
+        # The Python function runs while compiling
+        self.assertIs(type(f(1)), object)
+        self.assertTrue(f.wait_background_compile())
+        # The failed compilation is retried in the foreground, on every
+        # call rather than alternating with background compilations
+        for _ in range(3):
+            with self.assertRaises(errors.TypingError):
+                f(1)
+            self.assertEqual(len(f._background_threads), 1)
+        self.assertEqual(f.signatures, [])
+
+
 if __name__ == '__main__':
     unittest.main()
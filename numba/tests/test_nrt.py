@@ -1,6 +1,7 @@
 import math
 import os
 import platform
+import subprocess
 import sys
 import re
 
@@ -281,6 +282,223 @@ class TestTracemalloc(unittest.TestCase):
         self.assertLess(stat.size, N * 0.01)
 
 
+class TestNrtAllocator(TestCase):
+    """
+    Test the selection of the NRT allocator.
+    """
+    _numba_parallel_test_ = False
+
+    def test_invalid_allocator(self):
+        with self.assertRaises(ValueError) as raises:
+            rtsys.set_allocator('bogus')
+        self.assertIn("must be one of 'system' or 'pool'",
+                      str(raises.exception))
+
+    def test_set_allocator_with_live_memory(self):
+        @njit
+        def alloc():
+            return np.ones(10)
+
+        current = rtsys.allocator
+        other = 'pool' if current == 'system' else 'system'
+        arr = alloc()
+        with self.assertRaises(RuntimeError) as raises:
+            rtsys.set_allocator(other)
+        self.assertIn("cannot change the NRT allocator", str(raises.exception))
+        self.assertEqual(rtsys.allocator, current)
+        del arr
+
+    def test_pool_allocator(self):
+        code = """if 1:
+            import threading
+            import numpy as np
+            from numba import njit
+            from numba.core.runtime import rtsys
+
+            assert rtsys.allocator == 'pool'
+
+            @njit
+            def work(n):
+                total = 0.0
+                for i in range(n):
+                    # Size classes, a large block and reallocations
+                    small = np.full(i % 600 + 1, 1.0)
+                    large = np.full(1000, 1.0)
+                    lst = [i for i in range(i % 50)]
+                    total += small.sum() + large.sum() + len(lst)
+                return total
+
+            def expected(n):
+                return sum((i % 600 + 1) + 1000 + (i % 50) for i in range(n))
+
+            assert work(1000) == expected(1000)
+            threads = [threading.Thread(target=work, args=(1000,))
+                       for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            stats = rtsys.get_allocation_stats()
+            assert stats.alloc == stats.free, stats
+            assert stats.mi_alloc == stats.mi_free, stats
+
+            pool_stats = rtsys.get_allocator_stats()
+            [main] = [t for t in pool_stats.threads
+                      if t.thread_id == threading.get_ident()]
+            assert main.alloc > 0 and main.alloc == main.free, main
+            assert main.cache_hit > 0, main
+            total = sum(t.alloc for t in pool_stats.threads)
+            total += pool_stats.retired.alloc
+            assert total > 5 * main.alloc // 2, pool_stats
+
+            assert rtsys.trim_allocator() > 0
+            rtsys.set_allocator('system')
+            assert work(10) == expected(10)
+            print("OK")
+            """
+        env = dict(os.environ, NUMBA_NRT_ALLOCATOR='pool')
+        out = subprocess.check_output([sys.executable, '-c', code], env=env)
+        self.assertEqual(out.decode().strip(), "OK")
+
+
+class TestNrtArena(MemoryLeakMixin, TestCase):
+    """
+    Test the arena scopes of the functions compiled with `arena=True` and of
+    nrt.arena().
+    """
+
+    def assert_no_arena_scope(self):
+        with self.assertRaises(RuntimeError) as raises:
+            _nrt_python.memsys_arena_pop()
+        self.assertIn("no NRT arena scope is open", str(raises.exception))
+
+    def test_arena_function(self):
+        def pyfunc(n):
+            out = np.zeros(n)
+            for i in range(n):
+                tmp = np.arange(i % 16 + 1) * 2.0
+                out[i] = (tmp + 1.0).sum()
+            # A large array is allocated outside of the arena
+            return out + np.ones(10000)[:n]
+
+        cfunc = njit(arena=True)(pyfunc)
+        for n in (1, 100, 5000):
+            self.assertPreciseEqual(cfunc(n), pyfunc(n))
+        self.assert_no_arena_scope()
+        llvm_ir = cfunc.inspect_llvm(cfunc.signatures[0])
+        self.assertIn("NRT_arena_push", llvm_ir)
+        self.assertIn("NRT_arena_pop", llvm_ir)
+
+    def test_escaping_arrays(self):
+        @njit(arena=True)
+        def make(n, value):
+            return [np.full(3, value + i) for i in range(n)]
+
+        @njit(arena=True)
+        def churn(n):
+            total = 0.0
+            for i in range(n):
+                total += np.full(3, -1.0).sum()
+            return total
+
+        arrays = make(100, 1.0)
+        churn(10000)
+        for i, arr in enumerate(arrays):
+            self.assertPreciseEqual(arr, np.full(3, 1.0 + i))
+        del arrays
+
+    def test_exception(self):
+        @njit(arena=True)
+        def raises(n):
+            tmp = np.ones(n)
+            if tmp.sum() > 2:
+                raise ValueError("too large")
+            return tmp
+
+        self.assertPreciseEqual(raises(2), np.ones(2))
+        with self.assertRaises(ValueError):
+            raises(3)
+        self.assert_no_arena_scope()
+
+    def test_context_manager(self):
+        @njit
+        def work(n):
+            return [np.arange(i) for i in range(n)]
+
+        with nrt.arena():
+            arrays = work(50)
+        self.assert_no_arena_scope()
+        for i, arr in enumerate(arrays):
+            self.assertPreciseEqual(arr, np.arange(i))
+        del arrays
+
+
+class TestNrtProfile(TestCase):
+    """
+    Test nrt.profile().
+    """
+    _numba_parallel_test_ = False
+
+    def test_profile(self):
+        @njit
+        def alloc(n):
+            return [np.zeros(10) for _ in range(n)]
+
+        alloc(1)
+        with nrt.profile() as prof:
+            arrays = alloc(100)
+            del arrays
+        count = sum(s.count for s in prof.sites)
+        self.assertGreaterEqual(count, 100)
+        self.assertEqual(sum(s.freed for s in prof.sites), count)
+        self.assertIn("NRT allocations by site", prof.report())
+
+    def test_nested_profile(self):
+        with nrt.profile():
+            with self.assertRaises(RuntimeError) as raises:
+                with nrt.profile():
+                    pass
+        self.assertIn("already active", str(raises.exception))
+
+    def test_invalid_key(self):
+        with nrt.profile() as prof:
+            pass
+        with self.assertRaises(ValueError) as raises:
+            prof.top(key='bogus')
+        self.assertIn("key must be one of", str(raises.exception))
+
+    def test_sites(self):
+        code = """if 1:
+            import numpy as np
+            from numba import njit
+            from numba.core.runtime import nrt
+
+            @njit
+            def pipeline(n):
+                total = 0.0
+                for i in range(n):
+                    small = np.ones(4)
+                    large = np.ones(1000)
+                    total += small.sum() + large.sum()
+                return np.arange(n)
+
+            pipeline(1)
+            with nrt.profile() as prof:
+                result = pipeline(50)
+            top = prof.top(3)
+            assert top[0].lineno == 11 and top[0].count == 50, top
+            assert top[0].bytes == 50 * 8000 and top[0].freed == 50, top
+            assert top[1].lineno == 10 and top[1].count == 50, top
+            assert top[2].lineno == 13 and top[2].count - top[2].freed == 1
+            assert all(s.function.endswith('pipeline') for s in top), top
+            prof.dump(3)
+            """
+        env = dict(os.environ, NUMBA_NRT_PROFILE='1')
+        out = subprocess.check_output([sys.executable, '-c', code], env=env)
+        self.assertIn("(top 3 by bytes)", out.decode())
+
+
 class TestNRTIssue(MemoryLeakMixin, TestCase):
     def test_issue_with_refct_op_pruning(self):
         """
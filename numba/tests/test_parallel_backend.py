@@ -11,6 +11,7 @@ import subprocess
 import sys
 import threading
 import unittest
+import unittest.mock
 
 import numpy as np
 
@@ -582,9 +583,9 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
             print(out, err)
         self.assertIn("@tbb@", out)
 
-    def test_workqueue_aborts_on_nested_parallelism(self):
+    def test_workqueue_nested_parallelism(self):
         """
-        Tests workqueue raises sigabrt if a nested parallel call is performed
+        Tests workqueue runs nested parallel calls
         """
         runme = """if 1:
             from numba import njit, prange
@@ -603,24 +604,215 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
                     nested(Z[i])
                 return Z
 
-            main()
+            np.testing.assert_equal(main(), np.ones((5, 10)))
+            print("@OK@")
         """
         cmdline = [sys.executable, '-c', runme]
         env = os.environ.copy()
         env['NUMBA_THREADING_LAYER'] = "workqueue"
         env['NUMBA_NUM_THREADS'] = "4"
+        out, err = self.run_cmd(cmdline, env=env)
+        if self._DEBUG:
+            print(out, err)
+        self.assertIn("@OK@", out)
 
-        try:
+    def test_workqueue_load_balancing(self):
+        """
+        Tests workqueue balances a very uneven load by work stealing, as seen
+        in the parallel_stats events of a parallel ufunc and of a parfor
+        """
+        runme = """if 1:
+            import io
+            import json
+            from numba import njit, prange, vectorize, threading_layer
+            from numba.np.ufunc import parallel_stats
+            import numpy as np
+
+            @vectorize(['float64(float64)'], target='parallel')
+            def square(x):
+                acc = 0.
+                for j in range(int(x) * int(x)):
+                    acc += 1.
+                return acc
+
+            n = 1000
+            np.testing.assert_equal(square(np.arange(n, dtype=np.float64)),
+                                    np.arange(n) ** 2)
+
+            # Without stealing, each of the 4 threads runs its 250 rows in
+            # grains of n // 16 rows, i.e. 5 calls of the kernel each, and
+            # each call records a work event.  Stealing splits the shares of
+            # the threads with the costly rows into more calls.
+            buf = io.StringIO()
+            parallel_stats.export_trace(buf, name='square')
+            events = json.loads(buf.getvalue())['traceEvents']
+            calls = sum(event['cat'] == 'work' for event in events)
+            assert calls > 20, calls
+
+            @njit(parallel=True)
+            def triangle(n):
+                out = np.zeros(n)
+                for i in prange(n):
+                    acc = 0.
+                    for j in range(i * i):
+                        acc += 1.
+                    out[i] = acc
+                return out
+
+            for n in (1, 3, 7, 100, 1001):
+                np.testing.assert_equal(triangle(n), np.arange(n) ** 2)
+
+            @njit(parallel=True)
+            def skewed(n):
+                out = np.zeros(n)
+                for i in prange(n):
+                    acc = 0.
+                    for j in range(i * i):
+                        acc += 1.
+                    out[i] = acc
+                return out
+
+            n = 600
+            np.testing.assert_equal(skewed(n), np.arange(n) ** 2)
+
+            # The parfor is split into 4 schedule rows per thread, run one
+            # per call of the kernel.  Without stealing, each of the 4
+            # threads makes 4 calls; the first threads, whose rows are the
+            # cheapest, steal rows from the last ones.
+            buf = io.StringIO()
+            parallel_stats.export_trace(buf, name='skewed')
+            events = json.loads(buf.getvalue())['traceEvents']
+            calls = {}
+            for event in events:
+                if event['cat'] == 'work':
+                    calls[event['tid']] = calls.get(event['tid'], 0) + 1
+            assert sum(calls.values()) == 16, calls
+            assert max(calls.values()) > 4, calls
+            print("@%s@" % threading_layer())
+        """
+        cmdline = [sys.executable, '-c', runme]
+        env = os.environ.copy()
+        env['NUMBA_THREADING_LAYER'] = "workqueue"
+        env['NUMBA_NUM_THREADS'] = "4"
+        env['NUMBA_PARALLEL_STATS'] = "1"
+        out, err = self.run_cmd(cmdline, env=env)
+        if self._DEBUG:
+            print(out, err)
+        self.assertIn("@workqueue@", out)
+
+
+class TestThreadAffinityParsing(TestCase):
+    """
+    Checks the parsing of thread affinity specifications
+    """
+
+    def parse(self, affinity, available=range(8)):
+        from numba.np.ufunc.parallel import _parse_thread_affinity
+
+        # two packages, the CPUs of a core are 4 apart
+        def topology(cpu):
+            return cpu // 4 % 2, cpu % 4 // 2
+
+        with unittest.mock.patch('numba.np.ufunc.parallel._cpu_topology_ids',
+                                 side_effect=topology):
+            return _parse_thread_affinity(affinity, available)
+
+    def test_none(self):
+        self.assertEqual(self.parse(None), (list(range(8)), False))
+        self.assertEqual(self.parse('none'), (list(range(8)), False))
+        self.assertEqual(self.parse(''), (list(range(8)), False))
+
+    def test_compact(self):
+        self.assertEqual(self.parse('compact'),
+                         ([0, 1, 2, 3, 4, 5, 6, 7], True))
+        self.assertEqual(self.parse('compact', [6, 1, 3]), ([1, 3, 6], True))
+
+    def test_scatter(self):
+        self.assertEqual(self.parse('Scatter'),
+                         ([0, 4, 1, 5, 2, 6, 3, 7], True))
+        self.assertEqual(self.parse('scatter', [0, 1, 2, 7]),
+                         ([0, 7, 1, 2], True))
+
+    def test_list(self):
+        self.assertEqual(self.parse('3'), ([3], True))
+        self.assertEqual(self.parse(' 6,0-2, 4 '), ([6, 0, 1, 2, 4], True))
+
+    def test_invalid(self):
+        for affinity in ('first', '1,', '3-1', '1-x'):
+            with self.assertRaises(ValueError) as raises:
+                self.parse(affinity)
+            self.assertIn("Invalid thread affinity", str(raises.exception))
+        with self.assertRaises(ValueError) as raises:
+            self.parse('6-9')
+        self.assertIn("The CPUs [8, 9] of the thread affinity",
+                      str(raises.exception))
+
+
+@skip_parfors_unsupported
+@linux_only
+class TestThreadAffinity(ThreadLayerTestHelper):
+    """
+    Checks that the threads of the threading layers get bound to CPUs
+    """
+    _DEBUG = False
+
+    backends = {'tbb': skip_no_tbb,
+                'omp': skip_no_omp,
+                'workqueue': unittest.skipIf(False, '')}
+
+    @classmethod
+    def _inject(cls, backend, backend_guard):
+
+        def test_template(self):
+            body = """if 1:
+                def bound_cpus():
+                    # the CPUs of the threads of the process bound to one CPU
+                    cpus = set()
+                    for tid in os.listdir('/proc/self/task'):
+                        path = '/proc/self/task/%s/status' % tid
+                        with open(path) as f:
+                            for line in f:
+                                if line.startswith('Cpus_allowed_list:'):
+                                    allowed = line.split()[1]
+                                    if allowed.isdigit():
+                                        cpus.add(int(allowed))
+                    return cpus
+
+                @njit(parallel=True)
+                def pfunc(X):
+                    return np.sqrt(X) + X
+
+                cpus = sorted(os.sched_getaffinity(0))[:2]
+                numba.set_thread_affinity(cpus)
+                assert numba.get_thread_affinity() == cpus
+                X = np.arange(1000000.)
+                np.testing.assert_allclose(pfunc(X), pfunc.py_func(X))
+                assert bound_cpus() <= set(cpus), bound_cpus()
+                numba.set_thread_affinity(None)
+                assert numba.get_thread_affinity() is None
+                np.testing.assert_allclose(pfunc(X), pfunc.py_func(X))
+                print("@OK@")
+            """
+            runme = self.template % body
+            cmdline = [sys.executable, '-c', runme]
+            env = os.environ.copy()
+            env['NUMBA_THREADING_LAYER'] = str(backend)
+            env['NUMBA_THREAD_AFFINITY'] = 'compact'
             out, err = self.run_cmd(cmdline, env=env)
-        except AssertionError as e:
             if self._DEBUG:
                 print(out, err)
-            e_msg = str(e)
-            self.assertIn("failed with code", e_msg)
-            # raised a SIGABRT, but the value is platform specific so just check
-            # the error message
-            self.assertIn("Terminating: Nested parallel kernel launch detected",
-                          e_msg)
+            self.assertIn("@OK@", out)
+
+        injected_test = "test_thread_affinity_%s" % backend
+        setattr(cls, injected_test, backend_guard(test_template))
+
+    @classmethod
+    def generate(cls):
+        for backend, backend_guard in cls.backends.items():
+            cls._inject(backend, backend_guard)
+
+
+TestThreadAffinity.generate()
 
 
 # 32bit or windows py27 (not that this runs on windows)
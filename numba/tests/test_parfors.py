@@ -1395,6 +1395,40 @@ class TestParfors(TestParforsBase):
 
         self.check(test_impl, 100)
 
+    @skip_parfors_unsupported
+    def test_large_array_reduction(self):
+        # The partial results are large enough to be combined in parallel
+        def test_impl(n):
+            shp = (300, 70)
+            result1 = np.ones(shp, np.int_)
+            result2 = np.ones(shp, np.int_)
+            tmp = np.arange(shp[0] * shp[1]).reshape(shp)
+
+            for i in numba.prange(n):
+                result1 += tmp * i
+                result2 -= tmp
+
+            return result1, result2
+
+        self.check(test_impl, 100)
+        self.check(test_impl, 0)
+
+        # Floor divisions are combined serially, as a floor division by the
+        # product of the partial results rounds differently
+        from numba.parfors.parfor_lowering import _get_partials_combine
+        arrty = types.Array(types.intp, 2, 'C')
+        self.assertIsNotNone(_get_partials_combine(arrty, operator.itruediv))
+        self.assertIsNone(_get_partials_combine(arrty, operator.ifloordiv))
+
+        # The partial results are only allocated for the running threads
+        cfunc = njit(parallel=True)(test_impl)
+        nthreads = get_num_threads()
+        try:
+            set_num_threads(max(nthreads // 2, 1))
+            self.assertPreciseEqual(cfunc(50), test_impl(50))
+        finally:
+            set_num_threads(nthreads)
+
     @skip_parfors_unsupported
     def test_preparfor_canonicalize_kws(self):
         # test canonicalize_array_math typing for calls with kw args
@@ -3083,6 +3117,222 @@ class TestParforsOptions(TestParforsBase):
                          comprehension=False, setitem=False, prange=False,
                          reduction=False, numpy=False), 0)
 
+    @skip_parfors_unsupported
+    def test_parfor_schedule(self):
+        def imbalanced(n):
+            # The cost of the iterations grows with i
+            acc = 0
+            for i in prange(n):
+                for j in range(i):
+                    acc += j % 7
+            return acc
+
+        def shifted(n):
+            # A signed iteration space
+            out = np.zeros(2 * n)
+            for i in prange(-n, n):
+                out[i + n] = i * 2.0
+            return out
+
+        def nested(a):
+            m, n = a.shape
+            out = np.empty_like(a)
+            for i in prange(m):
+                for j in prange(n):
+                    out[i, j] = a[i, j] * i + j
+            return out.sum()
+
+        options = [('static', 3), ('dynamic', 0), ('dynamic', 5),
+                   ('guided', 0), ('guided', 4)]
+        for schedule, chunksize in options:
+            parallel = {'schedule': schedule, 'chunksize': chunksize}
+            with self.subTest(schedule=schedule, chunksize=chunksize):
+                for n in (0, 1, 7, 200):
+                    self.assertPreciseEqual(
+                        njit(parallel=parallel)(imbalanced)(n),
+                        imbalanced(n))
+                    self.assertPreciseEqual(
+                        njit(parallel=parallel)(shifted)(n), shifted(n))
+                a = np.arange(35.).reshape((5, 7))
+                self.assertPreciseEqual(njit(parallel=parallel)(nested)(a),
+                                        nested(a))
+
+        with self.assertRaises(ValueError) as raises:
+            cpu.ParallelOptions({'schedule': 'round-robin'})
+        self.assertIn("parallel schedule", str(raises.exception))
+        with self.assertRaises(ValueError) as raises:
+            cpu.ParallelOptions({'chunksize': -1})
+        self.assertIn("parallel chunksize", str(raises.exception))
+
+    @skip_parfors_unsupported
+    def test_parfor_collapse(self):
+        def test_impl(a):
+            out = np.empty_like(a)
+            for i in prange(a.shape[0]):
+                k = i * 2
+                m = a.shape[1]
+                for j in prange(m):
+                    out[i, j] = a[i, j] * k + j
+            return out
+
+        def reduction(a):
+            acc = 0.
+            for i in prange(a.shape[0]):
+                for j in prange(a.shape[1]):
+                    acc += a[i, j]
+            return acc
+
+        def get_loop_nests(func, **kws):
+            args = (types.float64[:, :],)
+            test_ir, tp = get_optimized_numba_ir(func, args, **kws)
+            parfors = [stmt for block in test_ir.blocks.values()
+                       for stmt in block.body
+                       if isinstance(stmt, numba.parfors.parfor.Parfor)]
+            self.assertEqual(len(parfors), 1)
+            return len(parfors[0].loop_nests)
+
+        self.assertEqual(get_loop_nests(test_impl), 2)
+        self.assertEqual(get_loop_nests(test_impl, collapse=False), 1)
+        # loops carrying a reduction are not collapsed
+        self.assertEqual(get_loop_nests(reduction), 1)
+        for shape in ((1, 100), (3, 7), (0, 4), (4, 0)):
+            a = np.arange(np.prod(shape), dtype=np.float64).reshape(shape)
+            self.check(test_impl, a)
+            self.check(reduction, a)
+
+    @skip_parfors_unsupported
+    def test_parfor_tile(self):
+        from numba.parfors.parfor import get_tile_sizes
+
+        def transpose(a):
+            out = np.empty((a.shape[1], a.shape[0]))
+            for i in prange(a.shape[1]):
+                for j in prange(a.shape[0]):
+                    out[i, j] = a[j, i]
+            return out
+
+        def stencil3d(a):
+            out = np.zeros_like(a)
+            for i, j, k in numba.pndindex(a.shape):
+                out[i, j, k] = a[i, j, k] * 2 + i - k
+            return out
+
+        self.assertIsNone(get_tile_sizes(1, 8))
+        self.assertEqual(get_tile_sizes(2, 8), (8, 8))
+        self.assertEqual(get_tile_sizes(3, (4, 0)), (0, 4, 0))
+        self.assertEqual(get_tile_sizes(2, (1, 2, 3)), (2, 3))
+        self.assertIsNone(get_tile_sizes(2, (0, 0)))
+
+        a2 = np.arange(300.).reshape((12, 25))
+        a3 = np.arange(420.).reshape((5, 7, 12))
+        for tile in (4, (3, 0), (1, 5), 64):
+            parallel = {'tile': tile}
+            with self.subTest(tile=tile):
+                cfunc = njit(parallel=parallel)(transpose)
+                self.assertPreciseEqual(cfunc(a2), transpose(a2))
+                self.assertPreciseEqual(cfunc(a2[:0]), transpose(a2[:0]))
+                cfunc = njit(parallel=parallel)(stencil3d)
+                self.assertPreciseEqual(cfunc(a3), stencil3d(a3))
+
+        sig = (types.float64[:, :],)
+        cres = compile_isolated(transpose, sig, flags=self._tile_flags(8))
+        diagnostics = cres.metadata['parfor_diagnostics']
+        self.assertEqual(list(diagnostics.tile_info.values()), [(8, 8)])
+        with captured_stdout() as stdout:
+            diagnostics.dump(3)
+        self.assertIn("is tiled with tiles of (8, 8) iterations",
+                      stdout.getvalue())
+
+        with self.assertRaises(ValueError) as raises:
+            cpu.ParallelOptions({'tile': (8, -1)})
+        self.assertIn("parallel tile", str(raises.exception))
+
+    def _tile_flags(self, tile):
+        flags = Flags()
+        flags.set('auto_parallel', cpu.ParallelOptions({'tile': tile}))
+        flags.set('nrt')
+        return flags
+
+    @skip_parfors_unsupported
+    def test_parfor_serial_threshold(self):
+        from numba.np.ufunc.parallel import _get_thread_id
+
+        def thread_ids(n):
+            caller = _get_thread_id()
+            out = np.empty(n, np.int64)
+            for i in prange(n):
+                out[i] = _get_thread_id()
+            return caller, out
+
+        def reduce2d(a):
+            acc = 0.
+            for i in prange(a.shape[0]):
+                for j in prange(a.shape[1]):
+                    acc += a[i, j]
+            return acc
+
+        parallel = {'serial_threshold': 20}
+        caller, out = njit(parallel=parallel)(thread_ids)(19)
+        np.testing.assert_equal(out, caller)
+        cfunc = njit(parallel=parallel)(reduce2d)
+        for shape in ((0, 5), (4, 4), (4, 5), (4, 6), (30, 2)):
+            a = np.arange(np.prod(shape), dtype=np.float64).reshape(shape)
+            self.assertPreciseEqual(cfunc(a), reduce2d(a))
+
+        with self.assertRaises(ValueError) as raises:
+            cpu.ParallelOptions({'serial_threshold': -1})
+        self.assertIn("parallel serial_threshold", str(raises.exception))
+
+    @skip_parfors_unsupported
+    def test_parallel_overhead_benchmark(self):
+        from numba.misc.parallel_overhead import measure_parallel_overhead
+        result = measure_parallel_overhead(size=1000, number=10, repeat=1)
+        self.assertEqual(result['num_threads'], get_num_threads())
+        self.assertGreaterEqual(result['region_overhead'], 0)
+        self.assertGreater(result['iteration_time'], 0)
+        self.assertGreaterEqual(result['serial_threshold'], 0)
+
+    @skip_parfors_unsupported
+    def test_parallel_stats(self):
+        import io
+        import json
+        from numba.np.ufunc import parallel_stats
+
+        def test_impl(a):
+            acc = 0.
+            for i in prange(a.size):
+                acc += a[i] * a[i]
+            return acc
+
+        a = np.arange(10000.)
+        with override_env_config('NUMBA_PARALLEL_STATS', '1'):
+            cfunc = njit(parallel=True)(test_impl)
+            for _ in range(3):
+                cfunc(a)
+        sig = cfunc.signatures[0]
+        [stats] = cfunc.parallel_stats(sig)
+        self.assertEqual(stats.info.kind, 'parfor')
+        self.assertEqual(stats.runs, 3)
+        self.assertGreater(stats.wall_time, 0)
+        self.assertGreater(len(stats.thread_times), 0)
+        self.assertLessEqual(len(stats.thread_times), get_num_threads())
+        self.assertGreaterEqual(stats.imbalance, 1.)
+        self.assertIn('imbalance', stats.report())
+        [[other]] = cfunc.parallel_stats().values()
+        self.assertEqual(other.region, stats.region)
+
+        buf = io.StringIO()
+        parallel_stats.export_trace(buf, regions=[stats.region])
+        events = json.loads(buf.getvalue())['traceEvents']
+        kinds = {event['cat'] for event in events}
+        self.assertTrue({'region', 'work', 'schedule', 'reduction'} <= kinds)
+
+        # Not instrumented without NUMBA_PARALLEL_STATS
+        cfunc = njit(parallel=True)(test_impl)
+        cfunc(a)
+        with self.assertRaises(ValueError):
+            cfunc.parallel_stats(cfunc.signatures[0])
+
 
 class TestParforsBitMask(TestParforsBase):
 
@@ -3536,7 +3786,8 @@ class TestParforsDiagnostics(TestParforsBase):
 
     def assert_diagnostics(self, diagnostics, parfors_count=None,
                            fusion_info=None, nested_fusion_info=None,
-                           replaced_fns=None, hoisted_allocations=None):
+                           collapse_info=None, replaced_fns=None,
+                           hoisted_allocations=None):
         if parfors_count is not None:
             self.assertEqual(parfors_count, diagnostics.count_parfors())
         if fusion_info is not None:
@@ -3544,6 +3795,9 @@ class TestParforsDiagnostics(TestParforsBase):
         if nested_fusion_info is not None:
             self.assert_fusion_equivalence(nested_fusion_info,
                                            diagnostics.nested_fusion_info)
+        if collapse_info is not None:
+            self.assert_fusion_equivalence(collapse_info,
+                                           diagnostics.collapse_info)
         if replaced_fns is not None:
             repl = diagnostics.replaced_fns.values()
             for x in replaced_fns:
@@ -3601,6 +3855,15 @@ class TestParforsDiagnostics(TestParforsBase):
         self.check(test_impl,)
         cpfunc = self.compile_parallel(test_impl, ())
         diagnostics = cpfunc.metadata['parfor_diagnostics']
+        self.assert_diagnostics(diagnostics, parfors_count=1,
+                                collapse_info={2: [1]})
+
+        # without collapsing, the inner loop is run serially
+        pflags = Flags()
+        pflags.set('auto_parallel', cpu.ParallelOptions({'collapse': False}))
+        pflags.set('nrt')
+        cpfunc = self._compile_this(test_impl, (), pflags)
+        diagnostics = cpfunc.metadata['parfor_diagnostics']
         self.assert_diagnostics(diagnostics, parfors_count=2,
                                 nested_fusion_info={2: [1]})
 
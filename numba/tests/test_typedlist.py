@@ -1582,3 +1582,77 @@ class TestListFromIter(MemoryLeakMixin, TestCase):
             "List() takes no keyword arguments",
             str(raises.exception),
         )
+
+
+class TestListArrays(MemoryLeakMixin, TestCase):
+
+    def test_from_array(self):
+        @njit
+        def foo(arr):
+            return List.from_array(arr)
+
+        for arr in (np.arange(10, dtype=np.int32),
+                    np.linspace(0, 1, 7),
+                    np.array([True, False, True]),
+                    np.arange(10, dtype=np.int64)[::3],
+                    np.empty(0, dtype=np.float32)):
+            for func in (foo, List.from_array):
+                got = func(arr)
+                self.assertEqual(typeof(got), types.ListType(typeof(arr).dtype))
+                self.assertEqual(list(got), arr.tolist())
+                # The list is independent of the array and mutable
+                got.append(arr.dtype.type(0))
+                self.assertEqual(len(got), len(arr) + 1)
+
+    def test_from_array_exceptions(self):
+        @njit
+        def foo(arr):
+            return List.from_array(arr)
+
+        with self.assertRaises(TypingError) as raises:
+            foo(np.ones((2, 2)))
+        self.assertIn("expects a 1-dimensional array", str(raises.exception))
+        with self.assertRaises(TypingError) as raises:
+            foo(np.zeros(2, dtype=[('a', np.int64)]))
+        self.assertIn("requires a numeric, boolean or datetime item type",
+                      str(raises.exception))
+
+    def test_as_array(self):
+        @njit
+        def foo(n):
+            l = List.empty_list(types.float64)
+            for i in range(n):
+                l.append(i / 2)
+            return l.as_array()
+
+        got = foo(10)
+        np.testing.assert_equal(got, np.arange(10) / 2)
+        # The array outlives the list of the function
+        self.assertEqual(got.dtype, np.dtype(np.float64))
+        self.assertEqual(len(foo(0)), 0)
+
+    def test_as_array_is_a_view(self):
+        l = List.from_array(np.arange(5, dtype=np.int64))
+        arr = l.as_array()
+        arr[1] = 10
+        self.assertEqual(l[1], 10)
+        # The list can't be resized while it is viewed
+        self.assertFalse(l._is_mutable())
+        with self.assertRaises(ValueError) as raises:
+            l.append(1)
+        self.assertIn("list is immutable", str(raises.exception))
+        # The array keeps the list alive
+        del l
+        np.testing.assert_equal(arr, [0, 10, 2, 3, 4])
+
+    def test_as_array_exceptions(self):
+        @njit
+        def foo():
+            l = List()
+            l.append((1, 2))
+            return l.as_array()
+
+        with self.assertRaises(TypingError) as raises:
+            foo()
+        self.assertIn("requires a numeric, boolean or datetime item type",
+                      str(raises.exception))
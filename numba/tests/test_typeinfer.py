@@ -1,9 +1,10 @@
 import os, sys, subprocess
 import itertools
+from unittest import mock
 
 import numpy as np
 
-from numba.core.compiler import compile_isolated
+from numba.core.compiler import compile_isolated, run_frontend
 from numba import jit
 from numba.core import types, typing, errors, typeinfer, utils
 from numba.core.typeconv import Conversion
@@ -679,6 +680,56 @@ class TestMiscIssues(TestCase):
             self.assertEqual(res, pyfunc(v))
 
 
+class TestConstraintPropagation(TestCase):
+
+    def make_chain(self, n):
+        """
+        Make a function with a chain of *n* variables whose types are
+        propagated backwards in the IR: each change needs another sweep
+        over the constraints.
+        """
+        names = ['x%d' % i for i in range(n + 1)]
+        lines = ['def chain(m):']
+        lines += ['    %s = 0' % name for name in names]
+        lines += ['    for i in range(m):']
+        lines += ['        %s = %s' % (a, b) for a, b in zip(names, names[1:])]
+        lines += ['        %s = 1.5' % names[-1]]
+        lines += ['    return %s' % names[0]]
+        ns = {}
+        exec('\n'.join(lines), ns)
+        return ns['chain']
+
+    def test_propagate_only_dirty(self):
+        # Only the constraints reading a changed variable are re-executed,
+        # so the number of executions is linear in the size of the chain
+        # (executing all the constraints until fixpoint is quadratic).
+        n = 500
+        cfunc = jit(nopython=True)(self.make_chain(n))
+        orig_call = typeinfer.Propagate.__call__
+        with mock.patch.object(typeinfer.Propagate, '__call__',
+                               autospec=True,
+                               side_effect=orig_call) as propagate:
+            self.assertPreciseEqual(cfunc(2), 1.5)
+        self.assertGreater(propagate.call_count, n)
+        self.assertLess(propagate.call_count, 20 * n)
+
+    def test_propagate_reexecutes_on_outside_change(self):
+        # Changes made between propagations re-execute the readers
+        def func(a):
+            b = a
+            return b
+
+        warnings = errors.WarningsFixer(errors.NumbaWarning)
+        infer = typeinfer.TypeInferer(typing.Context(), run_frontend(func),
+                                      warnings)
+        infer.build_constraint()
+        infer.propagate()
+        self.assertFalse(infer.typevars['b'].defined)
+        infer.seed_argument('a', 0, types.intp)
+        infer.propagate()
+        self.assertEqual(infer.typevars['b'].getone(), types.intp)
+
+
 class TestFoldArguments(unittest.TestCase):
     def check_fold_arguments_list_inputs(self, func, args, kws):
         def make_tuple(*args):
@@ -496,6 +496,54 @@ class TestFingerprint(TestCase):
         distinct.add(compute_fingerprint((1, (), np.empty(5))))
         distinct.add(compute_fingerprint((1, (), np.empty((5, 1)))))
 
+    def test_named_tuples(self):
+        distinct = DistinctChecker()
+
+        s = compute_fingerprint(Point(1, 2))
+        self.assertEqual(compute_fingerprint(Point(3, 4)), s)
+        distinct.add(s)
+
+        # Same items, but a different class or a plain tuple
+        distinct.add(compute_fingerprint(Rect(1, 2)))
+        distinct.add(compute_fingerprint((1, 2)))
+        distinct.add(compute_fingerprint(Point(1.0, 2)))
+        distinct.add(compute_fingerprint(Point(np.empty(5), (1, 2))))
+        distinct.add(compute_fingerprint(Point(np.empty(5), Rect(1, 2))))
+
+    def test_jitclass_instances(self):
+        from numba.experimental import jitclass
+
+        @jitclass([('x', types.int64)])
+        class IntBox(object):
+            def __init__(self, x):
+                self.x = x
+
+        @jitclass([('x', types.float64)])
+        class FloatBox(object):
+            def __init__(self, x):
+                self.x = x
+
+        distinct = DistinctChecker()
+
+        s = compute_fingerprint(IntBox(1))
+        self.assertEqual(compute_fingerprint(IntBox(2)), s)
+        distinct.add(s)
+        distinct.add(compute_fingerprint(FloatBox(1.0)))
+        distinct.add(compute_fingerprint((IntBox(1), 1)))
+
+        # Values whose "_numba_type_" isn't determined by their class
+        class Computed(object):
+            @property
+            def _numba_type_(self):
+                return types.int64
+
+        class Shadowed(object):
+            _numba_type_ = types.int64
+
+        for v in (Computed(), Shadowed()):
+            with self.assertRaises(NotImplementedError):
+                compute_fingerprint(v)
+
     def test_lists(self):
         distinct = DistinctChecker()
 
@@ -36,6 +36,7 @@ from numba.typed.typedobjectutils import (_as_bytes, _cast, _nonoptional,
                                           _container_get_data,
                                           _container_get_meminfo,)
 from numba.cpython import listobj
+from numba.np.arrayobj import make_array, populate_array
 
 ll_list_type = cgutils.voidptr_t
 ll_listiter_type = cgutils.voidptr_t
@@ -1263,6 +1264,113 @@ def ol_list_sort(lst, key=None, reverse=False):
     return impl
 
 
+# Item types that are stored as NumPy scalars, so that the items of the list
+# can be viewed as an array
+_array_item_types = (types.Number, types.Boolean, types.NPDatetime,
+                     types.NPTimedelta)
+
+
+def _check_array_item_type(itemty, method):
+    if not isinstance(itemty, _array_item_types):
+        raise TypingError("{} requires a numeric, boolean or datetime item "
+                          "type, got {}".format(method, itemty))
+
+
+@intrinsic
+def _list_resize(typingctx, l, newsize):
+    """Wrap numba_list_resize
+
+    Resizes the list to *newsize* items, the new items are uninitialized.
+    """
+    resty = types.int32
+    sig = resty(l, types.intp)
+
+    def codegen(context, builder, sig, args):
+        fnty = ir.FunctionType(
+            ll_status,
+            [ll_list_type, ll_ssize_t],
+        )
+        fn = builder.module.get_or_insert_function(fnty,
+                                                   name='numba_list_resize')
+        [l, newsize] = args
+        [tl, _] = sig.args
+        lp = _container_get_data(context, builder, tl, l)
+        return builder.call(fn, [lp, newsize])
+
+    return sig, codegen
+
+
+@intrinsic
+def _list_as_array(typingctx, l):
+    """Wrap numba_list_base_ptr
+
+    Returns a 1D array viewing the items of the list.  The array holds a
+    reference to the list, the items are invalidated by any resize of the
+    list.
+    """
+    if not isinstance(l, types.ListType):
+        raise TypingError('expected *l* to be a ListType')
+    arrty = types.Array(l.item_type, 1, 'C')
+    sig = arrty(l)
+
+    def codegen(context, builder, sig, args):
+        fnty = ir.FunctionType(ll_bytes, [ll_list_type])
+        fn = builder.module.get_or_insert_function(fnty,
+                                                   name='numba_list_base_ptr')
+        len_fnty = ir.FunctionType(ll_ssize_t, [ll_list_type])
+        len_fn = builder.module.get_or_insert_function(
+            len_fnty, name='numba_list_length')
+        [l] = args
+        [tl] = sig.args
+        lstruct = cgutils.create_struct_proxy(tl)(context, builder, value=l)
+        lp = lstruct.data
+        ary = make_array(sig.return_type)(context, builder)
+        itemsize = context.get_abi_sizeof(context.get_data_type(tl.item_type))
+        data = builder.bitcast(builder.call(fn, [lp]), ary.data.type)
+        populate_array(ary,
+                       data=data,
+                       shape=[builder.call(len_fn, [lp])],
+                       strides=[ll_ssize_t(itemsize)],
+                       itemsize=ll_ssize_t(itemsize),
+                       meminfo=lstruct.meminfo)
+        # The array keeps the list alive
+        context.nrt.incref(builder, tl, l)
+        return ary._getvalue()
+
+    return sig, codegen
+
+
+@overload_method(types.ListType, 'as_array')
+def impl_as_array(l):
+    """list.as_array()
+
+    Returns a 1D array viewing the items of the list without a copy.  The
+    list is made immutable, as resizing it would move the items.
+    """
+    if not isinstance(l, types.ListType):
+        return
+    _check_array_item_type(l.item_type, 'as_array()')
+
+    def impl(l):
+        l._make_immutable()
+        return _list_as_array(l)
+
+    return impl
+
+
+@register_jitable
+def _list_from_array(l, arr):
+    status = _list_resize(l, len(arr))
+    if status == ListStatus.LIST_ERR_IMMUTABLE:
+        raise ValueError('list is immutable')
+    elif status == ListStatus.LIST_ERR_NO_MEMORY:
+        raise MemoryError('Unable to allocate memory for the items')
+    elif status != ListStatus.LIST_OK:
+        raise RuntimeError('list resize failed unexpectedly')
+    _list_as_array(l)[:] = arr
+    return l
+
+
 @overload_attribute(types.ListType, '_dtype')
 def impl_dtype(l):
     if not isinstance(l, types.ListType):
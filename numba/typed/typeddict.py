@@ -3,6 +3,8 @@ Python wrapper that connects CPython interpreter to the numba dictobject.
 """
 from collections.abc import MutableMapping
 
+import numpy as np
+
 from numba.core.types import DictType, TypeRef
 from numba.core.imputils import numba_typeref_ctor
 from numba import njit, typeof
@@ -17,6 +19,7 @@ from numba.core.extending import (
 )
 from numba.typed import dictobject
 from numba.core.typing import signature
+from numba.np.numpy_support import as_dtype
 
 
 @njit
@@ -74,6 +77,37 @@ def _copy(d):
     return d.copy()
 
 
+@njit
+def _update_arrays(d, keys, values):
+    for i in range(len(keys)):
+        d[keys[i]] = values[i]
+
+
+@njit
+def _get_many(d, keys, default, out):
+    for i in range(len(keys)):
+        out[i] = d.get(keys[i], default)
+
+
+@njit
+def _to_arrays(d, keys, values):
+    i = 0
+    for k, v in d.items():
+        keys[i] = k
+        values[i] = v
+        i += 1
+
+
+def _check_arrays(keys, values):
+    keys = np.asarray(keys)
+    values = np.asarray(values)
+    if keys.ndim != 1 or values.ndim != 1:
+        raise ValueError("*keys* and *values* must be 1-dimensional arrays")
+    if len(keys) != len(values):
+        raise ValueError("*keys* and *values* must have the same length")
+    return keys, values
+
+
 def _from_meminfo_ptr(ptr, dicttype):
     d = Dict(meminfo=ptr, dcttype=dicttype)
     return d
@@ -101,6 +135,19 @@ class Dict(MutableMapping):
         else:
             return cls(dcttype=DictType(key_type, value_type))
 
+    @classmethod
+    def from_arrays(cls, keys, values):
+        """Create a new Dict mapping the items of the 1-dimensional array
+        *keys* to the items of *values* at the same positions.  The key and
+        value types are the dtypes of the arrays.
+        """
+        keys, values = _check_arrays(keys, values)
+        if config.DISABLE_JIT:
+            return dict(zip(keys.tolist(), values.tolist()))
+        d = cls.empty(typeof(keys).dtype, typeof(values).dtype)
+        _update_arrays(d, keys, values)
+        return d
+
     def __init__(self, **kwargs):
         """
         For users, the constructor does not take any parameters.
@@ -140,6 +187,13 @@ class Dict(MutableMapping):
         """
         return self._dict_type is not None
 
+    def _check_typed(self, method):
+        if not self._typed:
+            raise TypeError(
+                "{}() needs the key and value types of the dictionary, and "
+                "this dictionary is untyped; set an item first or create "
+                "it with Dict.empty(key_type, value_type)".format(method))
+
     def _initialise_dict(self, key, value):
         dcttype = types.DictType(typeof(key), typeof(value))
         self._dict_type, self._opaque = self._parse_arg(dcttype)
@@ -208,6 +262,41 @@ class Dict(MutableMapping):
     def copy(self):
         return _copy(self)
 
+    def update_arrays(self, keys, values):
+        """Set the items of the 1-dimensional array *keys* to the items of
+        *values* at the same positions, in a single compiled loop.
+        """
+        keys, values = _check_arrays(keys, values)
+        if not self._typed:
+            dcttype = DictType(typeof(keys).dtype, typeof(values).dtype)
+            self._dict_type, self._opaque = self._parse_arg(dcttype)
+        _update_arrays(self, keys, values)
+
+    def get_many(self, keys, default):
+        """Return an array of the values of the items of the 1-dimensional
+        array *keys*, or *default* for the keys that are not in the
+        dictionary.  The dtype of the result is that of the value type.
+        """
+        keys = np.asarray(keys)
+        if keys.ndim != 1:
+            raise ValueError("*keys* must be a 1-dimensional array")
+        self._check_typed('get_many')
+        out = np.empty(len(keys), dtype=as_dtype(self._numba_type_.value_type))
+        _get_many(self, keys, default, out)
+        return out
+
+    def to_arrays(self):
+        """Return a (keys, values) tuple of arrays holding the items of the
+        dictionary in insertion order.  The dtypes of the arrays are those
+        of the key and value types.
+        """
+        self._check_typed('to_arrays')
+        dcttype = self._numba_type_
+        keys = np.empty(len(self), dtype=as_dtype(dcttype.key_type))
+        values = np.empty(len(self), dtype=as_dtype(dcttype.value_type))
+        _to_arrays(self, keys, values)
+        return keys, values
+
 
 # XXX: should we have a better way to classmethod
 @overload_method(TypeRef, 'empty')
@@ -166,6 +166,16 @@ def _sort(l, key, reverse):
     return l.sort(key, reverse)
 
 
+@njit
+def _from_array(arr):
+    return List.from_array(arr)
+
+
+@njit
+def _as_array(l):
+    return l.as_array()
+
+
 def _from_meminfo_ptr(ptr, listtype):
     return List(meminfo=ptr, lsttype=listtype)
 
@@ -204,6 +214,22 @@ class List(MutableSequence):
         else:
             return cls(lsttype=ListType(item_type), allocated=allocated)
 
+    @classmethod
+    def from_array(cls, arr):
+        """Create a new List holding the items of the 1-dimensional array
+        *arr*, with the dtype of the array as item type.  The items are
+        copied in a single block.
+
+        Parameters
+        ----------
+        arr: ndarray
+            a 1-dimensional array of numbers, booleans or datetimes.
+        """
+        if config.DISABLE_JIT:
+            return list(arr)
+        else:
+            return _from_array(arr)
+
     def __init__(self, *args, **kwargs):
         """
         For users, the constructor does not take any parameters.
@@ -380,6 +406,13 @@ class List(MutableSequence):
     def index(self, item, start=None, stop=None):
         return _index(self, item, start, stop)
 
+    def as_array(self):
+        """Return a 1-dimensional array viewing the items of the list,
+        without a copy.  The array keeps the list alive.  The list is made
+        immutable, since resizing it would move the items.
+        """
+        return _as_array(self)
+
     def sort(self, key=None, reverse=False):
         """Sort the list inplace.
 
@@ -414,6 +447,23 @@ def typedlist_empty(cls, item_type, allocated=DEFAULT_ALLOCATED):
     return impl
 
 
+@overload_method(TypeRef, 'from_array')
+def typedlist_from_array(cls, arr):
+    if cls.instance_type is not ListType:
+        return
+    if not isinstance(arr, types.Array) or arr.ndim != 1:
+        raise TypingError("List.from_array() expects a 1-dimensional array, "
+                          "got {}".format(arr))
+    listobject._check_array_item_type(arr.dtype, 'List.from_array()')
+    item_type = TypeRef(arr.dtype)
+
+    def impl(cls, arr):
+        l = listobject.new_list(item_type, allocated=len(arr))
+        return listobject._list_from_array(l, arr)
+
+    return impl
+
+
 @box(types.ListType)
 def box_lsttype(typ, val, c):
     context = c.context
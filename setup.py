@@ -1,4 +1,5 @@
 from setuptools import setup, Extension, find_packages
+from setuptools.command.build_ext import build_ext
 from distutils.command import build
 from distutils.spawn import spawn
 from distutils import sysconfig
@@ -26,6 +27,38 @@ class build_doc(build.build):
         spawn(['make', '-C', 'docs', 'html'])
 
 
+class build_ext_cxx_args(build_ext):
+    """
+    Pass the ``extra_cxx_compile_args`` attribute of an extension only to the
+    compilation of its C++ sources, so that C++ flags can be given to an
+    extension mixing C and C++ sources (``extra_compile_args`` applies to
+    both, and e.g. clang rejects ``-std=c++11`` for C).
+    """
+    cxx_extensions = ('.cpp', '.cxx', '.cc')
+
+    def build_extensions(self):
+        # The flags are looked up by source rather than by extension, as
+        # extensions and sources may be compiled in parallel threads
+        cxx_args = {}
+        for ext in self.extensions:
+            for src in ext.sources:
+                if os.path.splitext(src)[1] in self.cxx_extensions:
+                    args = cxx_args.setdefault(os.path.normpath(src), [])
+                    args += [arg for arg in
+                             getattr(ext, 'extra_cxx_compile_args', ())
+                             if arg not in args]
+        if any(cxx_args.values()):
+            compile_source = self.compiler._compile
+
+            def _compile(obj, src, src_ext, cc_args, extra_postargs, pp_opts):
+                extra_postargs = (list(extra_postargs) +
+                                  cxx_args.get(os.path.normpath(src), []))
+                compile_source(obj, src, src_ext, cc_args, extra_postargs,
+                               pp_opts)
+
+            self.compiler._compile = _compile
+        build_ext.build_extensions(self)
+
 versioneer.VCS = 'git'
 versioneer.versionfile_source = 'numba/_version.py'
 versioneer.versionfile_build = 'numba/_version.py'
@@ -34,6 +67,7 @@ versioneer.parentdir_prefix = 'numba-'
 
 cmdclass = versioneer.get_cmdclass()
 cmdclass['build_doc'] = build_doc
+cmdclass['build_ext'] = build_ext_cxx_args
 
 
 GCCFLAGS = ["-std=c89", "-Wdeclaration-after-statement", "-Werror"]
@@ -220,8 +254,11 @@ def get_ext_modules():
             sources=[
                 'numba/np/ufunc/tbbpool.cpp',
                 'numba/np/ufunc/gufunc_scheduler.cpp',
+                'numba/np/ufunc/parallel_stats.cpp',
             ],
-            depends=['numba/np/ufunc/workqueue.h'],
+            depends=['numba/np/ufunc/workqueue.h',
+                     'numba/np/ufunc/affinity.h',
+                     'numba/np/ufunc/parallel_stats.h'],
             include_dirs=[os.path.join(tbb_root, 'include')],
             extra_compile_args=cpp11flags,
             libraries=['tbb'],  # TODO: if --debug or -g, use 'tbb_debug'
@@ -250,8 +287,11 @@ def get_ext_modules():
             sources=[
                 'numba/np/ufunc/omppool.cpp',
                 'numba/np/ufunc/gufunc_scheduler.cpp',
+                'numba/np/ufunc/parallel_stats.cpp',
             ],
-            depends=['numba/np/ufunc/workqueue.h'],
+            depends=['numba/np/ufunc/workqueue.h',
+                     'numba/np/ufunc/affinity.h',
+                     'numba/np/ufunc/parallel_stats.h'],
             extra_compile_args=ompcompileflags + cpp11flags,
             extra_link_args=omplinkflags,
         )
@@ -265,8 +305,13 @@ def get_ext_modules():
     ext_np_ufunc_workqueue_backend = Extension(
         name='numba.np.ufunc.workqueue',
         sources=['numba/np/ufunc/workqueue.c',
-                 'numba/np/ufunc/gufunc_scheduler.cpp'],
-        depends=['numba/np/ufunc/workqueue.h'])
+                 'numba/np/ufunc/gufunc_scheduler.cpp',
+                 'numba/np/ufunc/parallel_stats.cpp'],
+        depends=['numba/np/ufunc/workqueue.h',
+                 'numba/np/ufunc/affinity.h',
+                 'numba/np/ufunc/parallel_stats.h'])
+    # parallel_stats.cpp needs C++11 (thread_local, std::mutex)
+    ext_np_ufunc_workqueue_backend.extra_cxx_compile_args = cpp11flags
     ext_np_ufunc_backends.append(ext_np_ufunc_workqueue_backend)
 
     ext_mviewbuf = Extension(name='numba.mviewbuf',
@@ -275,8 +320,12 @@ def get_ext_modules():
 
     ext_nrt_python = Extension(name='numba.core.runtime._nrt_python',
                                sources=['numba/core/runtime/_nrt_pythonmod.c',
-                                        'numba/core/runtime/nrt.c'],
+                                        'numba/core/runtime/nrt.c',
+                                        'numba/core/runtime/nrt_pool.c',
+                                        'numba/core/runtime/nrt_profile.c'],
                                depends=['numba/core/runtime/nrt.h',
+                                        'numba/core/runtime/nrt_pool.h',
+                                        'numba/core/runtime/nrt_profile.h',
                                         'numba/_pymodule.h',
                                         'numba/core/runtime/_nrt_python.c'],
                                **np_compile_args)